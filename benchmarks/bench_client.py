@@ -0,0 +1,222 @@
+""" Benchmarks of `slideshare.client` against the local fake server.
+
+Measures single call latency, batch throughput, parse cost, streaming,
+upload memory and retries of failed requests. Results may be saved to
+compare releases::
+
+    python -m benchmarks.bench_client --json 0.0.8.json
+    python -m benchmarks.bench_client --compare 0.0.8.json
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import slideshare
+from slideshare.breaker import CircuitBreaker
+from slideshare.client import SlideShareAPI
+from slideshare.retry import RetryPolicy
+from slideshare.tracing import CallbackExporter, Tracer
+from tests.server import API_KEY, SHARED_SECRET, FakeSlideShare
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = int(round(percent / 100.0 * (len(values) - 1)))
+    return values[index]
+
+
+def make_client(server, **options):
+    client = SlideShareAPI(API_KEY, SHARED_SECRET, username="user",
+                           password="password", **options)
+    client.BASE_URL = server.url
+    return client
+
+
+def bench_latency(calls=300, **options):
+    """ Latency of sequential `get_slideshow` calls without network
+    delay, i.e. client overhead plus loopback round trip
+    """
+    with FakeSlideShare() as server:
+        client = make_client(server, **options)
+        client.get_slideshow(slideshow_id=1)
+        timings = []
+        for slideshow_id in range(1, calls + 1):
+            started = time.time()
+            client.get_slideshow(slideshow_id=slideshow_id, detailed=1)
+            timings.append(time.time() - started)
+    return {"p50_ms": percentile(timings, 50) * 1000,
+            "p99_ms": percentile(timings, 99) * 1000}
+
+
+def bench_batch(calls=1000, workers=32, latency=0.01):
+    """ Throughput of `get_slideshows` with 10ms server latency """
+    with FakeSlideShare(latency=latency) as server:
+        client = make_client(server, pool_maxsize=workers)
+        started = time.time()
+        results = client.get_slideshows(range(1, calls + 1),
+                                        max_workers=workers)
+        elapsed = time.time() - started
+    assert not any(isinstance(result, Exception) for result in results)
+    return {"calls_per_second": calls / elapsed,
+            "new_connections": client.adapter.stats()["new_connections"]}
+
+
+def bench_retry(calls=300, error_rate=0.2):
+    """ Throughput of `get_slideshow` calls behind retry policy and
+    circuit breaker, the server fails `error_rate` of requests with 503
+    """
+    policy = RetryPolicy(max_attempts=5, backoff=0)
+    breaker = CircuitBreaker(failure_threshold=calls, error_rate=1.0,
+                             cooldown=60)
+    with FakeSlideShare(error_rate=error_rate) as server:
+        client = make_client(server, retry_policy=policy,
+                             circuit_breaker=breaker)
+        started = time.time()
+        for slideshow_id in range(1, calls + 1):
+            client.get_slideshow(slideshow_id=slideshow_id)
+        elapsed = time.time() - started
+    return {"calls_per_second": calls / elapsed,
+            "retries": policy.stats()["get_slideshow"]["retries"],
+            "error_rate": breaker.stats()["get_slideshow"]["error_rate"]}
+
+
+def bench_parse(limit=500, repeat=10, **options):
+    """ Parse (and model) time of detailed tag listing inside the client
+    """
+    spans = []
+    tracer = Tracer(CallbackExporter(spans.append))
+    with FakeSlideShare(detailed=True) as server:
+        client = make_client(server, tracer=tracer, **options)
+        for _ in range(repeat):
+            client.get_slideshows_by_tag("python", limit=limit)
+    parse = [span.duration for span in spans
+             if span.name in ("parse", "model")]
+    calls = [span.duration for span in spans
+             if span.name == "get_slideshows_by_tag"]
+    return {"parse_ms": sum(parse) / repeat * 1000,
+            "call_ms": min(calls) * 1000}
+
+
+def bench_stream(limit=1000):
+    """ Time to the first slideshow and peak memory of a large listing
+    """
+    with FakeSlideShare(detailed=True, process=True) as server:
+        client = make_client(server)
+        tracemalloc.start()
+        started = time.time()
+        response = client.get_slideshows_by_tag("python", limit=limit)
+        first = time.time() - started
+        del response
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        started = time.time()
+        stream_first = None
+        for _ in client.stream_slideshows_by_tag("python", limit=limit):
+            if stream_first is None:
+                stream_first = time.time() - started
+        _, stream_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"first_item_ms": first * 1000, "peak_mb": peak / 1e6,
+            "stream_first_item_ms": stream_first * 1000,
+            "stream_peak_mb": stream_peak / 1e6}
+
+
+def bench_upload(size=32 * 1024 * 1024):
+    """ Peak memory and throughput of `upload_slideshow` """
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "slides.pdf")
+    try:
+        with io.open(path, "wb") as f:
+            chunk = os.urandom(1024 * 1024)
+            for _ in range(size // len(chunk)):
+                f.write(chunk)
+        with FakeSlideShare(process=True) as server:
+            client = make_client(server)
+            tracemalloc.start()
+            started = time.time()
+            response = client.upload_slideshow("Slides",
+                                               slideshow_srcfile=path)
+            elapsed = time.time() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        assert response["SlideShowUploaded"]["SlideShowID"]
+    finally:
+        shutil.rmtree(directory)
+    return {"peak_mb": peak / 1e6,
+            "megabytes_per_second": size / 1e6 / elapsed}
+
+
+BENCHMARKS = [
+    ("latency", bench_latency),
+    ("latency models", lambda: bench_latency(models=True)),
+    ("batch", bench_batch),
+    ("retry", bench_retry),
+    ("parse", bench_parse),
+    ("parse models", lambda: bench_parse(models=True)),
+    ("stream", bench_stream),
+    ("upload", bench_upload),
+]
+
+
+def run(names=None):
+    results = {}
+    for name, func in BENCHMARKS:
+        if names and name not in names:
+            continue
+        results[name] = func()
+    return {"version": slideshare.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results}
+
+
+def report(results, baseline=None):
+    print("slideshare {version}, Python {python}, {platform}".format(
+        **results))
+    if baseline is not None:
+        print("compared to slideshare {version}, Python {python}".format(
+            **baseline))
+    for name, metrics in results["results"].items():
+        for metric, value in sorted(metrics.items()):
+            line = "{:<16} {:<24} {:>12.3f}".format(name, metric, value)
+            old = (baseline or {}).get("results", {}).get(name, {})
+            if old.get(metric):
+                line += " {:>12.3f} {:>7.2f}x".format(old[metric],
+                                                      value / old[metric])
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("benchmarks", nargs="*",
+                        help="benchmarks to run, all by default: " +
+                             ", ".join(name for name, _ in BENCHMARKS))
+    parser.add_argument("--json", help="save results to the file")
+    parser.add_argument("--compare", help="results saved by previous run")
+    args = parser.parse_args()
+    # Retried requests are logged as warnings
+    logging.basicConfig(level=logging.ERROR)
+    baseline = None
+    if args.compare:
+        with io.open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    results = run(args.benchmarks)
+    report(results, baseline)
+    if args.json:
+        with io.open(args.json, "w", encoding="utf-8") as f:
+            f.write(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
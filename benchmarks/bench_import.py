@@ -0,0 +1,74 @@
+""" Import time of the slideshare package and its entry points.
+
+Every import is timed in a fresh interpreter, so nothing is served from
+`sys.modules`, best of `--repeat` runs is reported. Also checks that
+importing the package doesn't load heavy dependencies::
+
+    python -m benchmarks.bench_import
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import argparse
+import subprocess
+import sys
+
+# name, setup not timed, statement
+STATEMENTS = [
+    ("import slideshare", "", "import slideshare"),
+    ("slideshare.SlideShareAPI", "",
+     "import slideshare; slideshare.SlideShareAPI"),
+    ("import slideshare.client", "", "import slideshare.client"),
+    # Own share of the client import, requests is needed anyway
+    ("slideshare.client over requests", "import requests",
+     "import slideshare.client"),
+    ("import slideshare.api (legacy)", "", "import slideshare.api"),
+]
+
+# Must not be imported by `import slideshare`
+HEAVY_MODULES = ["requests", "xmltodict", "six", "hashlib", "mimetypes",
+                 "sqlite3", "concurrent.futures", "xml.etree.ElementTree",
+                 "slideshare.api", "slideshare.client"]
+
+TIMER = """
+import time
+{}
+started = time.perf_counter()
+{}
+print(time.perf_counter() - started)
+"""
+
+
+def measure(setup, statement, repeat):
+    """ Returns best time of the statement in fresh interpreter """
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", TIMER.format(setup, statement)])
+        timings.append(float(output.decode("ascii").split()[-1]))
+    return min(timings)
+
+
+def loaded_modules(statement):
+    output = subprocess.check_output(
+        [sys.executable, "-c",
+         "import sys; {}; print(' '.join(sys.modules))".format(statement)])
+    return set(output.decode("ascii").split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=10,
+                        help="runs of every statement, default 10")
+    args = parser.parse_args()
+    for name, setup, statement in STATEMENTS:
+        print("{:<32} {:>8.2f}ms".format(
+            name, measure(setup, statement, args.repeat) * 1000))
+    loaded = loaded_modules("import slideshare")
+    heavy = [module for module in HEAVY_MODULES if module in loaded]
+    if heavy:
+        print("import slideshare loads: " + ", ".join(heavy))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+""" Compares `slideshare.parser` with `xmltodict` on SlideShare responses.
+
+Usage::
+
+    python -m benchmarks.bench_parse
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import timeit
+
+import xmltodict
+
+from slideshare import parser
+from tests import samples
+
+DOCUMENTS = [
+    ("get_slideshow", samples.get_slideshow()),
+    ("get_slideshow detailed", samples.get_slideshow(detailed=True)),
+    ("tag listing, 50 items", samples.get_slideshows_by_tag(limit=50)),
+    ("tag listing, 500 detailed", samples.get_slideshows_by_tag(
+        limit=500, detailed=True)),
+    ("search, 100 detailed", samples.search_slideshows(
+        items_per_page=100, detailed=True)),
+]
+
+PARSERS = [
+    ("xmltodict", xmltodict.parse),
+    ("parser", parser.parse),
+    ("parser compat=False", lambda content: parser.parse(content,
+                                                          compat=False)),
+]
+
+
+def measure(func, content, budget=1.0):
+    """ Returns best time of a single call in seconds """
+    timer = timeit.Timer(lambda: func(content))
+    number, elapsed = timer.autorange()
+    repeat = max(3, int(budget / elapsed)) if elapsed else 3
+    return min(timer.repeat(repeat=min(repeat, 20), number=number)) / number
+
+
+def main():
+    assert all(xmltodict.parse(content) == parser.parse(content)
+               for _, content in DOCUMENTS)
+    print("{:<28} {:>7} {:>11} {:>11} {:>8} {:>11} {:>8}".format(
+        "document", "size", "xmltodict", "parser", "speedup", "plain",
+        "speedup"))
+    for name, content in DOCUMENTS:
+        timings = [measure(func, content) for _, func in PARSERS]
+        print("{:<28} {:>6}K {:>9.3f}ms {:>9.3f}ms {:>7.2f}x "
+              "{:>9.3f}ms {:>7.2f}x".format(
+                  name, len(content) // 1024, timings[0] * 1000,
+                  timings[1] * 1000, timings[0] / timings[1],
+                  timings[2] * 1000, timings[0] / timings[2]))
+
+
+if __name__ == "__main__":
+    main()
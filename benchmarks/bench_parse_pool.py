@@ -0,0 +1,79 @@
+""" Throughput of large responses parsed in threads and in a process pool.
+
+Threads fetch detailed listings from an in-memory transport, so parsing
+and model construction are the only work. Without the parse pool all
+threads contend for the GIL; with `parse_pool` throughput should grow
+with the number of worker processes up to the number of cores::
+
+    python -m benchmarks.bench_parse_pool --requests 200 --threads 16
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from slideshare.client import SlideShareAPI
+from tests import samples
+from tests.server import FakeAdapter
+
+
+def run(content, requests, threads, processes, models):
+    pool = ProcessPoolExecutor(processes) if processes else None
+    client = SlideShareAPI("key", "secret", models=models, coalesce=False,
+                           parse_pool=pool, pool_maxsize=threads)
+    client.mount("https://", FakeAdapter(content))
+    if pool is not None:
+        # Start worker processes before measuring
+        list(pool.map(len, [b""] * processes))
+
+    def fetch(offset):
+        return len(client.get_slideshows_by_tag("python", limit=500,
+                                                offset=offset))
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(fetch, range(requests)))
+    elapsed = time.time() - started
+    if pool is not None:
+        pool.shutdown()
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=500,
+                        help="detailed slideshows per response")
+    parser.add_argument("--processes", type=int, nargs="*",
+                        help="pool sizes, default 1, 2, 4... up to the "
+                             "number of cores")
+    parser.add_argument("--models", action="store_true",
+                        help="build slideshare.models as well")
+    args = parser.parse_args()
+
+    cores = multiprocessing.cpu_count()
+    processes = args.processes
+    if not processes:
+        processes = []
+        size = 1
+        while size < cores:
+            processes.append(size)
+            size *= 2
+        processes.append(cores)
+    content = samples.get_slideshows_by_tag(limit=args.limit, detailed=True)
+    print("{} requests of {}K from {} threads, {} cores".format(
+        args.requests, len(content) // 1024, args.threads, cores))
+    baseline = run(content, args.requests, args.threads, 0, args.models)
+    print("{:<20} {:>8.1f} req/s".format("threads only", baseline))
+    for size in processes:
+        throughput = run(content, args.requests, args.threads, size,
+                         args.models)
+        print("{:<20} {:>8.1f} req/s {:>6.2f}x".format(
+            "{} processes".format(size), throughput, throughput / baseline))
+
+
+if __name__ == "__main__":
+    main()
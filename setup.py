@@ -25,14 +25,24 @@ setup(
     keywords=['slideshare', 'api'],
     url='https://github.com/pacahon/python-slideshare',
     license='LGPL',
-    packages=find_packages(exclude=['tests']),
+    packages=find_packages(exclude=['tests', 'tests.*', 'benchmarks',
+                                    'benchmarks.*']),
     include_package_data=True,
     zip_safe=False,
     install_requires=get_requirements(),
+    extras_require={
+        'async': ['aiohttp>=3.0'],
+    },
     tests_require=['pytest'],
+    python_requires='>=3.7',
     classifiers=[
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2.7',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
     ],
 )
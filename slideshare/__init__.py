@@ -1 +1,39 @@
 __version__ = '0.0.8'
+
+# Public names are imported on first access (Python 3.7+), so importing
+# the package doesn't load `requests` and the legacy `slideshare.api`
+_LAZY_NAMES = {
+    "SlideShareAPI": "slideshare.client",
+    "AsyncSlideShareAPI": "slideshare.aio",
+    "SlideShareError": "slideshare.exceptions",
+    "RateLimitExceeded": "slideshare.exceptions",
+    "CircuitOpenError": "slideshare.exceptions",
+    # Legacy client
+    "SlideshareAPI": "slideshare.api",
+    "SlideShareServiceError": "slideshare.api",
+}
+
+_SUBMODULES = frozenset([
+    "aio", "api", "breaker", "bulk", "cache", "client", "exceptions",
+    "export", "metrics", "models", "multipart", "pagination", "parser",
+    "pool", "ratelimit", "replay", "retry", "singleflight", "slideshow",
+    "sync", "tracing", "user", "utils",
+])
+
+
+def __getattr__(name):
+    import importlib
+
+    if name in _LAZY_NAMES:
+        value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("{}.{}".format(__name__, name))
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(
+            __name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES) | _SUBMODULES)
@@ -0,0 +1,474 @@
+""" asyncio version of the SlideShare API client.
+
+Requires `aiohttp` (``pip install slideshare[async]``) and Python 3.5+.
+"""
+import asyncio
+import copy
+import functools
+import logging
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from slideshare.cache import cache_key
+from slideshare.client import PARSE_POOL_MIN_SIZE, BaseSlideShareAPI
+from slideshare.exceptions import SlideShareError
+from slideshare.metrics import Measurement
+from slideshare.multipart import MultipartEncoder
+from slideshare.parser import ListingParser, parse_load
+from slideshare.retry import IDEMPOTENT_ENDPOINTS
+from slideshare.slideshow import SlideshowMixin
+from slideshare.user import UserMixin
+from slideshare.utils import (group_page, search_page, slideshow_lookup,
+                              tag_page, user_page)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSlideShareAPI(BaseSlideShareAPI, SlideshowMixin, UserMixin):
+    """ Non-blocking SlideShare API client.
+
+    Exposes the same methods as `SlideShareAPI`, but they return
+    coroutines::
+
+        async with AsyncSlideShareAPI(api_key, shared_secret) as client:
+            response = await client.get_slideshow(slideshow_id=42)
+
+    Requests are signed the same way and `SlideShareError` is raised on
+    service errors.
+    """
+
+    def __init__(self,
+                 api_key,
+                 shared_secret,
+                 username=None,
+                 password=None,
+                 limit=100,
+                 timeout=None,
+                 session=None,
+                 cache=None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 models=False,
+                 metrics=None,
+                 tracer=None,
+                 coalesce=True,
+                 parse_pool=None,
+                 parse_pool_min_size=PARSE_POOL_MIN_SIZE,
+                 circuit_breaker=None):
+        """ Initialize asynchronous SlideShare API client
+
+        Args:
+            api_key (string):
+                API key http://www.slideshare.net/developers/applyforapi
+            shared_secret (string):
+                Shared secret, get it with API key, used to generate
+                required `hash` field
+            username (string):
+                Default username of the requesting user. [Optional]
+            password (string):
+                Default password of the requesting user. [Optional]
+            limit (int):
+                Max number of simultaneous connections. Defaults to 100.
+                Ignored if `session` provided. [Optional]
+            timeout (float):
+                Total timeout of the request in seconds. [Optional]
+            session (aiohttp.ClientSession):
+                Session to send requests with. Created on first request
+                if not provided. [Optional]
+            cache (slideshare.cache.BaseCache):
+                Cache for responses of read-only endpoints. [Optional]
+            rate_limiter (slideshare.ratelimit.RateLimiter):
+                Paces requests sent by the client. [Optional]
+            retry_policy (slideshare.retry.RetryPolicy):
+                Retries idempotent requests failed with transient
+                errors. [Optional]
+            models (boolean):
+                Return compact `slideshare.models` objects instead of
+                mappings. Defaults to False. [Optional]
+            metrics (slideshare.metrics.Metrics):
+                Hook called after every request with endpoint, status,
+                error, sizes and duration. [Optional]
+            tracer (slideshare.tracing.Tracer):
+                Records spans of call phases: signing, network,
+                parsing. [Optional]
+            coalesce (boolean):
+                Concurrent identical read requests share one network
+                request, waiting tasks get copies of the result.
+                Defaults to True. [Optional]
+            parse_pool (concurrent.futures.ProcessPoolExecutor):
+                Parse large responses and build models in worker
+                processes, so parsing doesn't block the event loop.
+                [Optional]
+            parse_pool_min_size (int):
+                Responses smaller than this size in bytes are parsed in
+                the event loop. Defaults to 64K. [Optional]
+            circuit_breaker (slideshare.breaker.CircuitBreaker):
+                Fails requests to the endpoint at once with
+                `CircuitOpenError` after repeated failures. [Optional]
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncSlideShareAPI requires aiohttp")
+        required_list = [api_key, shared_secret]
+        if not all(required_list):
+            raise ValueError("Api initialization error: "
+                             "api key and shared secret must be provided")
+        self.params = {"api_key": api_key}
+        self.shared_secret = shared_secret
+        # Default credentials
+        self.username = username
+        self.password = password
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.models = models
+        if metrics is not None:
+            self.metrics = metrics
+        self.tracer = tracer
+        self.coalesce = coalesce
+        self._in_flight = {}
+        self.parse_pool = parse_pool
+        self.parse_pool_min_size = parse_pool_min_size
+        self.circuit_breaker = circuit_breaker
+
+        self.limit = limit
+        self.timeout = timeout
+        self._session = session
+        self._own_session = session is None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self._own_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(limit=self.limit)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=timeout)
+        return self._session
+
+    def _signed_params(self, params):
+        with self._span("sign"):
+            signed = dict(self.params)
+            signed.update(params)
+            signed.update(self.sign())
+            return signed
+
+    async def _send(self, method, url, params, data=None, headers=None,
+                    measurement=None):
+        signed = self._signed_params(params)
+        with self._span("network") as span:
+            async with self.session.request(method, url, params=signed,
+                                            data=data,
+                                            headers=headers) as response:
+                span.set_attribute("status", response.status)
+                if measurement is not None:
+                    self._measure_response(measurement, response, headers)
+                # Raise ClientResponseError on 40x and 50x
+                response.raise_for_status()
+                content = await response.read()
+                if measurement is not None:
+                    measurement.response_bytes = len(content)
+                return content
+
+    @staticmethod
+    def _measure_response(measurement, response, headers=None):
+        measurement.status = response.status
+        measurement.request_bytes = len(str(response.url))
+        if headers and "Content-Length" in headers:
+            measurement.request_bytes += int(headers["Content-Length"])
+
+    def _is_transient(self, exception):
+        """ aiohttp counterpart of `RetryPolicy.is_transient` """
+        if isinstance(exception, aiohttp.ClientResponseError):
+            return exception.status in self.retry_policy.statuses
+        return isinstance(exception, (aiohttp.ClientConnectionError,
+                                      asyncio.TimeoutError))
+
+    @staticmethod
+    def _is_failure(exception):
+        """ aiohttp counterpart of `CircuitBreaker.is_failure` """
+        if isinstance(exception, aiohttp.ClientResponseError):
+            return exception.status >= 500
+        if isinstance(exception, (aiohttp.ClientError, asyncio.TimeoutError)):
+            return True
+        return None
+
+    async def _guarded_send(self, endpoint, *args):
+        """ Sends the request paced by the rate limiter and guarded by the
+        circuit breaker
+        """
+        # Requests rejected by the rate limiter never reach the breaker,
+        # they tell nothing about the endpoint
+        if self.rate_limiter is not None:
+            with self._span("rate_limit"):
+                await self._acquire()
+        breaker = self.circuit_breaker
+        if breaker is None or not breaker.applies_to(endpoint):
+            return await self._send(*args)
+        with breaker.guard(endpoint, self._is_failure):
+            return await self._send(*args)
+
+    async def _request(self, method, url, params, data=None, headers=None):
+        with self._span(url, method=method) as span:
+            if method == "GET":
+                cached = self._cached(url, params)
+                if cached is not None:
+                    span.set_attribute("cached", True)
+                    return cached
+            if method == "GET" and self.coalesce and \
+                    url in IDEMPOTENT_ENDPOINTS:
+                return await self._coalesced(url, params)
+            return await self._fetch(method, url, params, data, headers)
+
+    async def _fetch(self, method, url, params, data=None, headers=None):
+        endpoint, url = url, self._url(url)
+        with Measurement(self.metrics, endpoint) as measurement:
+            content = await self._retry(endpoint, method, url, params,
+                                        data, headers, measurement)
+            logger.debug(content)
+            if self._offloaded(content):
+                return await self._handle_offloaded(endpoint, params,
+                                                    content)
+            return self._handle_response(endpoint, params, content)
+
+    async def _handle_offloaded(self, url, params, content):
+        """ Parses response in the parse pool without blocking the loop
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            with self._span("parse", bytes=len(content), process=True):
+                data, result = await loop.run_in_executor(
+                    self.parse_pool, parse_load, content, self.models,
+                    self._keep_data(url))
+        except SlideShareError as e:
+            self._handle_error(e)
+            raise
+        return self._handled(url, params, content, data, result)
+
+    async def _coalesced(self, endpoint, params):
+        """ Shares in-flight GET request with identical concurrent ones,
+        waiters get copies of the result
+        """
+        key = cache_key(endpoint, params)
+        future = self._in_flight.get(key)
+        if future is not None:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The request was cancelled by its caller, not by us
+                return await self._fetch("GET", endpoint, params)
+            return copy.deepcopy(result)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._fetch("GET", endpoint, params)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved, there may be no waiters
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    async def _retry(self, endpoint, method, url, params, data, headers,
+                     measurement):
+        """ Sends the request retried according to the retry policy """
+        policy = self.retry_policy
+        retry = None
+        if policy is not None and policy.applies_to(endpoint):
+            retry = policy.start(endpoint, self._is_transient)
+        while True:
+            try:
+                content = await self._guarded_send(
+                    endpoint, method, url, params, data, headers,
+                    measurement)
+            except Exception as e:
+                delay = retry.failed(e) if retry is not None else None
+                if delay is None:
+                    logger.error(e)
+                    raise e
+                await asyncio.sleep(delay)
+            else:
+                if retry is not None:
+                    retry.succeeded()
+                return content
+
+    async def _acquire(self):
+        """ Waits for the rate limiter without blocking the loop
+        """
+        while True:
+            delay, reserved = self.rate_limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if reserved:
+                return
+
+    async def get(self, url, **kwargs):
+        return await self._request("GET", url, kwargs)
+
+    async def stream_listing(self, url, **kwargs):
+        """ Sends GET request to listing endpoint and yields slideshows
+        as they are parsed from the response body.
+
+        Streamed responses are not cached and not retried.
+        """
+        endpoint, url = url, self._url(url)
+        if self.rate_limiter is not None:
+            await self._acquire()
+        parser = ListingParser()
+        with Measurement(self.metrics, endpoint) as measurement:
+            async with self.session.get(
+                    url, params=self._signed_params(kwargs)) as response:
+                self._measure_response(measurement, response)
+                response.raise_for_status()
+                async for chunk in response.content.iter_any():
+                    measurement.response_bytes += len(chunk)
+                    for item in self._parse_chunk(parser, chunk):
+                        yield item
+            for item in self._parse_chunk(parser, None):
+                yield item
+
+    async def post(self, url, data=None, files=None, **kwargs):
+        progress_callback = kwargs.pop("progress_callback", None)
+        if not files:
+            return await self._request("POST", url, kwargs, data=data)
+        encoder = MultipartEncoder(data, files, callback=progress_callback)
+
+        async def body():
+            for chunk in encoder:
+                yield chunk
+
+        headers = {"Content-Type": encoder.content_type,
+                   "Content-Length": str(len(encoder))}
+        try:
+            return await self._request("POST", url, kwargs, data=body(),
+                                       headers=headers)
+        finally:
+            encoder.close()
+
+    async def get_slideshows(self, slideshows, max_workers=10, **optional):
+        """ Get information about many slideshows at once
+
+        Args:
+            slideshows (list):
+                ids or urls of the slideshows to be fetched
+            max_workers (int):
+                Max number of requests in flight. Defaults to 10. [Optional]
+            **optional:
+                Passed to `get_slideshow` as is. [Optional]
+
+        Returns:
+            list: `get_slideshow` responses or `SlideShareError`,
+            `aiohttp.ClientError` and `ValueError` instances in the order
+            of `slideshows`.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def fetch(slideshow):
+            kwargs = slideshow_lookup(slideshow)
+            kwargs.update(optional)
+            async with semaphore:
+                try:
+                    return await self.get_slideshow(**kwargs)
+                except (SlideShareError, aiohttp.ClientError,
+                        ValueError) as e:
+                    return e
+
+        return await asyncio.gather(*[fetch(s) for s in slideshows])
+
+    @staticmethod
+    async def _iter_offset(fetch, extract, per_page, offset=0, limit=None):
+        """ Async counterpart of `slideshare.pagination.iter_offset` """
+        offset = int(offset)
+        end = offset + int(limit) if limit is not None else None
+        while end is None or offset < end:
+            size = per_page if end is None else min(per_page, end - offset)
+            slideshows, count = extract(
+                await fetch(limit=size, offset=offset))
+            for slideshow in slideshows:
+                yield slideshow
+            offset += len(slideshows)
+            if len(slideshows) < size or (count is not None and
+                                          offset >= count):
+                break
+
+    def iter_slideshows_by_tag(self, tag, per_page=50, **optional):
+        """ Asynchronously iterate over all slideshows with the tag
+
+        Args:
+            tag (string):
+                tag name
+            per_page (int):
+                number of items requested at once. Defaults to 50. [Optional]
+            offset (int):
+                offset of the first item [Optional]
+            limit (int):
+                max number of items, all by default [Optional]
+            detailed (boolean):
+                Set to 1 to include optional information [Optional]
+
+        """
+        offset = optional.pop("offset", 0)
+        limit = optional.pop("limit", None)
+        return self._iter_offset(
+            functools.partial(self.get_slideshows_by_tag, tag, **optional),
+            tag_page, per_page, offset, limit)
+
+    def iter_slideshows_by_group(self, group_name, per_page=50, **optional):
+        """ Asynchronously iterate over all slideshows of the group """
+        offset = optional.pop("offset", 0)
+        limit = optional.pop("limit", None)
+        return self._iter_offset(
+            functools.partial(self.get_slideshows_by_group, group_name,
+                              **optional),
+            group_page, per_page, offset, limit)
+
+    def iter_slideshows_by_user(self, username_for, per_page=50, **optional):
+        """ Asynchronously iterate over all slideshows of the user """
+        offset = optional.pop("offset", 0)
+        limit = optional.pop("limit", None)
+        return self._iter_offset(
+            functools.partial(self.get_slideshows_by_user, username_for,
+                              **optional),
+            user_page, per_page, offset, limit)
+
+    async def iter_search_slideshows(self, q, per_page=50, **optional):
+        """ Asynchronously iterate over all search results """
+        page = int(optional.pop("page", 1))
+        limit = optional.pop("limit", None)
+        # Page size is set by `per_page`
+        optional.pop("items_per_page", None)
+        remaining = int(limit) if limit is not None else None
+        while remaining is None or remaining > 0:
+            response = await self.search_slideshows(
+                q, page=page, items_per_page=per_page, **optional)
+            slideshows, count = search_page(response)
+            if remaining is not None:
+                slideshows = slideshows[:remaining]
+                remaining -= len(slideshows)
+            for slideshow in slideshows:
+                yield slideshow
+            if len(slideshows) < per_page or (count is not None and
+                                              page * per_page >= count):
+                break
+            page += 1
@@ -10,6 +10,9 @@ import itertools
 import xmltodict
 import time
 
+from slideshare.pagination import iter_offset, iter_pages
+from slideshare.utils import search_page, user_page
+
 try:
     from urllib2 import Request, urlopen
 except ImportError:
@@ -24,7 +27,7 @@ try:
 except ImportError:
     # hope it's never gone
     from email.generator import _make_boundary as make_boundary
-from functools import wraps
+from functools import partial, wraps
 logger = logging.getLogger('slideshare.api')
 
 
@@ -303,6 +306,18 @@ class SlideshareAPI(object):
         kwargs['username_for'] = username_for
         return params, kwargs, 'GET'
 
+    def iter_slideshows_by_user(self, username_for, per_page=50, **kwargs):
+        """
+        Iterate over all slideshows of the user, fetching next page
+        in background. Takes the same parameters as get_slideshows_by_user.
+        """
+        offset = kwargs.pop('offset', 0)
+        limit = kwargs.pop('limit', None)
+        # Every page gets its own copy of the arguments
+        fetch = partial(self.get_slideshows_by_user, username_for, **kwargs)
+        return iter_offset(fetch, user_page, per_page, offset=offset,
+                           limit=limit)
+
     @callapi
     def search_slideshows(self, q, **kwargs):
         """
@@ -352,6 +367,16 @@ class SlideshareAPI(object):
         kwargs['q'] = q
         return params, kwargs, 'GET'
 
+    def iter_search_slideshows(self, q, per_page=50, **kwargs):
+        """
+        Iterate over all search results, fetching next page in background.
+        Takes the same parameters as search_slideshows.
+        """
+        page = kwargs.pop('page', 1)
+        kwargs.pop('items_per_page', None)
+        fetch = partial(self.search_slideshows, q, **kwargs)
+        return iter_pages(fetch, search_page, per_page, page=page)
+
     @callapi
     def get_user_groups(self, username_for, **kwargs):
         """Get User Groups
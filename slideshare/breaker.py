@@ -0,0 +1,278 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import logging
+import threading
+import time
+from collections import deque
+
+from requests.exceptions import HTTPError, RequestException
+
+from slideshare.exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_clock = getattr(time, "monotonic", time.time)
+
+
+class _Circuit(object):
+    __slots__ = ("state", "failures", "outcomes", "opened_at", "probes",
+                 "probe_successes", "opened", "rejected")
+
+    def __init__(self, window):
+        self.state = CLOSED
+        # Consecutive failures
+        self.failures = 0
+        # Recent outcomes, True for failure
+        self.outcomes = deque(maxlen=window)
+        self.opened_at = None
+        # Trial requests in flight while half-open
+        self.probes = 0
+        self.probe_successes = 0
+        self.opened = 0
+        self.rejected = 0
+
+
+class _Guard(object):
+    __slots__ = ("breaker", "endpoint", "is_failure")
+
+    def __init__(self, breaker, endpoint, is_failure):
+        self.breaker = breaker
+        self.endpoint = endpoint
+        self.is_failure = is_failure
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        failure = False if exc_type is None else self.is_failure(exc_value)
+        if failure is None:
+            self.breaker.release(self.endpoint)
+        else:
+            self.breaker.record(self.endpoint, not failure)
+        return False
+
+
+class CircuitBreaker(object):
+    """ Per-endpoint circuit breaker.
+
+    Circuit of the endpoint opens after `failure_threshold` consecutive
+    failures or when share of failed requests among the last `window`
+    ones reaches `error_rate`. Requests to the open endpoint fail at once
+    with `CircuitOpenError` for `cooldown` seconds, then up to
+    `half_open_requests` trial requests are let through: the circuit
+    closes if they succeed and opens again on the first failure.
+
+    Failures are connection errors, timeouts and 5xx responses. Service
+    errors and 4xx responses mean the endpoint is alive. Requests ended by
+    errors which don't come from the transport, e.g. interrupted ones,
+    count neither way.
+
+    Thread-safe, single instance may be shared by many clients.
+    """
+
+    def __init__(self, failure_threshold=5, error_rate=0.5, window=20,
+                 min_requests=10, cooldown=30.0, half_open_requests=1,
+                 endpoints=None, metrics=None):
+        """
+        Args:
+            failure_threshold (int):
+                Consecutive failures opening the circuit. Defaults to 5.
+            error_rate (float):
+                Share of failures among recent requests opening the
+                circuit. Defaults to 0.5.
+            window (int):
+                Number of recent requests error rate is computed over.
+                Defaults to 20.
+            min_requests (int):
+                Error rate is not checked until the endpoint got this
+                many requests. Defaults to 10.
+            cooldown (float):
+                Seconds the circuit stays open before trial requests.
+                Defaults to 30.
+            half_open_requests (int):
+                Number of successful trial requests closing the circuit,
+                at most that many are in flight at once. Defaults to 1.
+            endpoints (set):
+                Endpoints to guard, all by default. [Optional]
+            metrics (slideshare.metrics.Metrics):
+                Receives state changes of the circuits via
+                `record_circuit`. [Optional]
+        """
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.window = window
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self.half_open_requests = half_open_requests
+        self.endpoints = frozenset(endpoints) if endpoints else None
+        self.metrics = metrics
+        self.circuits = {}
+        self._lock = threading.Lock()
+
+    def applies_to(self, endpoint):
+        return self.endpoints is None or endpoint in self.endpoints
+
+    @staticmethod
+    def is_failure(exception):
+        """ Classifies exception the request failed with: True for failures
+        of the endpoint, False for errors responded by the alive endpoint
+        and None for errors raised before or besides the transport, like
+        `RateLimitExceeded` or `KeyboardInterrupt`, which are not outcomes
+        of the endpoint
+        """
+        if isinstance(exception, HTTPError):
+            response = exception.response
+            return response is None or response.status_code >= 500
+        if isinstance(exception, RequestException):
+            return True
+        return None
+
+    def _circuit(self, endpoint):
+        circuit = self.circuits.get(endpoint)
+        if circuit is None:
+            circuit = self.circuits[endpoint] = _Circuit(self.window)
+        return circuit
+
+    def _change(self, endpoint, circuit, state):
+        # Called with the lock held
+        circuit.state = state
+        if state == OPEN:
+            circuit.opened_at = _clock()
+            circuit.opened += 1
+            logger.warning("Circuit of %s is open for %.1fs", endpoint,
+                           self.cooldown)
+        elif state == HALF_OPEN:
+            circuit.probes = circuit.probe_successes = 0
+        else:
+            circuit.failures = 0
+            circuit.outcomes.clear()
+            logger.info("Circuit of %s is closed", endpoint)
+        if self.metrics is not None:
+            self.metrics.record_circuit(endpoint, state)
+
+    def allow(self, endpoint):
+        """ Called before the request is sent
+
+        Raises:
+            CircuitOpenError: if the circuit of the endpoint is open or
+                enough trial requests are in flight already
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == OPEN:
+                remaining = circuit.opened_at + self.cooldown - _clock()
+                if remaining > 0:
+                    circuit.rejected += 1
+                    raise CircuitOpenError(endpoint, remaining)
+                self._change(endpoint, circuit, HALF_OPEN)
+            if circuit.state == HALF_OPEN:
+                if circuit.probes >= self.half_open_requests:
+                    circuit.rejected += 1
+                    raise CircuitOpenError(endpoint, 0.0)
+                circuit.probes += 1
+
+    def record(self, endpoint, success):
+        """ Called with outcome of every request let through by `allow`
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                if not success:
+                    self._change(endpoint, circuit, OPEN)
+                    return
+                circuit.probe_successes += 1
+                if circuit.probe_successes >= self.half_open_requests:
+                    self._change(endpoint, circuit, CLOSED)
+                return
+            if circuit.state == OPEN:
+                # Sent before the circuit opened
+                return
+            circuit.outcomes.append(not success)
+            if success:
+                circuit.failures = 0
+                return
+            circuit.failures += 1
+            failed = sum(circuit.outcomes)
+            if circuit.failures >= self.failure_threshold or (
+                    len(circuit.outcomes) >= self.min_requests and
+                    failed >= self.error_rate * len(circuit.outcomes)):
+                self._change(endpoint, circuit, OPEN)
+
+    def release(self, endpoint):
+        """ Called instead of `record` when the request let through by
+        `allow` has no outcome, frees its trial slot
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+
+    def guard(self, endpoint, is_failure=None):
+        """ Returns context manager guarding the request sent in its block
+        by the circuit of the endpoint, for both sync and async clients::
+
+            with breaker.guard("get_slideshow"):
+                response = send()
+
+        Args:
+            endpoint (string): endpoint of the request
+            is_failure (callable):
+                Classifies exceptions like `is_failure`, which is used by
+                default. [Optional]
+
+        Raises:
+            CircuitOpenError: if the circuit doesn't let the request through
+        """
+        self.allow(endpoint)
+        return _Guard(self, endpoint, is_failure or self.is_failure)
+
+    def call(self, endpoint, func):
+        """ Calls `func` guarded by the circuit of the endpoint """
+        with self.guard(endpoint):
+            return func()
+
+    def state(self, endpoint):
+        """ Returns state of the endpoint circuit: "closed", "open" or
+        "half_open". Open circuit past cool-down is reported half-open.
+        """
+        with self._lock:
+            circuit = self.circuits.get(endpoint)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and \
+                    _clock() >= circuit.opened_at + self.cooldown:
+                return HALF_OPEN
+            return circuit.state
+
+    def stats(self):
+        """ Returns per endpoint state, consecutive failures, error rate
+        over the window, number of times the circuit opened and number of
+        rejected requests
+        """
+        with self._lock:
+            endpoints = list(self.circuits.items())
+        result = {}
+        for endpoint, circuit in endpoints:
+            outcomes = list(circuit.outcomes)
+            result[endpoint] = {
+                "state": self.state(endpoint),
+                "failures": circuit.failures,
+                "error_rate": (float(sum(outcomes)) / len(outcomes)
+                               if outcomes else 0.0),
+                "opened": circuit.opened,
+                "rejected": circuit.rejected,
+            }
+        return result
+
+    def reset(self):
+        """ Closes all circuits """
+        with self._lock:
+            for endpoint, circuit in self.circuits.items():
+                if circuit.state != CLOSED:
+                    self._change(endpoint, circuit, CLOSED)
+            self.circuits.clear()
@@ -0,0 +1,227 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import io
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.exceptions import RequestException
+
+from slideshare.exceptions import SlideShareError
+from slideshare.tracing import wrap
+
+logger = logging.getLogger(__name__)
+
+# Extensions of the files `upload_directory` picks up
+DEFAULT_EXTENSIONS = (".pdf", ".ppt", ".pptx", ".pps", ".ppsx", ".pot",
+                      ".potx", ".odp", ".key", ".doc", ".docx", ".odt",
+                      ".rtf", ".xls", ".xlsx", ".ods")
+
+
+class Journal(object):
+    """ Append-only log of uploaded files in JSON lines format.
+
+    Every record is flushed to disk before `write` returns, so the journal
+    survives crashes. Incomplete last line left by the crash is cut off on
+    open, so new records start on a line of their own.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.uploaded = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            complete = 0
+            with io.open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    complete += len(line)
+                    try:
+                        record = json.loads(line.decode("utf-8"))
+                    except ValueError:
+                        continue
+                    if record.get("slideshow_id"):
+                        self.uploaded[record["path"]] = record["slideshow_id"]
+            if complete < os.path.getsize(path):
+                with io.open(path, "r+b") as f:
+                    f.truncate(complete)
+        self._file = io.open(path, "a", encoding="utf-8")
+
+    def __contains__(self, path):
+        return path in self.uploaded
+
+    def write(self, record):
+        line = json.dumps(record, sort_keys=True)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            if record.get("slideshow_id"):
+                self.uploaded[record["path"]] = record["slideshow_id"]
+
+    def close(self):
+        self._file.close()
+
+
+class Progress(object):
+    """ Bulk upload counters """
+
+    def __init__(self, total):
+        self.total = total
+        self.uploaded = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes = 0
+        self.started = time.time()
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started
+
+    @property
+    def files_per_second(self):
+        elapsed = self.elapsed
+        return self.uploaded / elapsed if elapsed else 0.0
+
+    @property
+    def megabytes_per_second(self):
+        elapsed = self.elapsed
+        return self.bytes / 1024.0 / 1024.0 / elapsed if elapsed else 0.0
+
+    def __str__(self):
+        return ("{0.uploaded}/{0.total} uploaded, {0.skipped} skipped, "
+                "{0.failed} failed, {1:.2f} files/s, {2:.2f} MB/s".format(
+                    self, self.files_per_second, self.megabytes_per_second))
+
+
+class BulkUploader(object):
+    """ Uploads many files in parallel.
+
+    Every uploaded file is recorded in the journal with returned slideshow
+    id, files found in the journal are skipped, so interrupted run may be
+    simply restarted::
+
+        uploader = BulkUploader(client, "upload.journal", max_workers=8)
+        progress = uploader.upload_directory("/path/to/library")
+    """
+
+    def __init__(self, client, journal_path, max_workers=4, callback=None,
+                 **options):
+        """
+        Args:
+            client (slideshare.client.SlideShareAPI):
+                Client to upload with.
+            journal_path (string):
+                Path to the journal file, created if not exists.
+            max_workers (int):
+                Number of parallel uploads. Defaults to 4. [Optional]
+            callback (callable):
+                Called with `Progress` instance after every file. [Optional]
+            **options:
+                Default `upload_slideshow` options, e.g. `username`,
+                `password`, `make_src_public`. [Optional]
+        """
+        self.client = client
+        self.journal_path = journal_path
+        self.max_workers = max_workers
+        self.callback = callback
+        self.options = options
+
+    def upload_directory(self, path, extensions=DEFAULT_EXTENSIONS,
+                         recursive=True):
+        """ Upload all documents in the directory
+
+        Slideshow title is the filename without extension.
+        """
+        items = []
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.lower().endswith(tuple(extensions)):
+                    items.append({"path": os.path.join(root, filename)})
+            if not recursive:
+                break
+        return self.upload(items)
+
+    def upload_manifest(self, manifest_path):
+        """ Upload files listed in the manifest
+
+        Manifest is a JSON lines file, every line is an object with `path`
+        of the file and `upload_slideshow` options, e.g. `slideshow_title`
+        or `slideshow_tags`. Relative paths are resolved against the
+        manifest directory.
+        """
+        base = os.path.dirname(os.path.abspath(manifest_path))
+        items = []
+        with io.open(manifest_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                item["path"] = os.path.join(base, item["path"])
+                items.append(item)
+        return self.upload(items)
+
+    def upload(self, items):
+        """ Upload files
+
+        Args:
+            items (list):
+                dicts with `path` of the file and `upload_slideshow`
+                options
+
+        Returns:
+            Progress: upload counters
+        """
+        journal = Journal(self.journal_path)
+        progress = Progress(len(items))
+        lock = threading.Lock()
+
+        def report(**counters):
+            with lock:
+                for name, value in counters.items():
+                    setattr(progress, name, getattr(progress, name) + value)
+                logger.info(progress)
+                if self.callback is not None:
+                    self.callback(progress)
+
+        def upload(item):
+            item = dict(item)
+            path = os.path.abspath(item.pop("path"))
+            if path in journal:
+                report(skipped=1)
+                return
+            options = dict(self.options)
+            options.update(item)
+            title = options.pop("slideshow_title", None) or \
+                os.path.splitext(os.path.basename(path))[0]
+            started = time.time()
+            try:
+                response = self.client.upload_slideshow(
+                    title, slideshow_srcfile=path, **options)
+                slideshow_id = response["SlideShowUploaded"]["SlideShowID"]
+            except (SlideShareError, RequestException, EnvironmentError,
+                    ValueError, KeyError) as e:
+                logger.error("Failed to upload %s: %s", path, e)
+                journal.write({"path": path, "error": str(e)})
+                report(failed=1)
+                return
+            size = os.path.getsize(path)
+            journal.write({"path": path, "slideshow_id": slideshow_id,
+                           "size": size,
+                           "duration": round(time.time() - started, 3)})
+            report(uploaded=1, bytes=size)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                upload = wrap(upload)
+                for future in [executor.submit(upload, item)
+                               for item in items]:
+                    future.result()
+        finally:
+            journal.close()
+        return progress
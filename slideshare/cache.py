@@ -0,0 +1,372 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from slideshare.utils import listify
+
+# Read-only endpoints which responses may be cached
+CACHEABLE_ENDPOINTS = frozenset([
+    "get_slideshow",
+    "get_slideshows_by_tag",
+    "get_slideshows_by_group",
+    "get_slideshows_by_user",
+    "search_slideshows",
+    "get_user_groups",
+    "get_user_contacts",
+])
+
+# Endpoints which change slideshow with `slideshow_id`
+INVALIDATING_ENDPOINTS = frozenset([
+    "edit_slideshow",
+    "delete_slideshow",
+])
+
+# Parameters which differ between identical requests
+VOLATILE_PARAMS = frozenset(["ts", "hash", "api_key"])
+
+
+def cache_key(endpoint, params):
+    """ Returns cache key for the endpoint and request parameters.
+
+    Parameters are normalized: volatile `ts`, `hash` and `api_key` are
+    excluded and the rest are sorted by name. The key is hashed, so
+    passwords never stored as is.
+    """
+    normalized = "&".join(
+        "{}={}".format(name, params[name]) for name in sorted(params)
+        if name not in VOLATILE_PARAMS and params[name] is not None)
+    key = "{}?{}".format(endpoint, normalized)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def slideshow_ids(data):
+    """ Returns ids of all slideshows in the parsed response
+    """
+    ids = set()
+    for root, value in data.items():
+        if root == "Slideshow":
+            slideshows = [value]
+        elif isinstance(value, dict):
+            slideshows = listify(value.get("Slideshow"))
+        else:
+            continue
+        for slideshow in slideshows:
+            if isinstance(slideshow, dict) and slideshow.get("ID"):
+                ids.add(str(slideshow["ID"]))
+    return ids
+
+
+class BaseCache(object):
+    """ Response cache interface.
+
+    Subclasses must implement `_get`, `_set`, `invalidate` and `clear`.
+    """
+
+    def __init__(self, ttl=300, ttls=None):
+        """
+        Args:
+            ttl (int):
+                Time to live of the cached response in seconds.
+                None means responses never expire. Defaults to 300.
+            ttls (dict):
+                Per endpoint time to live, e.g.
+                ``{"get_slideshows_by_tag": 60}``. [Optional]
+        """
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint, self.ttl)
+
+    def get(self, endpoint, params):
+        """ Returns cached response or None
+        """
+        data = self._get(cache_key(endpoint, params), time.time())
+        with self._stats_lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def set(self, endpoint, params, content, data):
+        """ Store response of the endpoint.
+
+        Args:
+            content (bytes): raw response body
+            data (dict): parsed response
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl is not None and ttl <= 0:
+            return
+        expires = time.time() + ttl if ttl is not None else None
+        self._set(cache_key(endpoint, params), content, data, expires,
+                  slideshow_ids(data))
+
+    def invalidate(self, slideshow_id):
+        """ Drop all cached responses which include the slideshow
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _get(self, key, now):
+        raise NotImplementedError
+
+    def _set(self, key, content, data, expires, ids):
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """ In-process cache of parsed responses with TTL and LRU eviction.
+
+    Cached responses are shared between callers and must be treated
+    as read-only.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300, ttls=None):
+        """
+        Args:
+            maxsize (int):
+                Max number of cached responses. Least recently used
+                responses are evicted first. Defaults to 1024.
+            ttl (int):
+                Time to live of the cached response in seconds.
+                None means responses never expire. Defaults to 300.
+            ttls (dict):
+                Per endpoint time to live. [Optional]
+        """
+        super(MemoryCache, self).__init__(ttl=ttl, ttls=ttls)
+        self.maxsize = maxsize
+        self.evictions = 0
+        # key -> (expires, data, slideshow ids)
+        self._entries = OrderedDict()
+        # slideshow id -> keys of responses including it
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, data, _ = entry
+            if expires is not None and expires <= now:
+                self._remove(key)
+                return None
+            # Mark as most recently used
+            self._entries[key] = self._entries.pop(key)
+            return data
+
+    def _set(self, key, content, data, expires, ids):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires, data, ids)
+            for slideshow_id in ids:
+                self._index.setdefault(slideshow_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, _, ids = self._entries.pop(key)
+        for slideshow_id in ids:
+            keys = self._index.get(slideshow_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[slideshow_id]
+
+    def invalidate(self, slideshow_id):
+        with self._lock:
+            for key in list(self._index.get(str(slideshow_id), ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._index.clear()
+
+    def stats(self):
+        stats = super(MemoryCache, self).stats()
+        stats.update(size=len(self._entries), evictions=self.evictions)
+        return stats
+
+
+class SQLiteCache(BaseCache):
+    """ Persistent cache of raw responses in SQLite database.
+
+    Survives process restarts and may be shared by several processes on
+    the same host: database is opened in WAL mode, so readers never block
+    each other. Responses are parsed on every hit.
+
+    Total size of the responses is tracked in memory and recomputed from
+    the database every `trim_interval` writes, which accounts for writes of
+    other processes. Expired responses are removed then as well.
+    """
+    trim_interval = 100
+
+    def __init__(self, path, max_size=100 * 1024 * 1024, ttl=24 * 60 * 60,
+                 ttls=None, loads=None, timeout=30):
+        """
+        Args:
+            path (string):
+                Path to the database file.
+            max_size (int):
+                Max total size of stored responses in bytes. The oldest
+                responses are evicted first. Defaults to 100MB.
+            ttl (int):
+                Time to live of the cached response in seconds.
+                None means responses never expire. Defaults to 1 day.
+            ttls (dict):
+                Per endpoint time to live. [Optional]
+            loads (callable):
+                Parses stored response body. Defaults to
+                `SlideShareAPI.parse_response`. [Optional]
+            timeout (float):
+                How long to wait for the database lock held by another
+                process. Defaults to 30 seconds. [Optional]
+        """
+        super(SQLiteCache, self).__init__(ttl=ttl, ttls=ttls)
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._loads = loads
+        self._local = threading.local()
+        with self._connection() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                       "key TEXT PRIMARY KEY, content BLOB NOT NULL, "
+                       "size INTEGER NOT NULL, created REAL NOT NULL, "
+                       "expires REAL)")
+            db.execute("CREATE TABLE IF NOT EXISTS slideshows ("
+                       "slideshow_id TEXT NOT NULL, key TEXT NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS slideshows_id "
+                       "ON slideshows (slideshow_id)")
+            db.execute("CREATE INDEX IF NOT EXISTS slideshows_key "
+                       "ON slideshows (key)")
+        # Total size of the responses, unknown until the first trim
+        self._size = None
+        self._writes = 0
+        self._size_lock = threading.Lock()
+
+    def loads(self, content):
+        if self._loads is None:
+            from slideshare.client import BaseSlideShareAPI
+            self._loads = BaseSlideShareAPI.parse_response
+        return self._loads(content)
+
+    def _connection(self):
+        """ Returns connection of the current thread and process
+        """
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            # Imported on first use, most clients never touch SQLite
+            import sqlite3
+            self._binary = sqlite3.Binary
+            db = sqlite3.connect(self.path, timeout=self.timeout)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def _get(self, key, now):
+        row = self._connection().execute(
+            "SELECT content FROM responses "
+            "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, now)).fetchone()
+        if row is None:
+            return None
+        return self.loads(bytes(row[0]))
+
+    def _set(self, key, content, data, expires, ids):
+        with self._connection() as db:
+            freed = self._delete(db, [key])
+            db.execute("INSERT INTO responses VALUES (?, ?, ?, ?, ?)",
+                       (key, self._binary(content), len(content),
+                        time.time(), expires))
+            db.executemany("INSERT INTO slideshows VALUES (?, ?)",
+                           [(slideshow_id, key) for slideshow_id in ids])
+            with self._size_lock:
+                self._writes += 1
+                trim = self._size is None or \
+                    self._writes % self.trim_interval == 0
+                if not trim:
+                    self._size += len(content) - freed
+                    trim = self._size > self.max_size
+            if trim:
+                self._trim(db)
+
+    def _trim(self, db):
+        now = time.time()
+        # Index rows go first, while expired responses are still there
+        db.execute("DELETE FROM slideshows WHERE key IN "
+                   "(SELECT key FROM responses WHERE expires <= ?)", (now,))
+        db.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+        total, = db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        excess = total - self.max_size
+        if excess > 0:
+            keys = []
+            for key, size in db.execute("SELECT key, size FROM responses "
+                                        "ORDER BY created"):
+                keys.append(key)
+                excess -= size
+                if excess <= 0:
+                    break
+            total -= self._delete(db, keys)
+        with self._size_lock:
+            self._size = total
+
+    def _delete(self, db, keys):
+        """ Deletes responses, returns their total size """
+        params = [(key,) for key in keys]
+        freed = 0
+        for param in params:
+            row = db.execute("SELECT size FROM responses WHERE key = ?",
+                             param).fetchone()
+            if row is not None:
+                freed += row[0]
+        db.executemany("DELETE FROM responses WHERE key = ?", params)
+        db.executemany("DELETE FROM slideshows WHERE key = ?", params)
+        return freed
+
+    def invalidate(self, slideshow_id):
+        with self._connection() as db:
+            keys = [key for key, in db.execute(
+                "SELECT key FROM slideshows WHERE slideshow_id = ?",
+                (str(slideshow_id),))]
+            freed = self._delete(db, keys)
+        with self._size_lock:
+            if self._size is not None:
+                self._size -= freed
+
+    def clear(self):
+        with self._connection() as db:
+            db.execute("DELETE FROM responses")
+            db.execute("DELETE FROM slideshows")
+        with self._size_lock:
+            self._size = 0
+
+    def stats(self):
+        stats = super(SQLiteCache, self).stats()
+        size, total = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) "
+            "FROM responses").fetchone()
+        stats.update(size=size, bytes=total)
+        return stats
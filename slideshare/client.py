@@ -5,26 +5,230 @@ import logging
 import time
 
 import requests
-import xmltodict
 from requests.exceptions import RequestException
 
+from slideshare.cache import (CACHEABLE_ENDPOINTS, INVALIDATING_ENDPOINTS,
+                              cache_key)
 from slideshare.exceptions import SlideShareError
+from slideshare.metrics import Measurement, Metrics
+from slideshare.pool import PoolingAdapter
+from slideshare.ratelimit import QUOTA_ERRORS
+from slideshare.retry import IDEMPOTENT_ENDPOINTS
+from slideshare.singleflight import SingleFlight
 from slideshare.slideshow import SlideshowMixin
+from slideshare.tracing import NULL_SPAN, wrap
+from slideshare.user import UserMixin
+from slideshare.utils import slideshow_lookup
 
 logger = logging.getLogger(__name__)
 
+# Size of the chunks streamed response body is read by
+STREAM_CHUNK_SIZE = 16 * 1024
 
-class SlideShareAPI(requests.Session, SlideshowMixin):
+# Smaller responses are parsed in the calling thread even if parse pool
+# is set, sending them to another process costs more than parsing
+PARSE_POOL_MIN_SIZE = 64 * 1024
+
+
+def make_hash(shared_secret, timestamp):
+    """ SHA1 hash of the concatenation of the shared secret and
+    the timestamp, required as `hash` parameter of every request
+    """
+    value = shared_secret + str(timestamp)
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+
+class BaseSlideShareAPI(object):
+    """ Transport-agnostic part of the SlideShare API client: credentials,
+    request signing and response parsing. Subclasses must implement
+    `get` and `post`.
+    """
 
     __API_VERSION__ = 2
     BASE_URL = "https://www.slideshare.net/api/{}/".format(__API_VERSION__)
 
+    shared_secret = None
+    username = None
+    password = None
+    cache = None
+    rate_limiter = None
+    retry_policy = None
+    models = False
+    metrics = Metrics()
+    tracer = None
+    single_flight = None
+    parse_pool = None
+    circuit_breaker = None
+    parse_pool_min_size = PARSE_POOL_MIN_SIZE
+    _signature = None
+
+    def _url(self, relative_url):
+        return "{0}{1}".format(self.BASE_URL, relative_url)
+
+    def _cached(self, url, params):
+        """ Returns cached response of read-only endpoint or None
+        """
+        if self.cache is None or url not in CACHEABLE_ENDPOINTS:
+            return None
+        data = self.cache.get(url, params)
+        if data is not None:
+            return self._result(data)
+        return None
+
+    def _handle_response(self, url, params, content):
+        """ Parses response body and updates cache and rate limiter
+        """
+        try:
+            with self._span("parse", bytes=len(content)) as span:
+                if self._offloaded(content):
+                    span.set_attribute("process", True)
+                    from slideshare.parser import parse_load
+                    data, result = self.parse_pool.submit(
+                        parse_load, content, self.models,
+                        self._keep_data(url)).result()
+                else:
+                    data, result = self.parse_response(content), None
+        except SlideShareError as e:
+            self._handle_error(e)
+            raise
+        return self._handled(url, params, content, data, result)
+
+    def _offloaded(self, content):
+        """ Whether response is parsed in the parse pool """
+        return self.parse_pool is not None and \
+            len(content) >= self.parse_pool_min_size
+
+    def _keep_data(self, url):
+        # Parsed mapping is sent back from the parse pool for cache only
+        return self.cache is not None and url in CACHEABLE_ENDPOINTS
+
+    def _handled(self, url, params, content, data, result=None):
+        """ Updates cache and rate limiter with parsed response, returns
+        result converted to models if enabled
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.recover()
+        self._update_cache(url, params, content, data)
+        if result is None:
+            result = self._result(data)
+        return result
+
+    def _span(self, name, **attributes):
+        """ Returns tracing span nested under the active one, no-op span
+        if tracing is disabled
+        """
+        if self.tracer is None:
+            return NULL_SPAN
+        return self.tracer.span(name, **attributes)
+
+    def _handle_error(self, error):
+        """ Slows down the rate limiter if daily quota is exceeded """
+        if self.rate_limiter is not None and error.errno in QUOTA_ERRORS:
+            self.rate_limiter.throttle()
+
+    def _parse_chunk(self, parser, chunk):
+        """ Feeds chunk of streamed listing to `ListingParser`, finishes
+        parsing if chunk is None. Returns list of completed slideshows.
+        """
+        try:
+            if chunk is None:
+                items = parser.close()
+            else:
+                items = parser.feed(chunk)
+        except SlideShareError as e:
+            self._handle_error(e)
+            raise
+        if chunk is None and self.rate_limiter is not None:
+            self.rate_limiter.recover()
+        if self.models:
+            from slideshare.models import Slideshow
+            return [Slideshow.from_dict(item) for item in items]
+        return items
+
+    def _result(self, data):
+        """ Converts parsed response to models if enabled """
+        if self.models:
+            from slideshare.models import load
+            with self._span("model"):
+                return load(data)
+        return data
+
+    def _update_cache(self, url, params, content, data):
+        """ Caches response of read-only endpoint or drops cached responses
+        with slideshow changed by the request
+        """
+        if self.cache is None:
+            return
+        if url in CACHEABLE_ENDPOINTS:
+            self.cache.set(url, params, content, data)
+        elif url in INVALIDATING_ENDPOINTS and "slideshow_id" in params:
+            self.cache.invalidate(params["slideshow_id"])
+
+    def sign(self):
+        """ Returns `ts` and `hash` parameters for the request being sent.
+        Hash is computed once per second.
+        """
+        timestamp = int(time.time())
+        # (timestamp, hash) tuple is replaced at once, safe to share
+        # between threads
+        signature = self._signature
+        if signature is None or signature[0] != timestamp:
+            signature = (timestamp, make_hash(self.shared_secret, timestamp))
+            self._signature = signature
+        return {"ts": signature[0], "hash": signature[1]}
+
+    @staticmethod
+    def parse_response(content):
+        """ Parses response body to `xmltodict` compatible mapping, raises
+        SlideShareError if service responded with an error
+        """
+        # ElementTree is imported with the first response
+        from slideshare.parser import parse
+        return parse(content)
+
+    def prefetch_default_credentials(self, params, options, required=False):
+        """ Prefetch default credentials if they are not specified.
+        """
+        if "username" in options:
+            params["username"] = options["username"]
+        elif self.username:
+            params["username"] = self.username
+        elif required:
+            raise ValueError("Credentials error: username must be "
+                             "provided for this type of request")
+        if "password" in options:
+            params["password"] = options["password"]
+        elif self.password:
+            params["password"] = self.password
+        elif required:
+            raise ValueError("Credentials error: password must be "
+                             "provided for this type of request")
+        return params
+
+
+class SlideShareAPI(requests.Session, BaseSlideShareAPI, SlideshowMixin,
+                    UserMixin):
+
     def __init__(self,
                  api_key,
                  shared_secret,
                  username=None,
                  password=None,
-                 debug_http=False):
+                 debug_http=False,
+                 cache=None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 models=False,
+                 pool_connections=10,
+                 pool_maxsize=10,
+                 pool_block=False,
+                 keepalive=None,
+                 metrics=None,
+                 tracer=None,
+                 coalesce=True,
+                 parse_pool=None,
+                 parse_pool_min_size=PARSE_POOL_MIN_SIZE,
+                 circuit_breaker=None):
         """ Initialize SlideShare API client
 
         Args:
@@ -39,10 +243,63 @@ class SlideShareAPI(requests.Session, SlideshowMixin):
                 Default password of the requesting user. [Optional]
             debug_http (boolean):
                 Set to True to enable debug mode. Defaults to False. [Optional]
+            cache (slideshare.cache.BaseCache):
+                Cache for responses of read-only endpoints, e.g.
+                `slideshare.cache.MemoryCache`. Disabled by default. [Optional]
+            rate_limiter (slideshare.ratelimit.RateLimiter):
+                Paces requests sent by the client. [Optional]
+            retry_policy (slideshare.retry.RetryPolicy):
+                Retries idempotent requests failed with transient
+                errors. [Optional]
+            models (boolean):
+                Return compact `slideshare.models` objects instead of
+                mappings. Defaults to False. [Optional]
+            pool_connections (int):
+                Number of hosts to keep connection pools for.
+                Defaults to 10. [Optional]
+            pool_maxsize (int):
+                Max number of connections kept open per host, set it to
+                the number of threads sharing the client. Defaults to 10.
+                [Optional]
+            pool_block (boolean):
+                Wait for a free pooled connection instead of opening
+                a throwaway one. Defaults to False. [Optional]
+            keepalive (int):
+                Send TCP keep-alive probes after given number of seconds
+                of inactivity. Disabled by default. [Optional]
+            metrics (slideshare.metrics.Metrics):
+                Hook called after every request with endpoint, status,
+                error, sizes and duration, e.g.
+                `slideshare.metrics.InMemoryMetrics`. [Optional]
+            tracer (slideshare.tracing.Tracer):
+                Records spans of call phases: signing, request
+                preparation, network, parsing. [Optional]
+            coalesce (boolean):
+                Concurrent identical read requests share one network
+                request, waiting threads get copies of the result.
+                Defaults to True. [Optional]
+            parse_pool (concurrent.futures.ProcessPoolExecutor):
+                Parse large responses and build models in worker
+                processes instead of the calling thread, so threads
+                sharing the client don't contend for the GIL. The pool
+                is not shut down by the client. [Optional]
+            parse_pool_min_size (int):
+                Responses smaller than this size in bytes are parsed in
+                the calling thread. Defaults to 64K. [Optional]
+            circuit_breaker (slideshare.breaker.CircuitBreaker):
+                Fails requests to the endpoint at once with
+                `CircuitOpenError` after repeated failures, until it
+                recovers. [Optional]
         """
 
         # Initialize requests session
         super(SlideShareAPI, self).__init__()
+        self.adapter = PoolingAdapter(pool_connections=pool_connections,
+                                      pool_maxsize=pool_maxsize,
+                                      pool_block=pool_block,
+                                      keepalive=keepalive)
+        self.mount("https://", self.adapter)
+        self.mount("http://", self.adapter)
 
         required_list = [api_key, shared_secret]
         if not all(required_list):
@@ -54,6 +311,18 @@ class SlideShareAPI(requests.Session, SlideshowMixin):
         # Default credentials
         self.username = username
         self.password = password
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.models = models
+        if metrics is not None:
+            self.metrics = metrics
+        self.tracer = tracer
+        if coalesce:
+            self.single_flight = SingleFlight()
+        self.parse_pool = parse_pool
+        self.parse_pool_min_size = parse_pool_min_size
+        self.circuit_breaker = circuit_breaker
 
         self._debug_http = bool(debug_http)
         if self._debug_http:
@@ -73,77 +342,184 @@ class SlideShareAPI(requests.Session, SlideshowMixin):
             requests_log.setLevel(logging.DEBUG)
             requests_log.propagate = True
 
-    def _url(self, relative_url):
-        return "{0}{1}".format(self.BASE_URL, relative_url)
+    def _send(self, method, endpoint, url, **kwargs):
+        """ Sends the request, paced by rate limiter, guarded by circuit
+        breaker and retried according to the retry policy
+        """
+        breaker = self.circuit_breaker
+        if breaker is not None and not breaker.applies_to(endpoint):
+            breaker = None
 
-    def get(self, url, **kwargs):
-        url = self._url(url)
-        try:
-            response = super(SlideShareAPI, self).get(url, params=kwargs)
+        def send():
+            response = self.request(method, url, **kwargs)
             # Raise HTTPError on 40x and 50x
             response.raise_for_status()
-        # FIXME: ValueError?
-        except (ValueError, RequestException) as e:
-            logger.error(e)
-            # TODO: extend SlideShareError with ValueError and RequestException?
-            raise e
-        logger.debug(response.content)
-        return self.parse_response(response.content)
+            return response
 
-    def post(self, url, data=None, json=None, **kwargs):
-        url = self._url(url)
-        try:
-            files = None
-            if "files" in kwargs:
-                files = kwargs["files"]
-                del kwargs["files"]
-            response = super(SlideShareAPI, self).post(url, data, json,
-                                                       files=files,
-                                                       params=kwargs)
-            # Raise HTTPError on 40x and 50x
-            response.raise_for_status()
-        except (ValueError, RequestException) as e:
-            logger.error(e)
-            # TODO: add error wrapper
-            raise e
-        logger.debug(response.content)
-        return self.parse_response(response.content)
+        def attempt():
+            # Requests rejected by the rate limiter never reach the
+            # breaker, they tell nothing about the endpoint
+            if self.rate_limiter is not None:
+                with self._span("rate_limit"):
+                    self.rate_limiter.acquire()
+            if breaker is None:
+                return send()
+            # Every attempt is checked, open circuit stops retries
+            with breaker.guard(endpoint):
+                return send()
+
+        if self.retry_policy is not None and \
+                self.retry_policy.applies_to(endpoint):
+            return self.retry_policy.call(endpoint, attempt)
+        return attempt()
+
+    def get(self, url, **kwargs):
+        with self._span(url, method="GET") as span:
+            data = self._cached(url, kwargs)
+            if data is not None:
+                span.set_attribute("cached", True)
+                return data
+            if self.single_flight is not None and \
+                    url in IDEMPOTENT_ENDPOINTS:
+                return self.single_flight.do(
+                    cache_key(url, kwargs), lambda: self._get(url, kwargs))
+            return self._get(url, kwargs)
+
+    def _get(self, endpoint, kwargs):
+        url = self._url(endpoint)
+        with Measurement(self.metrics, endpoint) as measurement:
+            try:
+                response = self._send("GET", endpoint, url, params=kwargs)
+            # FIXME: ValueError?
+            except (ValueError, RequestException) as e:
+                logger.error(e)
+                # TODO: extend SlideShareError with ValueError and
+                # RequestException?
+                raise e
+            self._measure_response(measurement, response)
+            logger.debug(response.content)
+            return self._handle_response(endpoint, kwargs, response.content)
 
     @staticmethod
-    def parse_response(content):
-        data = xmltodict.parse(content)
-        if data.get('SlideShareServiceError'):
-            logger.debug(data)
-            raise SlideShareError(
-                data['SlideShareServiceError']['Message']['@ID'],
-                data['SlideShareServiceError']['Message']['#text'])
-        return data
+    def _measure_response(measurement, response, content=True):
+        measurement.status = response.status_code
+        body = response.request.body
+        measurement.request_bytes = len(response.request.url) + (
+            len(body) if body is not None else 0)
+        if content:
+            measurement.response_bytes = len(response.content)
+
+    def stream_listing(self, url, **kwargs):
+        """ Sends GET request to listing endpoint and yields slideshows
+        as they are parsed from the response body.
+
+        Parsing starts with the first received bytes and the body is not
+        kept in memory. Streamed responses are not cached, failures while
+        reading the body are not retried.
+        """
+        endpoint, url = url, self._url(url)
+        from slideshare.parser import ListingParser
+        parser = ListingParser()
+        with Measurement(self.metrics, endpoint) as measurement:
+            response = self._send("GET", endpoint, url, params=kwargs,
+                                  stream=True)
+            self._measure_response(measurement, response, content=False)
+            try:
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    measurement.response_bytes += len(chunk)
+                    for item in self._parse_chunk(parser, chunk):
+                        yield item
+                for item in self._parse_chunk(parser, None):
+                    yield item
+            finally:
+                response.close()
+
+    def post(self, url, data=None, json=None, **kwargs):
+        with self._span(url, method="POST"):
+            endpoint, url = url, self._url(url)
+            files = kwargs.pop("files", None)
+            progress_callback = kwargs.pop("progress_callback", None)
+            headers = None
+            if files:
+                # Stream multipart body instead of building it in memory
+                from slideshare.multipart import MultipartEncoder
+                data = MultipartEncoder(data, files,
+                                        callback=progress_callback)
+                headers = {"Content-Type": data.content_type}
+            with Measurement(self.metrics, endpoint) as measurement:
+                try:
+                    response = self._send("POST", endpoint, url, data=data,
+                                          json=json, headers=headers,
+                                          params=kwargs)
+                except (ValueError, RequestException) as e:
+                    logger.error(e)
+                    # TODO: add error wrapper
+                    raise e
+                finally:
+                    if files:
+                        data.close()
+                self._measure_response(measurement, response)
+                logger.debug(response.content)
+                return self._handle_response(endpoint, kwargs,
+                                             response.content)
+
+    def get_slideshows(self, slideshows, max_workers=10, **optional):
+        """ Get information about many slideshows at once
+
+        Requests are sent in parallel over the session connection pool.
+        A failed lookup does not abort the batch: the exception is returned
+        in place of the result.
+
+        Args:
+            slideshows (list):
+                ids or urls of the slideshows to be fetched
+            max_workers (int):
+                Max number of requests in flight. Defaults to 10, the size
+                of the session connection pool. [Optional]
+            **optional:
+                Passed to `get_slideshow` as is. [Optional]
+
+        Returns:
+            list: `get_slideshow` responses or `SlideShareError`,
+            `RequestException` and `ValueError` instances in the order
+            of `slideshows`.
+        """
+        def fetch(slideshow):
+            kwargs = slideshow_lookup(slideshow)
+            kwargs.update(optional)
+            try:
+                return self.get_slideshow(**kwargs)
+            except (SlideShareError, RequestException, ValueError) as e:
+                return e
+
+        slideshows = list(slideshows)
+        if not slideshows:
+            return []
+        max_workers = max(1, min(max_workers, len(slideshows)))
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(wrap(fetch), slideshows))
 
     def prepare_request(self, request):
         """ Overrides requests.Session method. All requests in addition
-        to `api_key` must provide `ts` and `hash` parameters
+        to `api_key` must provide `ts` and `hash` parameters.
+
+        Signature is added to the parameters of the request being prepared,
+        shared session parameters are never modified, so the client may be
+        used from many threads.
         """
-        timestamp = int(time.time())
-        self.params["ts"] = timestamp
-        hash = self.shared_secret + str(timestamp)
-        self.params["hash"] = hashlib.sha1(hash.encode("utf-8")).hexdigest()
-        return super(SlideShareAPI, self).prepare_request(request)
+        with self._span("sign"):
+            params = dict(request.params or {})
+            params.update(self.sign())
+        request.params = params
+        with self._span("prepare"):
+            return super(SlideShareAPI, self).prepare_request(request)
 
-    def prefetch_default_credentials(self, params, options, required=False):
-        """ Prefetch default credentials if they are not specified.
+    def send(self, request, **kwargs):
+        """ Overrides requests.Session method to trace the network phase:
+        connection, transfer of the request and the response
         """
-        if "username" in options:
-            params["username"] = options["username"]
-        elif self.username:
-            params["username"] = self.username
-        elif required:
-            raise ValueError("Credentials error: username must be "
-                             "provided for this type of request")
-        if "password" in options:
-            params["password"] = options["password"]
-        elif self.password:
-            params["password"] = self.password
-        elif required:
-            raise ValueError("Credentials error: password must be "
-                             "provided for this type of request")
-        return params
+        with self._span("network") as span:
+            response = super(SlideShareAPI, self).send(request, **kwargs)
+            span.set_attribute("status", response.status_code)
+            return response
@@ -32,8 +32,43 @@ class SlideShareError(Exception):
         100 Your Account has been blocked
     """
     def __init__(self, errno, errmsg):
+        # Exception args are needed to unpickle errors raised by
+        # parsers running in another process
+        super(SlideShareError, self).__init__(errno, errmsg)
         self.errno = errno
         self.errmsg = errmsg
 
     def __str__(self):
         return "SlideShareError {}: {}".format(self.errno, self.errmsg)
+
+
+class RateLimitExceeded(SlideShareError):
+    """ Client-side rate limit budget is exhausted and the request was not
+    sent. `retry_after` is the number of seconds until the budget allows
+    the request.
+    """
+    def __init__(self, errmsg, retry_after):
+        super(RateLimitExceeded, self).__init__(None, errmsg)
+        self.args = (errmsg, retry_after)
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return "RateLimitExceeded: {} (retry after {:.3f}s)".format(
+            self.errmsg, self.retry_after)
+
+
+class CircuitOpenError(SlideShareError):
+    """ Request was not sent because the circuit breaker of the endpoint
+    is open after repeated failures. `retry_after` is the number of
+    seconds until trial requests are let through.
+    """
+    def __init__(self, endpoint, retry_after):
+        super(CircuitOpenError, self).__init__(
+            None, "circuit of {} is open".format(endpoint))
+        self.args = (endpoint, retry_after)
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return "CircuitOpenError: {} (retry after {:.3f}s)".format(
+            self.errmsg, self.retry_after)
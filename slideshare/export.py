@@ -0,0 +1,311 @@
+""" Streaming export of slideshow listings to JSON lines or CSV files.
+
+Listing pages are parsed while they are received and written page by
+page, so memory usage is bounded by a single page regardless of the
+number of exported slideshows::
+
+    export_slideshows(client, "python.jsonl.gz", tag="python")
+    export_slideshows(client, "user.csv.bz2", username_for="user")
+
+Format and compression are picked by the file extension: ``.jsonl`` or
+``.csv``, optionally followed by ``.gz`` or ``.bz2``. Every page is
+compressed as a separate gzip member or bzip2 stream, standard tools and
+`gzip`/`bz2` modules read such files as a whole.
+
+Export keeps a checkpoint next to the file with the offset and the file
+size after the last written page. Interrupted export started again with
+the same arguments drops the partially written page and resumes from the
+checkpoint. The checkpoint is removed once the export completes.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import argparse
+import bz2
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+
+import six
+
+from slideshare.utils import write_atomic
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+# Listing endpoints and client methods building their parameters by name
+# of the argument selecting the listing
+LISTINGS = {
+    "tag": ("get_slideshows_by_tag", "_slideshows_by_tag_params"),
+    "username_for": ("get_slideshows_by_user", "_slideshows_by_user_params"),
+    "group_name": ("get_slideshows_by_group", "_slideshows_by_group_params"),
+}
+
+# Columns of CSV export, nested values are serialized to JSON
+CSV_FIELDS = ("ID", "Title", "Description", "Status", "Username", "URL",
+              "ThumbnailURL", "Created", "Updated", "Language", "Format",
+              "Download", "SlideshowType", "InContest", "NumViews",
+              "NumDownloads", "NumComments", "NumFavorites", "NumSlides",
+              "Tags")
+
+
+def _gzip_compress(data):
+    # Python 2 has no `gzip.compress`
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb") as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+COMPRESSORS = {
+    ".gz": getattr(gzip, "compress", _gzip_compress),
+    ".bz2": bz2.compress,
+}
+
+
+def split_extension(path):
+    """ Returns format and compression extension of the export file """
+    root, compression = os.path.splitext(path)
+    if compression not in COMPRESSORS:
+        root, compression = path, None
+    fmt = os.path.splitext(root)[1].lstrip(".").lower()
+    if fmt == "json":
+        fmt = "jsonl"
+    if fmt not in ("jsonl", "csv"):
+        raise ValueError("export: unsupported file format {!r}, "
+                         "use .jsonl or .csv".format(path))
+    return fmt, compression
+
+
+def _raw(slideshow):
+    """ Mapping of the slideshow, `slideshare.models.Slideshow` included """
+    if hasattr(slideshow, "raw"):
+        return slideshow.raw
+    return slideshow
+
+
+def _tags(value):
+    """ Comma separated tag names of the `Tags` element """
+    tags = (value or {}).get("Tag") if isinstance(value, dict) else value
+    if tags is None:
+        return ""
+    if not isinstance(tags, list):
+        tags = [tags]
+    return ",".join(tag.get("#text", "") if isinstance(tag, dict)
+                    else six.text_type(tag) for tag in tags)
+
+
+def _cell(name, value):
+    if value is None:
+        return ""
+    if name == "Tags":
+        return _tags(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return six.text_type(value)
+
+
+class JSONLinesWriter(object):
+    """ Serializes page of slideshows to JSON lines """
+    header = None
+
+    def page(self, slideshows):
+        lines = [json.dumps(_raw(slideshow), ensure_ascii=False)
+                 for slideshow in slideshows]
+        return "".join(line + "\n" for line in lines).encode("utf-8")
+
+
+class CSVWriter(object):
+    """ Serializes page of slideshows to CSV rows of `fields` columns """
+
+    def __init__(self, fields=CSV_FIELDS):
+        self.fields = tuple(fields)
+
+    def _rows(self, rows):
+        if six.PY2:
+            buf = io.BytesIO()
+            writer = csv.writer(buf)
+            for row in rows:
+                writer.writerow([cell.encode("utf-8") for cell in row])
+            return buf.getvalue()
+        buf = io.StringIO(newline="")
+        writer = csv.writer(buf)
+        writer.writerows(rows)
+        return buf.getvalue().encode("utf-8")
+
+    @property
+    def header(self):
+        return self._rows([self.fields])
+
+    def page(self, slideshows):
+        rows = []
+        for slideshow in slideshows:
+            raw = _raw(slideshow)
+            rows.append([_cell(name, raw.get(name)) for name in self.fields])
+        return self._rows(rows)
+
+
+class Checkpoint(object):
+    """ Offset of the next page and size of the export file after the last
+    written page. Saved atomically, so it is never torn by a crash.
+    """
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.offset = None
+        self.size = 0
+        self.count = 0
+
+    def load(self):
+        """ Loads checkpoint of the same export, returns True if found """
+        try:
+            with io.open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+        if state.get("version") != CHECKPOINT_VERSION or \
+                state.get("source") != self.source:
+            logger.warning("Ignoring checkpoint %s of another export",
+                           self.path)
+            return False
+        self.offset = state["offset"]
+        self.size = state["size"]
+        self.count = state["count"]
+        return True
+
+    def save(self):
+        state = {"version": CHECKPOINT_VERSION, "source": self.source,
+                 "offset": self.offset, "size": self.size,
+                 "count": self.count}
+        write_atomic(self.path,
+                     six.text_type(json.dumps(state, sort_keys=True)))
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def export_slideshows(client, path, tag=None, username_for=None,
+                      group_name=None, per_page=100, fields=CSV_FIELDS,
+                      checkpoint=None, **optional):
+    """ Exports all slideshows of the listing to the file
+
+    Exactly one of `tag`, `username_for` and `group_name` selects the
+    listing.
+
+    Args:
+        client (slideshare.client.SlideShareAPI):
+            Client to fetch the listing with.
+        path (string):
+            Export file, format and compression are chosen by extension:
+            ``.jsonl``, ``.csv``, optionally followed by ``.gz`` or
+            ``.bz2``.
+        tag (string):
+            Export slideshows with the tag. [Optional]
+        username_for (string):
+            Export slideshows of the user. [Optional]
+        group_name (string):
+            Export slideshows of the group. [Optional]
+        per_page (int):
+            Number of slideshows requested and written at once.
+            Defaults to 100. [Optional]
+        fields (list):
+            Columns of CSV export. Defaults to `CSV_FIELDS`. [Optional]
+        checkpoint (string):
+            Checkpoint path. Defaults to ``path + ".checkpoint"``.
+            [Optional]
+        **optional:
+            Arguments of the listing method, e.g. ``detailed=1``.
+            Default credentials of the client are used like by the
+            listing methods. [Optional]
+
+    Returns:
+        int: total number of exported slideshows, including ones exported
+        before the interruption.
+    """
+    selected = [(name, value) for name, value in (
+        ("tag", tag), ("username_for", username_for),
+        ("group_name", group_name)) if value is not None]
+    if len(selected) != 1:
+        raise ValueError("export_slideshows: exactly one of tag, "
+                         "username_for and group_name must be specified")
+    (name, value), = selected
+    endpoint, build_params = LISTINGS[name]
+    fmt, compression = split_extension(path)
+    writer = JSONLinesWriter() if fmt == "jsonl" else CSVWriter(fields)
+    compress = COMPRESSORS.get(compression)
+
+    # Default credentials and flags are applied like by listing methods
+    params = getattr(client, build_params)(value, optional)
+    params.pop("limit")
+    offset = params.pop("offset", 0)
+    # Credentials are never written to the checkpoint
+    source = dict((k, v) for k, v in params.items() if k != "password")
+    source.update(endpoint=endpoint, path=os.path.abspath(path),
+                  per_page=per_page)
+    state = Checkpoint(checkpoint or path + ".checkpoint", source)
+    resumed = state.load() and os.path.exists(path)
+
+    with io.open(path, "r+b" if resumed else "wb") as f:
+        if resumed:
+            # Drop the page written after the last checkpoint
+            f.truncate(state.size)
+            f.seek(state.size)
+            offset = state.offset
+            logger.info("Resuming export to %s from offset %s", path, offset)
+        elif writer.header is not None:
+            header = writer.header
+            f.write(compress(header) if compress else header)
+        while True:
+            slideshows = list(client.stream_listing(
+                endpoint, limit=per_page, offset=offset, **params))
+            if slideshows:
+                data = writer.page(slideshows)
+                f.write(compress(data) if compress else data)
+                f.flush()
+                os.fsync(f.fileno())
+            offset += len(slideshows)
+            state.offset = offset
+            state.size = f.tell()
+            state.count += len(slideshows)
+            if len(slideshows) < per_page:
+                break
+            state.save()
+    state.remove()
+    return state.count
+
+
+def main():
+    from slideshare.client import SlideShareAPI
+
+    parser = argparse.ArgumentParser(
+        description="Exports slideshows of the tag, user or group to "
+                    "JSON lines or CSV file")
+    parser.add_argument("path", help="export file: .jsonl or .csv, "
+                                     "optionally .gz or .bz2 compressed")
+    listing = parser.add_mutually_exclusive_group(required=True)
+    listing.add_argument("--tag")
+    listing.add_argument("--user", dest="username_for")
+    listing.add_argument("--group", dest="group_name")
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--detailed", action="store_true")
+    parser.add_argument("--api-key", required=True)
+    parser.add_argument("--shared-secret", required=True)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    client = SlideShareAPI(args.api_key, args.shared_secret)
+    optional = {"detailed": 1} if args.detailed else {}
+    count = export_slideshows(client, args.path, tag=args.tag,
+                              username_for=args.username_for,
+                              group_name=args.group_name,
+                              per_page=args.per_page, **optional)
+    print("Exported {} slideshows to {}".format(count, args.path))
+
+
+if __name__ == "__main__":
+    main()
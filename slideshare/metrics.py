@@ -0,0 +1,194 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import math
+import threading
+import time
+
+from slideshare.exceptions import SlideShareError
+
+
+class Metrics(object):
+    """ Metrics hook interface, does nothing.
+
+    Subclasses override `record` to export metrics, e.g. to StatsD or
+    Prometheus. It is called from the thread (or event loop) which sent
+    the request, so it must be fast and thread-safe.
+    """
+
+    def record(self, endpoint, status, errno, request_bytes, response_bytes,
+               duration):
+        """ Called after every request sent by the client. Responses
+        served from cache are not recorded.
+
+        Args:
+            endpoint (string): API method, e.g. "get_slideshow"
+            status (int): HTTP status or None if no response was received
+            errno (string): `SlideShareError` errno or None
+            request_bytes (int): length of request URL and body
+            response_bytes (int): length of response body
+            duration (float): wall time of the request in seconds
+                including retries
+        """
+
+    def record_circuit(self, endpoint, state):
+        """ Called by `slideshare.breaker.CircuitBreaker` when circuit of
+        the endpoint changes state to "open", "half_open" or "closed"
+        """
+
+
+class Measurement(object):
+    """ Context manager measuring single request. Status and size of the
+    response are set by the client, errors are picked from the exception
+    """
+    __slots__ = ("metrics", "endpoint", "status", "request_bytes",
+                 "response_bytes", "started")
+
+    def __init__(self, metrics, endpoint):
+        self.metrics = metrics
+        self.endpoint = endpoint
+        self.status = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def __enter__(self):
+        self.started = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = time.time() - self.started
+        errno = None
+        if isinstance(exc, SlideShareError):
+            errno = exc.errno
+        elif exc is not None and self.status is None:
+            # requests.HTTPError or aiohttp.ClientResponseError
+            response = getattr(exc, "response", None)
+            self.status = getattr(response, "status_code", None) or \
+                getattr(exc, "status", None)
+        self.metrics.record(self.endpoint, self.status, errno,
+                            self.request_bytes, self.response_bytes, duration)
+        return False
+
+
+class Histogram(object):
+    """ Latency histogram with logarithmic buckets.
+
+    Memory usage is bounded, percentiles are accurate within the bucket
+    width, about 9% of the value.
+    """
+    # Bucket bounds grow by 2 ** (1 / 8)
+    BUCKETS_PER_DOUBLING = 8
+
+    def __init__(self, min_value=0.0001):
+        self.min_value = min_value
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        if value <= self.min_value:
+            index = 0
+        else:
+            index = int(math.ceil(math.log(value / self.min_value, 2) *
+                                  self.BUCKETS_PER_DOUBLING))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent):
+        """ Returns upper bound of the bucket containing the percentile
+        """
+        if not self.count:
+            return None
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                bound = self.min_value * 2 ** (
+                    float(index) / self.BUCKETS_PER_DOUBLING)
+                return min(bound, self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+class InMemoryMetrics(Metrics):
+    """ Aggregates metrics per endpoint in memory::
+
+        metrics = InMemoryMetrics()
+        client = SlideShareAPI(api_key, shared_secret, metrics=metrics)
+        ...
+        metrics.stats()["get_slideshow"]["p99"]
+    """
+
+    def __init__(self):
+        self.endpoints = {}
+        # endpoint -> (state, number of transitions to each state)
+        self.circuits = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, status, errno, request_bytes, response_bytes,
+               duration):
+        with self._lock:
+            counters = self.endpoints.get(endpoint)
+            if counters is None:
+                counters = self.endpoints[endpoint] = {
+                    "requests": 0, "request_bytes": 0, "response_bytes": 0,
+                    "statuses": {}, "errors": {}, "latency": Histogram()}
+            counters["requests"] += 1
+            counters["request_bytes"] += request_bytes
+            counters["response_bytes"] += response_bytes
+            statuses = counters["statuses"]
+            statuses[status] = statuses.get(status, 0) + 1
+            if errno is not None:
+                errors = counters["errors"]
+                errors[errno] = errors.get(errno, 0) + 1
+            counters["latency"].add(duration)
+
+    def record_circuit(self, endpoint, state):
+        with self._lock:
+            _, transitions = self.circuits.get(endpoint, (None, {}))
+            transitions[state] = transitions.get(state, 0) + 1
+            self.circuits[endpoint] = (state, transitions)
+
+    def circuit_stats(self):
+        """ Returns per endpoint circuit state and number of transitions
+        to every state
+        """
+        with self._lock:
+            return dict((endpoint, {"state": state,
+                                    "transitions": dict(transitions)})
+                        for endpoint, (state, transitions)
+                        in self.circuits.items())
+
+    def stats(self):
+        """ Returns per endpoint number of requests, transferred bytes,
+        counts of HTTP statuses and SlideShare errors, mean, max and
+        50th, 95th, 99th percentiles of latency in seconds
+        """
+        with self._lock:
+            result = {}
+            for endpoint, counters in self.endpoints.items():
+                latency = counters["latency"]
+                result[endpoint] = {
+                    "requests": counters["requests"],
+                    "request_bytes": counters["request_bytes"],
+                    "response_bytes": counters["response_bytes"],
+                    "statuses": dict(counters["statuses"]),
+                    "errors": dict(counters["errors"]),
+                    "mean": latency.mean,
+                    "max": latency.max,
+                    "p50": latency.percentile(50),
+                    "p95": latency.percentile(95),
+                    "p99": latency.percentile(99),
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+            self.circuits.clear()
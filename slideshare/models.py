@@ -0,0 +1,443 @@
+""" Compact result models.
+
+Models keep raw string values of the response in `__slots__` and decode
+them to Python types on first access::
+
+    slideshow = Slideshow.from_dict(response["Slideshow"])
+    slideshow.id          # 42
+    slideshow.created     # datetime.datetime(2010, 3, 26, 4, 25, 19)
+    slideshow.raw         # OrderedDict as returned by xmltodict
+
+Datetimes are naive and in UTC. Values which can't be decoded are
+returned as is.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import itertools
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import six
+
+from slideshare.utils import listify
+
+
+def decode_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def decode_bool(value):
+    if value in ("1", "Y", "true"):
+        return True
+    if value in ("0", "N", "false"):
+        return False
+    return value
+
+
+def decode_datetime(value):
+    """ Decodes `Created` ("Thu Mar 25 23:25:19 -0500 2010") and `Updated`
+    ("2010-03-26 04:25:19 UTC") dates to naive UTC datetime
+    """
+    if not isinstance(value, six.string_types):
+        return value
+    try:
+        if value.endswith(" UTC"):
+            return datetime.strptime(value[:-4], "%Y-%m-%d %H:%M:%S")
+        weekday, month, day, time, offset, year = value.split()
+        result = datetime.strptime(
+            " ".join([month, day, time, year]), "%b %d %H:%M:%S %Y")
+        sign = -1 if offset[0] == "-" else 1
+        offset = timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+        return result - sign * offset
+    except ValueError:
+        return value
+
+
+class _Absent(object):
+    """ Raw value of the field missing in the response, unlike None which
+    is the value of an empty element
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return "ABSENT"
+
+    def __reduce__(self):
+        # Stays the same object in models sent back from the parse pool
+        return "ABSENT"
+
+
+ABSENT = _Absent()
+
+
+class Field(object):
+    """ Model attribute backed by raw response value.
+
+    Raw value is stored in `_r_<name>` slot, decoded one is cached in
+    `_d_<name>` slot on first access. Missing fields hold `ABSENT` and
+    read as None.
+
+    Args:
+        key (string): key of the value in the response mapping
+        decode (callable): converts raw value to Python type [Optional]
+        compact (callable):
+            converts nested mapping to compact form when model is
+            created, `expand` must restore the mapping [Optional]
+        expand (callable): restores mapping from compact form [Optional]
+        intern (boolean):
+            intern raw string, for values repeated across many
+            slideshows, like language or format [Optional]
+    """
+    _counter = itertools.count()
+
+    def __init__(self, key, decode=None, compact=None, expand=None,
+                 intern=False):
+        self.key = key
+        self.decode = decode
+        self.compact = compact
+        self.expand = expand
+        self.intern = intern
+        # Fields are kept in the order of declaration
+        self.order = next(self._counter)
+        self.name = None
+        self.raw_slot = None
+        self.decoded_slot = None
+
+    @property
+    def slots(self):
+        if self.decode is None:
+            return ("_r_" + self.name,)
+        return ("_r_" + self.name, "_d_" + self.name)
+
+    def set(self, obj, value):
+        """ Stores raw value """
+        if value is not None:
+            if self.compact is not None:
+                value = self.compact(value)
+            elif self.intern and isinstance(value, str):
+                # Only native strings can be interned
+                value = six.moves.intern(value)
+        self.raw_slot.__set__(obj, value)
+
+    def raw(self, obj):
+        """ Returns raw value in the form of the response mapping,
+        `ABSENT` if the response has no such key
+        """
+        value = self.raw_slot.__get__(obj, type(obj))
+        if value is not None and value is not ABSENT and \
+                self.expand is not None:
+            value = self.expand(value)
+        return value
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        if self.decode is not None:
+            # Decoded value may be set without the raw one, e.g. count
+            # of search results taken from their metadata
+            try:
+                return self.decoded_slot.__get__(obj, cls)
+            except AttributeError:
+                pass
+        value = self.raw_slot.__get__(obj, cls)
+        if value is ABSENT:
+            return None
+        if self.decode is None:
+            return value
+        if value is not None:
+            value = self.decode(value)
+        self.decoded_slot.__set__(obj, value)
+        return value
+
+
+class ModelMeta(type):
+    """ Builds `__slots__` of the model from its fields """
+
+    def __new__(mcs, name, bases, attrs):
+        fields = []
+        slots = []
+        for attr, value in list(attrs.items()):
+            if isinstance(value, Field):
+                value.name = attr
+                fields.append(value)
+                slots.extend(value.slots)
+        attrs["__slots__"] = tuple(slots) + tuple(attrs.get("__slots__", ()))
+        cls = super(ModelMeta, mcs).__new__(mcs, name, bases, attrs)
+        for field in fields:
+            field.raw_slot = getattr(cls, "_r_" + field.name)
+            if field.decode is not None:
+                field.decoded_slot = getattr(cls, "_d_" + field.name)
+        parent_fields = getattr(cls, "_fields", ())
+        fields.sort(key=lambda field: field.order)
+        cls._fields = tuple(parent_fields) + tuple(fields)
+        cls._keys = dict((field.key, field) for field in cls._fields)
+        return cls
+
+
+class Model(six.with_metaclass(ModelMeta, object)):
+    """ Base model. Response keys which have no field are kept in `extra`
+    """
+    __slots__ = ("extra",)
+
+    @classmethod
+    def from_dict(cls, data):
+        """ Creates model from the `xmltodict` compatible mapping """
+        obj = cls.__new__(cls)
+        extra = None
+        for field in cls._fields:
+            field.raw_slot.__set__(obj, ABSENT)
+        if data is not None:
+            for key, value in data.items():
+                field = cls._keys.get(key)
+                if field is not None:
+                    field.set(obj, value)
+                else:
+                    if extra is None:
+                        extra = OrderedDict()
+                    extra[key] = value
+        obj.extra = extra
+        return obj
+
+    @property
+    def raw(self):
+        """ `xmltodict` compatible mapping the model was created from """
+        data = OrderedDict()
+        for field in self._fields:
+            value = field.raw(self)
+            if value is not ABSENT:
+                data[field.key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getitem__(self, key):
+        """ Provides access to raw values like with plain response """
+        field = self._keys.get(key)
+        if field is not None:
+            value = field.raw(self)
+            if value is not ABSENT:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.raw == other.raw
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<{} {}>".format(type(self).__name__, dict(self.raw))
+
+
+def unlistify(values):
+    """ Reverse of `listify`: single value is not wrapped in list by
+    xmltodict
+    """
+    if len(values) == 1:
+        return values[0]
+    return list(values)
+
+
+def compact_tags(value):
+    if not isinstance(value, dict):
+        return value
+    return tuple(Tag.from_value(tag) for tag in listify(value.get("Tag")))
+
+
+def expand_tags(value):
+    if not isinstance(value, tuple):
+        return value
+    return OrderedDict([("Tag", unlistify([tag.value for tag in value]))])
+
+
+def compact_related(value):
+    """ Keeps (rank, slideshow id) pairs of related slideshows """
+    if not isinstance(value, dict):
+        return value
+    return tuple((related.get("@rank"), related.get("#text"))
+                 if isinstance(related, dict) else (None, related)
+                 for related in listify(value.get("RelatedSlideshowID")))
+
+
+def expand_related(value):
+    if not isinstance(value, tuple):
+        return value
+    related = []
+    for rank, slideshow_id in value:
+        if rank is None:
+            related.append(slideshow_id)
+        else:
+            related.append(OrderedDict([("@rank", rank),
+                                        ("#text", slideshow_id)]))
+    return OrderedDict([("RelatedSlideshowID", unlistify(related))])
+
+
+def decode_related(value):
+    """ Returns ids of related slideshows """
+    if not isinstance(value, tuple):
+        return value
+    return [decode_int(slideshow_id) for _, slideshow_id in value]
+
+
+class Tag(Model):
+    # Attributes go first like in the parsed response
+    count = Field("@Count", decode_int)
+    owner = Field("@Owner", decode_bool)
+    name = Field("#text", intern=True)
+
+    @classmethod
+    def from_value(cls, value):
+        """ Tag is a plain string if it has no attributes """
+        if isinstance(value, dict):
+            return cls.from_dict(value)
+        return cls.from_dict({"#text": value})
+
+    @property
+    def value(self):
+        """ Raw value as found in the response """
+        raw = self.raw
+        if list(raw) == ["#text"]:
+            return raw["#text"]
+        return raw
+
+
+class Slideshow(Model):
+    id = Field("ID", decode_int)
+    title = Field("Title")
+    description = Field("Description")
+    status = Field("Status", decode_int, intern=True)
+    username = Field("Username", intern=True)
+    url = Field("URL")
+    thumbnail_url = Field("ThumbnailURL")
+    thumbnail_size = Field("ThumbnailSize", intern=True)
+    thumbnail_small_url = Field("ThumbnailSmallURL")
+    embed = Field("Embed")
+    created = Field("Created", decode_datetime)
+    updated = Field("Updated", decode_datetime)
+    language = Field("Language", intern=True)
+    format = Field("Format", intern=True)
+    download = Field("Download", decode_bool)
+    download_url = Field("DownloadUrl")
+    secret_key = Field("SecretKey")
+    slideshow_embed_url = Field("SlideshowEmbedUrl")
+    slideshow_type = Field("SlideshowType", decode_int)
+    in_contest = Field("InContest", decode_bool)
+    user_id = Field("UserID", decode_int)
+    ppt_location = Field("PPTLocation")
+    stripped_title = Field("StrippedTitle")
+    tags = Field("Tags", compact=compact_tags, expand=expand_tags)
+    audio = Field("Audio", decode_bool)
+    num_downloads = Field("NumDownloads", decode_int)
+    num_views = Field("NumViews", decode_int)
+    num_comments = Field("NumComments", decode_int)
+    num_favorites = Field("NumFavorites", decode_int)
+    num_slides = Field("NumSlides", decode_int)
+    related_slideshows = Field("RelatedSlideshows", decode_related,
+                               compact=compact_related,
+                               expand=expand_related)
+    privacy_level = Field("PrivacyLevel", decode_int)
+    flag_visible = Field("FlagVisible", decode_bool)
+    show_on_ss = Field("ShowOnSS", decode_bool)
+    secret_url = Field("SecretURL")
+    allow_embed = Field("AllowEmbed", decode_bool)
+    share_with_contacts = Field("ShareWithContacts", decode_bool)
+    transcript = Field("Transcript")
+
+
+def compact_slideshows(value):
+    return tuple(Slideshow.from_dict(slideshow)
+                 for slideshow in listify(value))
+
+
+def expand_slideshows(value):
+    return unlistify([slideshow.raw for slideshow in value])
+
+
+class SlideshowList(Model):
+    """ Slideshows listing: tag, group, user slideshows or search results.
+
+    `name` is the tag, group or user name, `count` is total number of
+    slideshows, `meta` holds search metadata.
+    """
+    __slots__ = ("kind",)
+
+    name = Field("Name")
+    count = Field("Count", decode_int)
+    meta = Field("Meta")
+    slideshows = Field("Slideshow", compact=compact_slideshows,
+                       expand=expand_slideshows)
+
+    @classmethod
+    def from_response(cls, kind, data):
+        obj = cls.from_dict(data)
+        obj.kind = kind
+        if obj.count is None and isinstance(obj.meta, dict):
+            total = obj.meta.get("TotalResults")
+            obj._d_count = decode_int(total) if total is not None else None
+        return obj
+
+    def __iter__(self):
+        return iter(self.slideshows or ())
+
+    def __len__(self):
+        return len(self.slideshows or ())
+
+
+class User(Model):
+    """ User contact """
+    username = Field("Username", intern=True)
+    num_slideshows = Field("NumSlideshows", decode_int)
+    num_comments = Field("NumComments", decode_int)
+
+
+class Group(Model):
+    name = Field("Name")
+    num_posts = Field("NumPosts", decode_int)
+    num_slideshows = Field("NumSlideshows", decode_int)
+    num_members = Field("NumMembers", decode_int)
+    created = Field("Created", decode_datetime)
+    query_name = Field("QueryName")
+    url = Field("URL")
+
+
+LISTINGS = frozenset(["Tag", "User", "Group", "Slideshows"])
+
+
+def load(data):
+    """ Converts parsed response to models.
+
+    Returns `Slideshow` for single slideshow, `SlideshowList` for listings,
+    lists of `Group`, `User` or `Tag` for user groups, contacts and tags.
+    Other responses are returned as is.
+    """
+    if len(data) != 1:
+        return data
+    (root, value), = data.items()
+    if root == "Slideshow":
+        return Slideshow.from_dict(value)
+    if root in LISTINGS and isinstance(value, dict):
+        return SlideshowList.from_response(root, value)
+    if root == "Groups":
+        return [Group.from_dict(group)
+                for group in listify((value or {}).get("Group"))]
+    if root == "Contacts":
+        return [User.from_dict(user)
+                for user in listify((value or {}).get("Contact"))]
+    if root == "Tags":
+        return [Tag.from_value(tag)
+                for tag in listify((value or {}).get("Tag"))]
+    return data
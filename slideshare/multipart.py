@@ -0,0 +1,143 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import binascii
+import os
+
+import six
+
+
+class MultipartEncoder(object):
+    """ Streaming `multipart/form-data` request body.
+
+    Files are read in chunks while the body is sent, so memory usage does
+    not depend on the file size. Length of the body is known in advance,
+    which allows to send `Content-Length` header instead of chunked
+    encoding.
+
+    Can be passed as `data` to `requests`. Closes opened files on `close`
+    or once the body is read to the end.
+    """
+
+    def __init__(self, fields=None, files=None, chunk_size=64 * 1024,
+                 callback=None):
+        """
+        Args:
+            fields (dict or list):
+                Form fields, name -> value.
+            files (list):
+                List of (field name, (filename, file)) tuples, where file
+                is a path or file object opened in binary mode. Optional
+                content type may be added as third item of the inner
+                tuple, guessed by filename otherwise.
+            chunk_size (int):
+                Size of the chunk read from the file. Defaults to 64KB.
+            callback (callable):
+                Called with number of bytes read and total body length
+                after every chunk. [Optional]
+        """
+        self.boundary = binascii.hexlify(os.urandom(16)).decode("ascii")
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self.bytes_read = 0
+        self._opened = []
+        self._parts = []
+        self._current = None
+        if isinstance(fields, dict):
+            fields = fields.items()
+        try:
+            for name, value in fields or ():
+                self._parts.append(self._field(name, value))
+            for name, spec in files or ():
+                self._parts.extend(self._file(name, *spec))
+        except Exception:
+            self.close()
+            raise
+        self._parts.append(self._encode("--{}--\r\n".format(self.boundary)))
+        self.length = sum(size for _, size in self._parts)
+        self._parts.reverse()
+
+    @property
+    def content_type(self):
+        return "multipart/form-data; boundary={}".format(self.boundary)
+
+    @staticmethod
+    def _encode(value):
+        value = value.encode("utf-8")
+        return value, len(value)
+
+    def _field(self, name, value):
+        if not isinstance(value, six.string_types):
+            value = str(value)
+        return self._encode(
+            "--{}\r\n"
+            "Content-Disposition: form-data; name=\"{}\"\r\n\r\n"
+            "{}\r\n".format(self.boundary, name, value))
+
+    def _file(self, name, filename, fileobj, content_type=None):
+        if isinstance(fileobj, six.string_types):
+            fileobj = open(fileobj, "rb")
+            self._opened.append(fileobj)
+        if content_type is None:
+            # Reads system mime types database, imported on first upload
+            import mimetypes
+            content_type = (mimetypes.guess_type(filename)[0] or
+                            "application/octet-stream")
+        position = fileobj.tell()
+        size = os.fstat(fileobj.fileno()).st_size - position
+        return [
+            self._encode(
+                "--{}\r\n"
+                "Content-Disposition: form-data; name=\"{}\"; "
+                "filename=\"{}\"\r\n"
+                "Content-Type: {}\r\n\r\n".format(self.boundary, name,
+                                                  filename, content_type)),
+            (fileobj, size),
+            self._encode("\r\n"),
+        ]
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        """ Returns up to `size` bytes of the body, all remaining bytes
+        if `size` is negative, empty string at the end of body.
+        """
+        if size is None or size < 0:
+            size = self.length
+        chunks = []
+        while size > 0:
+            if self._current is None:
+                if not self._parts:
+                    break
+                self._current = self._parts.pop()
+            part, remaining = self._current
+            if isinstance(part, bytes):
+                chunk = part[:size]
+                part = part[size:]
+            else:
+                chunk = part.read(min(size, remaining))
+                if not chunk:
+                    raise IOError("File is shorter than expected")
+            remaining -= len(chunk)
+            self._current = (part, remaining) if remaining > 0 else None
+            size -= len(chunk)
+            chunks.append(chunk)
+        data = b"".join(chunks)
+        if data:
+            self.bytes_read += len(data)
+            if self.callback is not None:
+                self.callback(self.bytes_read, self.length)
+        if self._current is None and not self._parts:
+            self.close()
+        return data
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        while self._opened:
+            self._opened.pop().close()
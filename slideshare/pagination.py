@@ -0,0 +1,104 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+from slideshare.tracing import wrap
+
+
+def prefetch(fetch_page, cursor):
+    """ Yields items of consecutive pages one by one.
+
+    Next page is requested in background thread while the caller consumes
+    the current one, so at most two pages are kept in memory.
+
+    Args:
+        fetch_page (callable):
+            Takes page cursor, returns tuple of page items and cursor of
+            the next page or None if it's the last one.
+        cursor:
+            Cursor of the first page.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Trace background requests under the caller's span
+    fetch_page = wrap(fetch_page)
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(fetch_page, cursor)
+    try:
+        while future is not None:
+            items, cursor = future.result()
+            future = None
+            if cursor is not None:
+                future = executor.submit(fetch_page, cursor)
+            for item in items:
+                yield item
+            del items
+    finally:
+        if future is not None:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_offset(fetch, extract, per_page, offset=0, limit=None):
+    """ Iterates over listing paginated with `limit` and `offset`.
+
+    Args:
+        fetch (callable):
+            API method, called with `limit` and `offset` keyword arguments.
+        extract (callable):
+            Returns items and total count from the API response.
+        per_page (int):
+            Number of items requested at once.
+        offset (int):
+            Offset of the first item.
+        limit (int):
+            Max number of items, all items by default.
+    """
+    offset = int(offset)
+    end = offset + int(limit) if limit is not None else None
+
+    def fetch_page(offset):
+        size = per_page if end is None else min(per_page, end - offset)
+        items, count = extract(fetch(limit=size, offset=offset))
+        offset += len(items)
+        if len(items) < size or offset == end or (count is not None and
+                                                   offset >= count):
+            offset = None
+        return items, offset
+
+    if end is not None and end <= offset:
+        return iter(())
+    return prefetch(fetch_page, offset)
+
+
+def iter_pages(fetch, extract, per_page, page=1, limit=None):
+    """ Iterates over listing paginated with `page` and `items_per_page`.
+
+    Args:
+        fetch (callable):
+            API method, called with `page` and `items_per_page` keyword
+            arguments.
+        extract (callable):
+            Returns items and total count from the API response.
+        per_page (int):
+            Number of items requested at once.
+        page (int):
+            Number of the first page, starting from 1.
+        limit (int):
+            Max number of items, all items by default.
+    """
+    first = int(page)
+
+    def fetch_page(page):
+        items, count = extract(fetch(page=page, items_per_page=per_page))
+        if limit is not None:
+            # Pages are requested one by one, all previous ones were full
+            remaining = int(limit) - (page - first) * per_page
+            if len(items) >= remaining:
+                return items[:remaining], None
+        if len(items) < per_page or (count is not None and
+                                     page * per_page >= count):
+            return items, None
+        return items, page + 1
+
+    if limit is not None and int(limit) <= 0:
+        return iter(())
+    return prefetch(fetch_page, first)
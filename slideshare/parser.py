@@ -0,0 +1,203 @@
+""" Fast parser of SlideShare API responses.
+
+Builds the same structure as `xmltodict.parse` does: attributes are
+prefixed with ``@``, text of an element with attributes or children is
+stored in ``#text``, repeated children are collected to lists, empty
+elements are None. Document is parsed by C-accelerated `ElementTree`
+and converted in a single pass with a shortcut for text-only elements,
+which make up most of SlideShare responses.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+from collections import OrderedDict
+
+try:
+    from xml.etree.cElementTree import fromstring
+except ImportError:
+    from xml.etree.ElementTree import fromstring
+
+try:
+    from xml.etree.ElementTree import XMLPullParser
+except ImportError:
+    # Python 2
+    XMLPullParser = None
+
+from slideshare.exceptions import SlideShareError
+
+ERROR_ROOT = "SlideShareServiceError"
+
+
+def _text(text):
+    if text is None:
+        return None
+    return text.strip() or None
+
+
+def to_dict(elem, dict_type=dict):
+    """ Converts element with attributes or children to mapping
+    """
+    value = dict_type()
+    for name, attr in elem.attrib.items():
+        value["@" + name] = attr
+    tails = None
+    for child in elem:
+        if not len(child) and not child.attrib:
+            # Text-only element
+            child_value = _text(child.text)
+        else:
+            child_value = to_dict(child, dict_type)
+        tag = child.tag
+        if tag in value:
+            existing = value[tag]
+            if type(existing) is list:
+                existing.append(child_value)
+            else:
+                value[tag] = [existing, child_value]
+        else:
+            value[tag] = child_value
+        tail = child.tail
+        if tail is not None and not tail.isspace():
+            tails = (tails or []) + [tail]
+    text = elem.text
+    if tails:
+        text = "".join([text or ""] + tails)
+    text = _text(text)
+    if text is not None:
+        value["#text"] = text
+    return value
+
+
+def element_value(elem, dict_type=dict):
+    """ Returns `xmltodict` compatible value of the element
+    """
+    if not len(elem) and not elem.attrib:
+        return _text(elem.text)
+    return to_dict(elem, dict_type)
+
+
+def check_error(data):
+    """ Raises SlideShareError if parsed response is a service error """
+    error = data.get(ERROR_ROOT)
+    if error:
+        raise SlideShareError(error["Message"]["@ID"],
+                              error["Message"]["#text"])
+    return data
+
+
+def parse(content, compat=True):
+    """ Parses SlideShare API response.
+
+    Args:
+        content (bytes): response body
+        compat (boolean):
+            Return `OrderedDict` like `xmltodict` does. Plain dicts are
+            returned otherwise, they are faster to build and smaller.
+            Defaults to True.
+
+    Raises:
+        SlideShareError: if service responded with an error
+    """
+    dict_type = OrderedDict if compat else dict
+    root = fromstring(content)
+    data = dict_type([(root.tag, element_value(root, dict_type))])
+    return check_error(data)
+
+
+def parse_load(content, models=False, keep_data=True):
+    """ Parses response body and converts it to `slideshare.models` if
+    `models` is set, runs in a worker process of the client `parse_pool`.
+
+    Returns:
+        tuple: parsed mapping, None unless `keep_data` is set, and the
+        result returned to the caller
+    """
+    data = parse(content)
+    result = data
+    if models:
+        from slideshare.models import load
+        result = load(data)
+    return (data if keep_data else None), result
+
+
+class ListingParser(object):
+    """ Incremental parser of slideshow listings.
+
+    Body is fed in chunks as it is received, every complete item is
+    returned at once and dropped from the tree, so neither the whole body
+    nor the whole tree is kept in memory::
+
+        parser = ListingParser()
+        for chunk in chunks:
+            for slideshow in parser.feed(chunk):
+                ...
+        for slideshow in parser.close():
+            ...
+
+    On Python 2 body is buffered and parsed on `close`.
+    """
+
+    def __init__(self, item_tag="Slideshow", compat=True):
+        """
+        Args:
+            item_tag (string):
+                Tag of the listing items, children of the root element.
+                Defaults to "Slideshow".
+            compat (boolean):
+                Return `OrderedDict` like `xmltodict` does. Defaults to True.
+        """
+        self.item_tag = item_tag
+        self.dict_type = OrderedDict if compat else dict
+        self.root = None
+        self._depth = 0
+        if XMLPullParser is not None:
+            self._parser = XMLPullParser(events=("start", "end"))
+            self._chunks = None
+        else:
+            self._parser = None
+            self._chunks = []
+
+    def feed(self, data):
+        """ Parses chunk of the body, returns list of completed items
+
+        Raises:
+            SlideShareError: if service responded with an error
+        """
+        if self._parser is None:
+            self._chunks.append(data)
+            return []
+        self._parser.feed(data)
+        return self._items()
+
+    def close(self):
+        """ Finishes parsing, returns list of remaining items
+
+        Raises:
+            SlideShareError: if service responded with an error
+        """
+        if self._parser is None:
+            root = fromstring(b"".join(self._chunks))
+            check_error({root.tag: element_value(root, self.dict_type)})
+            items = root.findall(self.item_tag)
+            for item in items:
+                root.remove(item)
+            self.root = root
+            return [element_value(item, self.dict_type) for item in items]
+        self._parser.close()
+        return self._items()
+
+    def _items(self):
+        items = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self.root is None:
+                    self.root = elem
+                self._depth += 1
+                continue
+            self._depth -= 1
+            if self._depth == 0:
+                check_error({elem.tag: element_value(elem, self.dict_type)})
+            elif self._depth == 1 and elem.tag == self.item_tag and \
+                    self.root.tag != ERROR_ROOT:
+                items.append(element_value(elem, self.dict_type))
+                self.root.remove(elem)
+        return items
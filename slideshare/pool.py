@@ -0,0 +1,114 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import socket
+import threading
+
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.connection import HTTPConnection
+from requests.packages.urllib3.connectionpool import (HTTPConnectionPool,
+                                                      HTTPSConnectionPool)
+
+
+def keepalive_options(idle, interval=10, count=6):
+    """ Socket options enabling TCP keep-alive probes after `idle` seconds
+    of inactivity, sent every `interval` seconds, connection is dropped
+    after `count` unanswered probes. Options not supported by the platform
+    are skipped.
+    """
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    elif hasattr(socket, "TCP_KEEPALIVE"):
+        # macOS
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count))
+    return options
+
+
+class CountingPoolMixin(object):
+    """ Counts requests sent over new and reused connections """
+    adapter = None
+
+    def _make_request(self, conn, *args, **kwargs):
+        # Connection is opened on the first request sent over it
+        self.adapter.count(getattr(conn, "sock", None) is None)
+        return super(CountingPoolMixin, self)._make_request(conn, *args,
+                                                            **kwargs)
+
+
+class PoolingAdapter(HTTPAdapter):
+    """ `requests` transport adapter with configurable connection pool,
+    TCP keep-alive and counters of new and reused connections.
+    """
+    __attrs__ = HTTPAdapter.__attrs__ + ["keepalive"]
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False,
+                 keepalive=None, max_retries=0):
+        """
+        Args:
+            pool_connections (int):
+                Number of hosts to keep connection pools for.
+                Defaults to 10.
+            pool_maxsize (int):
+                Max number of connections kept open per host, should not
+                be less than the number of threads sending requests.
+                Defaults to 10.
+            pool_block (boolean):
+                Wait for a free connection instead of opening a connection
+                which is discarded after the request when the pool is full.
+                Defaults to False.
+            keepalive (int):
+                Enables TCP keep-alive probes after given number of seconds
+                of inactivity, so idle pooled connections are not dropped by
+                firewalls and NAT. [Optional]
+            max_retries (int):
+                Passed to `requests.adapters.HTTPAdapter`. Defaults to 0.
+        """
+        self.keepalive = keepalive
+        self.new_connections = 0
+        self.reused_connections = 0
+        self._lock = threading.Lock()
+        super(PoolingAdapter, self).__init__(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block, max_retries=max_retries)
+
+    def init_poolmanager(self, connections, maxsize, block=False,
+                         **pool_kwargs):
+        if self.keepalive is not None:
+            pool_kwargs["socket_options"] = \
+                HTTPConnection.default_socket_options + \
+                keepalive_options(self.keepalive)
+        super(PoolingAdapter, self).init_poolmanager(
+            connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": self._pool_class(HTTPConnectionPool),
+            "https": self._pool_class(HTTPSConnectionPool),
+        }
+
+    def _pool_class(self, base):
+        return type(str(base.__name__), (CountingPoolMixin, base),
+                    {"adapter": self})
+
+    def __setstate__(self, state):
+        self.new_connections = 0
+        self.reused_connections = 0
+        self._lock = threading.Lock()
+        super(PoolingAdapter, self).__setstate__(state)
+
+    def count(self, new):
+        with self._lock:
+            if new:
+                self.new_connections += 1
+            else:
+                self.reused_connections += 1
+
+    def stats(self):
+        """ Returns number of requests sent over new and reused
+        connections. Every new HTTPS connection costs a TLS handshake.
+        """
+        with self._lock:
+            return {"new_connections": self.new_connections,
+                    "reused_connections": self.reused_connections}
@@ -0,0 +1,148 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import math
+import threading
+import time
+
+from slideshare.exceptions import RateLimitExceeded
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# SlideShareError numbers reported when account exceeds API quota
+QUOTA_ERRORS = frozenset(["99"])
+
+
+class RateLimiter(object):
+    """ Client-side token bucket with per-second and per-day budgets.
+
+    Per-second rate is shrunk on every quota error returned by the service
+    and slowly restored on successful responses. Quota error also stops
+    requests until the daily budget is reset at midnight UTC, even if
+    `per_day` is not set.
+
+    Thread-safe, single instance should be shared by all clients using the
+    same API key.
+    """
+
+    def __init__(self, per_second=None, per_day=None, burst=None, block=True,
+                 max_wait=None, decrease_factor=0.5, min_rate=0.1):
+        """
+        Args:
+            per_second (float):
+                Max average number of requests per second. [Optional]
+            per_day (int):
+                Max number of requests per day. [Optional]
+            burst (int):
+                Max number of requests sent at once, defaults to
+                `per_second` rounded up. [Optional]
+            block (boolean):
+                Wait until the request is allowed if True, raise
+                `RateLimitExceeded` otherwise. Defaults to True. [Optional]
+            max_wait (float):
+                Raise `RateLimitExceeded` instead of waiting longer than
+                this number of seconds. [Optional]
+            decrease_factor (float):
+                Per-second rate is multiplied by this factor on quota
+                error. Defaults to 0.5. [Optional]
+            min_rate (float):
+                Per-second rate never shrinks below this value.
+                Defaults to 0.1. [Optional]
+        """
+        self.per_second = per_second
+        self.per_day = per_day
+        self.block = block
+        self.max_wait = max_wait
+        self.decrease_factor = decrease_factor
+        self.min_rate = min_rate
+        self.rate = per_second
+        if burst is None and per_second:
+            burst = max(1, int(math.ceil(per_second)))
+        self.burst = burst
+        self._tokens = burst or 0
+        self._updated = time.time()
+        self._day = None
+        self._day_count = 0
+        # Day the service reported the quota exceeded
+        self._exhausted_day = None
+        self._lock = threading.Lock()
+
+    @property
+    def day_count(self):
+        """ Number of requests sent today """
+        return self._day_count
+
+    def reserve(self, now=None):
+        """ Reserves a request slot.
+
+        Returns:
+            tuple: number of seconds to wait before the request and
+            whether the slot was reserved. If not, the daily budget is
+            exhausted and `reserve` must be called again after the delay.
+
+        Raises:
+            RateLimitExceeded: if limiter is non-blocking and request must
+            be delayed, or delay exceeds `max_wait`.
+        """
+        with self._lock:
+            if now is None:
+                now = time.time()
+            day = int(now // SECONDS_PER_DAY)
+            if day != self._day:
+                self._day = day
+                self._day_count = 0
+            if day == self._exhausted_day or (
+                    self.per_day is not None and
+                    self._day_count >= self.per_day):
+                delay = (day + 1) * SECONDS_PER_DAY - now
+                self._check(delay, "daily budget is exhausted")
+                return delay, False
+            delay = 0.0
+            if self.rate:
+                elapsed = max(0.0, now - self._updated)
+                self._tokens = min(self.burst,
+                                   self._tokens + elapsed * self.rate)
+                self._updated = now
+                if self._tokens < 1:
+                    delay = (1 - self._tokens) / self.rate
+                    self._check(delay, "per-second budget is exhausted")
+                self._tokens -= 1
+            self._day_count += 1
+            return delay, True
+
+    def _check(self, delay, message):
+        if not self.block or (self.max_wait is not None and
+                              delay > self.max_wait):
+            raise RateLimitExceeded(message, delay)
+
+    def acquire(self):
+        """ Blocks until the request is allowed
+        """
+        while True:
+            delay, reserved = self.reserve()
+            if delay > 0:
+                time.sleep(delay)
+            if reserved:
+                return
+
+    def throttle(self, now=None):
+        """ Shrinks per-second rate and spends the rest of the daily
+        budget, called on quota errors
+        """
+        with self._lock:
+            if self.rate:
+                self.rate = max(self.min_rate,
+                                self.rate * self.decrease_factor)
+            # The service refuses requests until the end of the day
+            if now is None:
+                now = time.time()
+            self._exhausted_day = int(now // SECONDS_PER_DAY)
+
+    def recover(self):
+        """ Restores per-second rate, called on successful responses
+        """
+        if self.rate == self.per_second:
+            return
+        with self._lock:
+            if self.rate:
+                self.rate = min(self.per_second,
+                                self.rate + self.per_second / 100.0)
@@ -0,0 +1,389 @@
+""" Record and replay of the client traffic.
+
+Recording adapter saves every request sent by `SlideShareAPI` with its
+timing and the response body to a gzipped JSON lines capture::
+
+    record(client, "traffic.jsonl.gz")
+
+Replay adapter serves responses from the capture without touching the
+service, with the original latency or `speed` times faster::
+
+    replay(client, "traffic.jsonl.gz", speed=10)
+
+`Driver` reproduces the load shape of the capture, sends its requests at
+the original pace multiplied by `speed` and reports throughput and tail
+latency::
+
+    python -m slideshare.replay traffic.jsonl.gz --speed 10
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import argparse
+import gzip
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.adapters import BaseAdapter
+from requests.exceptions import RequestException
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from six.moves.urllib.parse import parse_qsl, urlparse
+
+from slideshare.cache import VOLATILE_PARAMS, cache_key
+from slideshare.exceptions import SlideShareError
+from slideshare.tracing import wrap
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_VERSION = 1
+
+# Parameters never written to the capture
+SECRET_PARAMS = frozenset(["password"])
+
+
+def request_params(url):
+    """ Returns endpoint and parameters of the request without signature
+    and secrets
+    """
+    parsed = urlparse(url)
+    endpoint = parsed.path.rstrip("/").rsplit("/", 1)[-1]
+    params = dict((name, value) for name, value in parse_qsl(parsed.query)
+                  if name not in VOLATILE_PARAMS and
+                  name not in SECRET_PARAMS)
+    return endpoint, params
+
+
+def body_size(body):
+    if body is None:
+        return 0
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+
+def read_capture(path):
+    """ Returns list of records of the capture ordered by start time """
+    records = []
+    with gzip.open(path, "rb") as f:
+        try:
+            for line in f:
+                try:
+                    record = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    # Incomplete last line of interrupted recording
+                    continue
+                if "version" in record:
+                    continue
+                records.append(record)
+        except (EOFError, zlib.error) as e:
+            # Compressed stream of interrupted recording is cut off
+            logger.warning("Capture %s is truncated: %s", path, e)
+    records.sort(key=lambda record: record["start"])
+    return records
+
+
+class RecordingAdapter(BaseAdapter):
+    """ Sends requests with the wrapped adapter and writes them to the
+    capture. Response bodies are stored as is, request bodies (uploaded
+    files) only by size. Every record is flushed to the capture, so
+    recording may be interrupted without losing the traffic.
+    """
+
+    def __init__(self, adapter, path):
+        super(RecordingAdapter, self).__init__()
+        self.adapter = adapter
+        self.path = path
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wb")
+        self._write({"version": CAPTURE_VERSION, "started": self.started})
+
+    def _write(self, record):
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            self._file.write(line.encode("utf-8"))
+            # Records written so far survive a crash of the recording
+            # process
+            self._file.flush()
+
+    def send(self, request, **kwargs):
+        started = time.time()
+        response = self.adapter.send(request, **kwargs)
+        # Reads the body, streamed responses are served from memory then
+        content = response.content
+        endpoint, params = request_params(request.url)
+        self._write({
+            "start": round(started - self.started, 6),
+            "duration": round(time.time() - started, 6),
+            "method": request.method,
+            "endpoint": endpoint,
+            "params": params,
+            "request_bytes": body_size(request.body),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type"),
+            "body": content.decode("utf-8", "replace"),
+        })
+        return response
+
+    def close(self):
+        self.adapter.close()
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """ Serves responses from the capture.
+
+    Requests are matched by method, endpoint and parameters, repeated
+    requests get recorded responses in order. Requests missing in the
+    capture get any response of the same endpoint or 404.
+    """
+
+    def __init__(self, path, speed=None):
+        """
+        Args:
+            path (string):
+                Path to the capture.
+            speed (float):
+                Delay responses by the recorded duration divided by
+                `speed`. Responses are served at once by default.
+        """
+        super(ReplayAdapter, self).__init__()
+        self.speed = speed
+        self.records = read_capture(path)
+        self._responses = {}
+        self._by_endpoint = {}
+        for record in self.records:
+            key = (record["method"],
+                   cache_key(record["endpoint"], record["params"]))
+            self._responses.setdefault(key, deque()).append(record)
+            self._by_endpoint.setdefault(record["endpoint"], record)
+        self._lock = threading.Lock()
+
+    def _match(self, method, endpoint, params):
+        key = (method, cache_key(endpoint, params))
+        with self._lock:
+            responses = self._responses.get(key)
+            if responses:
+                record = responses.popleft()
+                if not responses:
+                    # Keep the last response for further repeats
+                    responses.append(record)
+                return record
+            return self._by_endpoint.get(endpoint)
+
+    def send(self, request, **kwargs):
+        endpoint, params = request_params(request.url)
+        record = self._match(request.method, endpoint, params)
+        if record is not None and self.speed:
+            time.sleep(record["duration"] / self.speed)
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.connection = self
+        if record is None:
+            response.status_code = 404
+            response.reason = "Not Found"
+            response._content = b""
+            response._content_consumed = True
+            return response
+        response.status_code = record["status"]
+        response.reason = "OK" if record["status"] == 200 else ""
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": record.get("content_type") or
+             "application/xml"})
+        response._content = record["body"].encode("utf-8")
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        return response
+
+    def close(self):
+        pass
+
+
+def record(client, path):
+    """ Starts recording traffic of `SlideShareAPI` client to the capture,
+    returns `RecordingAdapter`, close it to finish the capture
+    """
+    adapter = RecordingAdapter(client.get_adapter(client.BASE_URL), path)
+    client.mount("https://", adapter)
+    client.mount("http://", adapter)
+    return adapter
+
+
+def replay(client, path, speed=None):
+    """ Makes `SlideShareAPI` client serve responses from the capture
+    instead of sending requests, returns `ReplayAdapter`
+    """
+    adapter = ReplayAdapter(path, speed=speed)
+    client.mount("https://", adapter)
+    client.mount("http://", adapter)
+    return adapter
+
+
+class Filler(object):
+    """ Request body of given size made of zeros, stands for uploaded
+    files which are not recorded
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(self, size):
+        self.size = size
+        self.remaining = size
+
+    def __len__(self):
+        return self.size
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.remaining
+        size = min(size, self.remaining)
+        self.remaining -= size
+        return b"\0" * size
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[int(round(percent / 100.0 * (len(values) - 1)))]
+
+
+class Report(object):
+    """ Results of the replay run """
+
+    def __init__(self, latencies, errors, lags, elapsed, speed):
+        self.requests = len(latencies)
+        self.errors = errors
+        self.elapsed = elapsed
+        self.speed = speed
+        self.throughput = self.requests / elapsed if elapsed else 0.0
+        self.p50 = percentile(latencies, 50)
+        self.p95 = percentile(latencies, 95)
+        self.p99 = percentile(latencies, 99)
+        self.max = max(latencies) if latencies else None
+        # How late requests were sent compared to the schedule
+        self.max_lag = max(lags) if lags else None
+
+    def __str__(self):
+        if not self.requests:
+            return "no requests"
+        return ("{0.requests} requests at {0.speed}x in {0.elapsed:.2f}s, "
+                "{0.throughput:.1f} req/s, {0.errors} errors, latency "
+                "p50 {1:.1f}ms p95 {2:.1f}ms p99 {3:.1f}ms max {4:.1f}ms, "
+                "max lag {5:.1f}ms".format(
+                    self, self.p50 * 1000, self.p95 * 1000, self.p99 * 1000,
+                    self.max * 1000, self.max_lag * 1000))
+
+
+class Driver(object):
+    """ Replays the capture through the client at `speed` times the
+    original pace. Requests are sent from a thread pool at their scheduled
+    time regardless of completion of previous ones, like independent
+    production callers do.
+    """
+
+    def __init__(self, client, records, speed=1.0, max_workers=32):
+        """
+        Args:
+            client (slideshare.client.SlideShareAPI):
+                Client to send requests with: in replay mode, pointed to
+                the fake server or to the service.
+            records (list): capture records, see `read_capture`
+            speed (float): time compression factor. Defaults to 1.
+            max_workers (int):
+                Max number of requests in flight. Defaults to 32.
+        """
+        self.client = client
+        self.records = records
+        self.speed = speed
+        self.max_workers = max_workers
+
+    def call(self, record):
+        params = dict(record["params"])
+        if record["method"] == "GET":
+            return self.client.get(record["endpoint"], **params)
+        data = None
+        if record.get("request_bytes"):
+            data = Filler(record["request_bytes"])
+        return self.client.post(record["endpoint"], data=data, **params)
+
+    def run(self):
+        latencies = []
+        lags = []
+        errors = [0]
+        lock = threading.Lock()
+        started = time.time()
+
+        def send(record, scheduled):
+            sent = time.time()
+            try:
+                self.call(record)
+            except (SlideShareError, RequestException, ValueError) as e:
+                logger.debug("%s failed: %s", record["endpoint"], e)
+                with lock:
+                    errors[0] += 1
+            finally:
+                finished = time.time()
+                with lock:
+                    latencies.append(finished - sent)
+                    lags.append(max(0.0, sent - scheduled))
+
+        send = wrap(send)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            first = self.records[0]["start"] if self.records else 0
+            for record in self.records:
+                scheduled = started + (record["start"] - first) / self.speed
+                delay = scheduled - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(send, record, scheduled)
+        return Report(latencies, errors[0], lags, time.time() - started,
+                      self.speed)
+
+
+def main():
+    from slideshare.client import SlideShareAPI
+
+    parser = argparse.ArgumentParser(
+        description="Replays captured SlideShare traffic and reports "
+                    "throughput and latency")
+    parser.add_argument("capture", help="capture recorded by `record`")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="time compression factor, default 1")
+    parser.add_argument("--workers", type=int, default=32,
+                        help="max requests in flight, default 32")
+    parser.add_argument("--url", help="send requests to the server, e.g. "
+                                      "the fake one, instead of serving "
+                                      "them from the capture")
+    parser.add_argument("--api-key", default="key")
+    parser.add_argument("--shared-secret", default="secret")
+    args = parser.parse_args()
+
+    client = SlideShareAPI(args.api_key, args.shared_secret,
+                           pool_maxsize=args.workers)
+    if args.url:
+        client.BASE_URL = args.url
+    else:
+        replay(client, args.capture, speed=args.speed)
+    report = Driver(client, read_capture(args.capture), speed=args.speed,
+                    max_workers=args.workers).run()
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import logging
+import random
+import threading
+import time
+
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+
+logger = logging.getLogger(__name__)
+
+# Endpoints which are safe to repeat
+IDEMPOTENT_ENDPOINTS = frozenset([
+    "get_slideshow",
+    "get_slideshows_by_tag",
+    "get_slideshows_by_group",
+    "get_slideshows_by_user",
+    "search_slideshows",
+    "get_user_groups",
+    "get_user_favorites",
+    "get_user_contacts",
+    "get_user_tags",
+    "check_favorite",
+])
+
+# Endpoints which are never retried, even if listed in `endpoints`
+NEVER_RETRIED_ENDPOINTS = frozenset(["upload_slideshow"])
+
+# HTTP statuses of transient server errors
+RETRY_STATUSES = frozenset([500, 502, 503, 504])
+
+
+class RetryPolicy(object):
+    """ Retries idempotent requests failed with transient errors:
+    connection errors, timeouts and 5xx responses.
+
+    Delay between attempts grows exponentially and is randomized
+    ("full jitter"), so clients don't retry in lockstep.
+    """
+
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=30,
+                 jitter=True, max_time=None, statuses=RETRY_STATUSES,
+                 endpoints=IDEMPOTENT_ENDPOINTS):
+        """
+        Args:
+            max_attempts (int):
+                Max number of attempts including the first one.
+                Defaults to 3.
+            backoff (float):
+                Delay before the second attempt in seconds, doubled for
+                every next one. Defaults to 0.5.
+            max_backoff (float):
+                Max delay between attempts in seconds. Defaults to 30.
+            jitter (boolean):
+                Pick random delay between zero and the exponential delay.
+                Defaults to True.
+            max_time (float):
+                Total time budget of all attempts in seconds, no retries
+                are made when it would be exceeded. [Optional]
+            statuses (set):
+                HTTP statuses to retry. Defaults to 500, 502, 503, 504.
+            endpoints (set):
+                Endpoints to retry. Defaults to read-only endpoints.
+                `upload_slideshow` is never retried.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.max_time = max_time
+        self.statuses = frozenset(statuses)
+        self.endpoints = frozenset(endpoints) - NEVER_RETRIED_ENDPOINTS
+        # endpoint -> counters
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def applies_to(self, endpoint):
+        return endpoint in self.endpoints
+
+    def is_transient(self, exception):
+        """ Whether request failed with `requests` exception may succeed
+        on retry
+        """
+        if isinstance(exception, HTTPError):
+            response = exception.response
+            return response is not None and \
+                response.status_code in self.statuses
+        return isinstance(exception, (ConnectionError, Timeout))
+
+    def delay(self, attempt):
+        """ Returns delay in seconds after the failed attempt, starting
+        from 1
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def next_delay(self, attempt, started):
+        """ Returns delay before the next attempt or None if the request
+        must not be retried anymore
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.delay(attempt)
+        if self.max_time is not None and \
+                time.time() - started + delay > self.max_time:
+            return None
+        return delay
+
+    def record(self, endpoint, attempts, success):
+        """ Updates counters of the endpoint after the call
+        """
+        with self._lock:
+            counters = self.counters.setdefault(
+                endpoint, {"calls": 0, "attempts": 0, "retries": 0,
+                           "exhausted": 0})
+            counters["calls"] += 1
+            counters["attempts"] += attempts
+            counters["retries"] += attempts - 1
+            if not success and attempts > 1:
+                counters["exhausted"] += 1
+
+    def stats(self):
+        """ Returns copy of per endpoint counters: number of calls,
+        attempts, retries and calls failed after all retries
+        """
+        with self._lock:
+            return dict((endpoint, dict(counters))
+                        for endpoint, counters in self.counters.items())
+
+    def start(self, endpoint, is_transient=None):
+        """ Returns `RetryCall` deciding on retries of a single call
+
+        Args:
+            endpoint (string): endpoint of the call
+            is_transient (callable):
+                Classifies exceptions like `is_transient`, which is used
+                by default. [Optional]
+        """
+        return RetryCall(self, endpoint, is_transient or self.is_transient)
+
+    def call(self, endpoint, func):
+        """ Calls `func` until it succeeds, fails with non-transient error
+        or retries are exhausted
+        """
+        retry = self.start(endpoint)
+        while True:
+            try:
+                result = func()
+            except Exception as e:
+                delay = retry.failed(e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+            else:
+                retry.succeeded()
+                return result
+
+
+class RetryCall(object):
+    """ Attempts of a single call retried by the policy.
+
+    Holds the decisions shared by sync and async clients, which only
+    differ in the way they wait before the next attempt.
+    """
+
+    def __init__(self, policy, endpoint, is_transient):
+        self.policy = policy
+        self.endpoint = endpoint
+        self.is_transient = is_transient
+        self.started = time.time()
+        self.attempts = 0
+
+    def failed(self, exception):
+        """ Returns delay before the next attempt, None if the exception
+        must be raised
+        """
+        self.attempts += 1
+        delay = None
+        if self.is_transient(exception):
+            delay = self.policy.next_delay(self.attempts, self.started)
+        if delay is None:
+            self.policy.record(self.endpoint, self.attempts, False)
+            return None
+        logger.warning("%s attempt %d failed: %s, retry in %.2fs",
+                       self.endpoint, self.attempts, exception, delay)
+        return delay
+
+    def succeeded(self):
+        self.attempts += 1
+        self.policy.record(self.endpoint, self.attempts, True)
@@ -0,0 +1,70 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import copy
+import threading
+
+
+class _Call(object):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """ Coalesces concurrent identical calls.
+
+    The first caller with the key runs the function, callers arriving while
+    it is in flight wait for it and get a copy of its result or the same
+    exception. Nothing is kept after the call completes, this is not
+    a cache.
+    """
+
+    def __init__(self, copy=copy.deepcopy):
+        """
+        Args:
+            copy (callable):
+                Makes a copy of the result for every waiter, so callers
+                may modify results independently. Defaults to
+                `copy.deepcopy`.
+        """
+        self.copy = copy
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """ Runs `func` or waits for the in-flight call with the same key
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._in_flight.get(key)
+            if call is None:
+                call = self._in_flight[key] = _Call()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self.copy(call.result)
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """ Returns number of calls and calls served by in-flight ones """
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced}
@@ -1,8 +1,13 @@
 from __future__ import unicode_literals, absolute_import, print_function
 
+import functools
 import os
 import posixpath
 
+from slideshare.pagination import iter_offset, iter_pages
+from slideshare.utils import (group_page, int_param, search_page, tag_page,
+                              user_page)
+
 
 class SlideshowMixin(object):
     def get_slideshow(self, slideshow_id=None, slideshow_url=None, **optional):
@@ -47,7 +52,6 @@ class SlideshowMixin(object):
         if "get_transcript" in optional:
             params["get_transcript"] = int(bool(optional["get_transcript"]))
 
-        params.update(self.params)
         return self.get('get_slideshow', **params)
 
     def get_slideshows_by_tag(self, tag, **optional):
@@ -65,28 +69,242 @@ class SlideshowMixin(object):
                 Defaults to None. If None only basic information attached [Optional]
 
         """
-        params = {"tag": tag}
+        params = self._slideshows_by_tag_params(tag, optional)
+        return self.get('get_slideshows_by_tag', **params)
 
+    @staticmethod
+    def _listing_params(method, params, optional):
+        """ Adds `limit`, `offset` and `detailed` parameters of
+        the listing endpoint
+        """
         if "limit" in optional:
-            try:
-                params["limit"] = int(optional.get("limit"))
-            except ValueError:
-                raise ValueError("get_slideshows_by_tag: invalid "
-                                 "value for {}".format(optional.get("limit")))
+            int_param(method, params, optional, "limit")
         else:
             params["limit"] = 10
-
-        if "offset" in optional:
-            try:
-                params["offset"] = int(optional.get("offset"))
-            except ValueError:
-                raise ValueError("get_slideshows_by_tag: invalid "
-                                 "value for {}".format(optional.get("offset")))
+        int_param(method, params, optional, "offset")
 
         if "detailed" in optional:
             params["detailed"] = int(bool(optional["detailed"]))
 
-        return self.get('get_slideshows_by_tag', **params)
+        return params
+
+    @classmethod
+    def _slideshows_by_tag_params(cls, tag, optional):
+        return cls._listing_params("get_slideshows_by_tag", {"tag": tag},
+                                   optional)
+
+    @classmethod
+    def _slideshows_by_group_params(cls, group_name, optional):
+        return cls._listing_params("get_slideshows_by_group",
+                                   {"group_name": group_name}, optional)
+
+    def _slideshows_by_user_params(self, username_for, optional):
+        params = {"username_for": username_for}
+        params = self.prefetch_default_credentials(params, optional)
+        if "get_unconverted" in optional:
+            params["get_unconverted"] = int(bool(optional["get_unconverted"]))
+        return self._listing_params("get_slideshows_by_user", params,
+                                    optional)
+
+    def stream_slideshows_by_tag(self, tag, **optional):
+        """ Get slideshows by tag parsing them as the response arrives
+
+        Slideshows are yielded one by one while the body is being received,
+        which lowers time to the first slideshow and memory usage for
+        large `limit` values.
+
+        Args:
+            tag (string):
+                tag name
+            limit (int):
+                specify number of items to return. Default to 10. [Optional]
+            offset (int):
+                specify offset [Optional]
+            detailed (boolean):
+                Set to 1 to include optional information (tags, for example)
+                Defaults to None. If None only basic information attached [Optional]
+
+        """
+        params = self._slideshows_by_tag_params(tag, optional)
+        return self.stream_listing('get_slideshows_by_tag', **params)
+
+    def iter_slideshows_by_tag(self, tag, per_page=50, **optional):
+        """ Iterate over all slideshows with the tag
+
+        Next page is fetched in background while the current one is
+        consumed.
+
+        Args:
+            tag (string):
+                tag name
+            per_page (int):
+                number of items requested at once. Defaults to 50. [Optional]
+            offset (int):
+                offset of the first item [Optional]
+            limit (int):
+                max number of items, all by default [Optional]
+            detailed (boolean):
+                Set to 1 to include optional information [Optional]
+
+        """
+        offset = optional.pop("offset", 0)
+        limit = optional.pop("limit", None)
+        fetch = functools.partial(self.get_slideshows_by_tag, tag, **optional)
+        return iter_offset(fetch, tag_page, per_page, offset=offset,
+                           limit=limit)
+
+    def get_slideshows_by_group(self, group_name, **optional):
+        """ Get slideshows by group
+
+        Args:
+            group_name (string):
+                Group name, as returned in QueryName element by
+                `get_user_groups`
+            limit (int):
+                specify number of items to return. Default to 10. [Optional]
+            offset (int):
+                specify offset [Optional]
+            detailed (boolean):
+                Set to 1 to include optional information (tags, for example)
+                Defaults to None. If None only basic information attached [Optional]
+
+        """
+        params = self._slideshows_by_group_params(group_name, optional)
+        return self.get('get_slideshows_by_group', **params)
+
+    # Name of the legacy `slideshare.api.SlideshareAPI` method
+    get_slideshow_by_group = get_slideshows_by_group
+
+    def stream_slideshows_by_group(self, group_name, **optional):
+        """ Get slideshows by group parsing them as the response arrives.
+        Takes the same arguments as `get_slideshows_by_group`.
+        """
+        params = self._slideshows_by_group_params(group_name, optional)
+        return self.stream_listing('get_slideshows_by_group', **params)
+
+    def iter_slideshows_by_group(self, group_name, per_page=50, **optional):
+        """ Iterate over all slideshows of the group, next page is fetched
+        in background. Takes the same arguments as `get_slideshows_by_group`.
+        """
+        offset = optional.pop("offset", 0)
+        limit = optional.pop("limit", None)
+        fetch = functools.partial(self.get_slideshows_by_group, group_name,
+                                  **optional)
+        return iter_offset(fetch, group_page, per_page, offset=offset,
+                           limit=limit)
+
+    def get_slideshows_by_user(self, username_for, **optional):
+        """ Get slideshows by user
+
+        Args:
+            username_for (string):
+                username of owner of slideshows
+            username (string):
+                username of the requesting user [Optional]
+            password (string):
+                password of the requesting user [Optional]
+            limit (int):
+                specify number of items to return. Default to 10. [Optional]
+            offset (int):
+                specify offset [Optional]
+            detailed (boolean):
+                Set to 1 to include optional information (tags, for example)
+                Defaults to None. If None only basic information attached [Optional]
+            get_unconverted (boolean):
+                Set to 1 to include unconverted slideshows. [Optional]
+
+        """
+        params = self._slideshows_by_user_params(username_for, optional)
+        return self.get('get_slideshows_by_user', **params)
+
+    def stream_slideshows_by_user(self, username_for, **optional):
+        """ Get slideshows by user parsing them as the response arrives.
+        Takes the same arguments as `get_slideshows_by_user`.
+        """
+        params = self._slideshows_by_user_params(username_for, optional)
+        return self.stream_listing('get_slideshows_by_user', **params)
+
+    def iter_slideshows_by_user(self, username_for, per_page=50, **optional):
+        """ Iterate over all slideshows of the user, next page is fetched
+        in background. Takes the same arguments as `get_slideshows_by_user`.
+        """
+        offset = optional.pop("offset", 0)
+        limit = optional.pop("limit", None)
+        fetch = functools.partial(self.get_slideshows_by_user, username_for,
+                                  **optional)
+        return iter_offset(fetch, user_page, per_page, offset=offset,
+                           limit=limit)
+
+    def _search_params(self, q, optional):
+        params = {"q": q}
+        for name in ("page", "items_per_page"):
+            int_param("search_slideshows", params, optional, name)
+        for name in ("lang", "sort", "upload_date", "what", "fileformat",
+                     "file_type"):
+            if name in optional:
+                params[name] = optional[name]
+        for name in ("download", "cc", "cc_adapt", "cc_commercial",
+                     "detailed"):
+            if name in optional:
+                params[name] = int(bool(optional[name]))
+        return params
+
+    def search_slideshows(self, q, **optional):
+        """ Search slideshows
+
+        Args:
+            q (string):
+                the query string
+            page (int):
+                The page number of the results, starting from 1 [Optional]
+            items_per_page (int):
+                Number of results to return per page. Default is 12 [Optional]
+            lang (string):
+                Language of slideshows. Default is English, 'en' [Optional]
+            sort (string):
+                Sort order: 'relevance' (default), 'mostviewed',
+                'mostdownloaded' or 'latest' [Optional]
+            upload_date (string):
+                Restrict search to the last 'week', 'month' or 'year'.
+                Default is 'any' [Optional]
+            what (string):
+                Set to 'tag' to search by tag, text search otherwise [Optional]
+            download (boolean):
+                Set to 0 to search slideshows available to download, all
+                slideshows by default [Optional]
+            fileformat (string):
+                'pdf', 'ppt', 'odp', 'pps', 'pot' or 'all' (default) [Optional]
+            file_type (string):
+                'presentations', 'documents', 'webinars', 'videos' or 'all'
+                (default) [Optional]
+            cc (boolean):
+                Set to 1 to search Creative Commons licensed slideshows [Optional]
+            cc_adapt (boolean):
+                Set to 1 to search Creative Commons slideshows which allow
+                adaptation [Optional]
+            cc_commercial (boolean):
+                Set to 1 to search slideshows with commercial Creative Commons
+                license [Optional]
+            detailed (boolean):
+                Set to 1 to include optional information (tags, for example)
+                Defaults to None. If None only basic information attached [Optional]
+
+        """
+        params = self._search_params(q, optional)
+        return self.get('search_slideshows', **params)
+
+    def iter_search_slideshows(self, q, per_page=50, **optional):
+        """ Iterate over all search results, next page is fetched in
+        background. Takes the same arguments as `search_slideshows` and
+        `limit`, the max number of items.
+        """
+        page = optional.pop("page", 1)
+        limit = optional.pop("limit", None)
+        # Page size is set by `per_page`
+        optional.pop("items_per_page", None)
+        fetch = functools.partial(self.search_slideshows, q, **optional)
+        return iter_pages(fetch, search_page, per_page, page=page,
+                          limit=limit)
 
     def edit_slideshow(self, slideshow_id, **optional):
         """Edit existing slideshow
@@ -250,6 +468,9 @@ class SlideshowMixin(object):
             share_with_contacts (enumerated):
                 Sets if your contacts on SlideShare can view the slideshow.
                 Requires make_slideshow_private to be Y. [Optional]
+            progress_callback (callable):
+                Called with number of bytes sent and total request size
+                while `slideshow_srcfile` is uploaded. [Optional]
 
         Returns:
             xml: XML with slideshare ID if success.
@@ -273,8 +494,7 @@ class SlideshowMixin(object):
             # Workaround to deal with filenames containing non-ASCII symbols.
             _, ext = posixpath.splitext(slideshow_srcfile)
             fname = 'slideshow_srcfile' + ext
-            upload_file = [
-                ('slideshow_srcfile', (fname, open(slideshow_srcfile, 'rb')))]
+            upload_file = [('slideshow_srcfile', (fname, slideshow_srcfile))]
         elif upload_url:
             params["upload_url"] = upload_url
         else:
@@ -315,7 +535,9 @@ class SlideshowMixin(object):
             params["share_with_contacts"] = "Y"
 
         if slideshow_srcfile:
-            return self.post('upload_slideshow', files=upload_file, data=params)
+            return self.post('upload_slideshow', files=upload_file, data=params,
+                             progress_callback=optional.get(
+                                 "progress_callback"))
         else:
             return self.get('upload_slideshow', **params)
 
@@ -0,0 +1,208 @@
+""" Incremental synchronization of user catalogs.
+
+`CatalogSync` keeps ids and `Updated` stamps of known slideshows in a
+local state file and on every run reports only the difference with the
+service as added, updated and removed events::
+
+    sync = CatalogSync(client, "catalogs.json")
+    for event in sync.sync("user").events:
+        print(event.kind, event.slideshow_id)
+
+Listings are returned newest first, so paging stops as soon as a run of
+known unchanged slideshows is reached and the total count of the listing
+matches the known catalog with the new slideshows. When the count
+doesn't match, slideshows were removed or added deeper in the listing,
+and the whole listing is scanned. Run with ``full=True`` now and then to
+catch edits of old slideshows which keep the count unchanged.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import io
+import json
+import logging
+import os
+from collections import namedtuple
+
+import six
+
+from slideshare.utils import user_page, write_atomic
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+# Fields compared to detect updated slideshows
+DEFAULT_FIELDS = ("Updated", "Status")
+
+ADDED = "added"
+UPDATED = "updated"
+REMOVED = "removed"
+
+
+class Event(namedtuple("Event", ["kind", "slideshow_id", "slideshow"])):
+    """ Change of the catalog. `slideshow` is the listing item, None for
+    removed slideshows.
+    """
+    __slots__ = ()
+
+
+class SyncReport(object):
+    """ Results of the sync run """
+
+    def __init__(self, username_for, events, requests, scanned, full):
+        self.username_for = username_for
+        self.events = events
+        self.requests = requests
+        self.scanned = scanned
+        # Whole listing was scanned
+        self.full = full
+
+    def count(self, kind):
+        return sum(1 for event in self.events if event.kind == kind)
+
+    def __str__(self):
+        return ("{0.username_for}: {1} added, {2} updated, {3} removed, "
+                "{0.scanned} slideshows in {0.requests} requests{4}".format(
+                    self, self.count(ADDED), self.count(UPDATED),
+                    self.count(REMOVED), " (full scan)" if self.full else ""))
+
+
+def _value(slideshow, key):
+    """ Field of listing item, `slideshare.models.Slideshow` included """
+    if key not in slideshow:
+        return None
+    value = slideshow[key]
+    return None if value is None else six.text_type(value)
+
+
+class CatalogSync(object):
+    """ Fetches changes of user catalogs since the previous run.
+
+    Quick runs stop paging once `stop_after` known unchanged slideshows
+    are seen and the count of the listing adds up, the rest of the listing
+    is assumed unchanged. Changes deeper in the listing which keep the
+    count are missed: an edit of an old slideshow, or a removal together
+    with an insertion of the same number of slideshows, e.g. an older
+    slideshow made public. Sync with ``full=True`` periodically to catch
+    them.
+    """
+
+    def __init__(self, client, path, per_page=50, fields=DEFAULT_FIELDS,
+                 stop_after=None, **optional):
+        """
+        Args:
+            client (slideshare.client.SlideShareAPI):
+                Client to fetch listings with. Disable its cache, cached
+                pages hide the changes.
+            path (string):
+                State file, created on the first run.
+            per_page (int):
+                Number of slideshows requested at once. Defaults to 50.
+                [Optional]
+            fields (list):
+                Fields compared to detect updated slideshows.
+                Defaults to `DEFAULT_FIELDS`. [Optional]
+            stop_after (int):
+                Number of consecutive known unchanged slideshows paging
+                stops after. Defaults to `per_page`. [Optional]
+            **optional:
+                Passed to `get_slideshows_by_user`, e.g. ``detailed=1``.
+                [Optional]
+        """
+        self.client = client
+        self.path = path
+        self.per_page = per_page
+        self.fields = tuple(fields)
+        self.stop_after = stop_after or per_page
+        self.optional = optional
+        self.accounts = {}
+        if os.path.exists(path):
+            with io.open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") == STATE_VERSION and \
+                    list(state.get("fields", ())) == list(self.fields):
+                self.accounts = state["accounts"]
+            else:
+                logger.warning("State %s has other version or fields, "
+                               "next runs are full syncs", path)
+
+    def _fingerprint(self, slideshow):
+        return [_value(slideshow, field) for field in self.fields]
+
+    def sync(self, username_for, full=False):
+        """ Fetches changes of the user catalog and saves the new state
+
+        Args:
+            username_for (string):
+                owner of the catalog
+            full (boolean):
+                Scan the whole listing instead of stopping at known
+                slideshows. Forced on the first sync of the user.
+                [Optional]
+
+        Returns:
+            SyncReport: events in listing order followed by removals
+        """
+        known = self.accounts.get(username_for)
+        full = full or known is None
+        known = dict(known["slideshows"]) if known else {}
+        current = {}
+        events = []
+        added = requests = scanned = unchanged = offset = 0
+        while True:
+            response = self.client.get_slideshows_by_user(
+                username_for, limit=self.per_page, offset=offset,
+                **self.optional)
+            requests += 1
+            slideshows, count = user_page(response)
+            for slideshow in slideshows:
+                slideshow_id = _value(slideshow, "ID")
+                fingerprint = self._fingerprint(slideshow)
+                previous = known.get(slideshow_id)
+                current[slideshow_id] = fingerprint
+                if previous is None:
+                    events.append(Event(ADDED, slideshow_id, slideshow))
+                    added += 1
+                    unchanged = 0
+                elif previous != fingerprint:
+                    events.append(Event(UPDATED, slideshow_id, slideshow))
+                    unchanged = 0
+                else:
+                    unchanged += 1
+            scanned += len(slideshows)
+            offset += len(slideshows)
+            if len(slideshows) < self.per_page or \
+                    (count is not None and offset >= count):
+                complete = True
+                break
+            if full or unchanged < self.stop_after:
+                continue
+            if count is not None and count == len(known) + added:
+                # The rest of the listing is known and unchanged
+                complete = False
+                break
+            # Slideshows were removed or added deeper in the listing
+            logger.debug("%s: count %s doesn't match %s known slideshows, "
+                         "scanning the whole listing", username_for, count,
+                         len(known) + added)
+            full = True
+
+        if complete:
+            for slideshow_id in known:
+                if slideshow_id not in current:
+                    events.append(Event(REMOVED, slideshow_id, None))
+        else:
+            for slideshow_id, fingerprint in six.iteritems(known):
+                current.setdefault(slideshow_id, fingerprint)
+        self.accounts[username_for] = {"count": len(current),
+                                       "slideshows": current}
+        self.save()
+        return SyncReport(username_for, events, requests, scanned,
+                          complete)
+
+    def save(self):
+        """ Saves the state atomically """
+        state = {"version": STATE_VERSION, "fields": list(self.fields),
+                 "accounts": self.accounts}
+        write_atomic(self.path,
+                     six.text_type(json.dumps(state, sort_keys=True)))
@@ -0,0 +1,200 @@
+""" Tracing of the client calls.
+
+Every call is recorded as a span with nested spans of its phases:
+`sign`, `prepare` (URL and body preparation by `requests`), `network`,
+`parse` and `model`::
+
+    tracer = Tracer(FileExporter("spans.jsonl"))
+    client = SlideShareAPI(api_key, shared_secret, tracer=tracer)
+    with tracer.span("import job"):
+        client.get_slideshow(slideshow_id=42)
+
+Spans nest under the span active in the caller's context. Context is
+tracked with `contextvars`, so it follows asyncio tasks, threads pick it
+up with `wrap`.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import functools
+import io
+import json
+import random
+import threading
+import time
+
+try:
+    import contextvars
+except ImportError:
+    # Python < 3.7
+    contextvars = None
+
+if contextvars is not None:
+    _current = contextvars.ContextVar("slideshare_span", default=None)
+
+    def current_span():
+        """ Returns span active in the current context or None """
+        return _current.get()
+
+    def _activate(span):
+        return _current.set(span)
+
+    def _restore(token):
+        _current.reset(token)
+else:
+    _local = threading.local()
+
+    def current_span():
+        """ Returns span active in the current context or None """
+        return getattr(_local, "span", None)
+
+    def _activate(span):
+        previous = current_span()
+        _local.span = span
+        return previous
+
+    def _restore(previous):
+        _local.span = previous
+
+
+def _random_id(bits):
+    return "{:0{}x}".format(random.getrandbits(bits), bits // 4)
+
+
+def wrap(func):
+    """ Makes `func` run in the span active at the moment of wrapping,
+    for functions called in other threads
+    """
+    span = current_span()
+    if span is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _activate(span)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _restore(token)
+    return wrapper
+
+
+class NullSpan(object):
+    """ Span of disabled tracer, does nothing """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+    def set_attribute(self, name, value):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span(object):
+    """ Timed operation. Active while used as context manager,
+    exported on exit.
+    """
+
+    def __init__(self, tracer, name, parent=None, attributes=None):
+        self.tracer = tracer
+        self.name = name
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = parent.trace_id if parent is not None else \
+            _random_id(128)
+        self.span_id = _random_id(64)
+        self.attributes = dict(attributes or {})
+        self.error = None
+        self.start = None
+        self.end = None
+        self._token = None
+
+    def set_attribute(self, name, value):
+        self.attributes[name] = value
+
+    @property
+    def duration(self):
+        if self.start is None or self.end is None:
+            return None
+        return self.end - self.start
+
+    def __enter__(self):
+        self.start = time.time()
+        self._token = _activate(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.end = time.time()
+        _restore(self._token)
+        self._token = None
+        if exc is not None:
+            self.error = "{}: {}".format(exc_type.__name__, exc)
+        self.tracer.export(self)
+        return False
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def __repr__(self):
+        return "<Span {} {}>".format(self.name, self.duration)
+
+
+class Tracer(object):
+    """ Creates spans and passes finished ones to the exporter """
+
+    def __init__(self, exporter):
+        """
+        Args:
+            exporter:
+                Object with `export(span)` method, e.g. `FileExporter` or
+                `CallbackExporter`.
+        """
+        self.exporter = exporter
+
+    def span(self, name, **attributes):
+        """ Returns span nested under the active one """
+        return Span(self, name, current_span(), attributes)
+
+    def export(self, span):
+        self.exporter.export(span)
+
+
+class CallbackExporter(object):
+    """ Calls `callback` with every finished `Span` """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def export(self, span):
+        self.callback(span)
+
+
+class FileExporter(object):
+    """ Appends finished spans to the file in JSON lines format """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = io.open(path, "a", encoding="utf-8")
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), sort_keys=True)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
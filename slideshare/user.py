@@ -0,0 +1,177 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+from slideshare.utils import int_param
+
+
+class UserMixin(object):
+    def get_user_groups(self, username_for, **optional):
+        """ Get groups the user belongs to
+
+        Args:
+            username_for (string):
+                username of user whose groups are being requested
+            username (string):
+                username of the requesting user [Optional]
+            password (string):
+                password of the requesting user [Optional]
+
+        """
+        params = {"username_for": username_for}
+        params = self.prefetch_default_credentials(params, optional)
+        return self.get('get_user_groups', **params)
+
+    def get_user_favorites(self, username_for):
+        """ Get slideshows favorited by the user
+
+        Args:
+            username_for (string):
+                username of user whose favorites are being requested
+
+        """
+        return self.get('get_user_favorites', username_for=username_for)
+
+    def get_user_contacts(self, username_for, **optional):
+        """ Get contacts of the user
+
+        Args:
+            username_for (string):
+                username of user whose contacts are being requested
+            limit (int):
+                specify number of items to return [Optional]
+            offset (int):
+                specify offset [Optional]
+
+        """
+        params = {"username_for": username_for}
+        for name in ("limit", "offset"):
+            int_param("get_user_contacts", params, optional, name)
+        return self.get('get_user_contacts', **params)
+
+    def get_user_tags(self, **optional):
+        """ Get tags used by the requesting user
+
+        Args:
+            username (string):
+                username of the requesting user.
+                Optional if default provided.
+            password (string):
+                password of the requesting user.
+                Optional if default provided.
+
+        """
+        params = self.prefetch_default_credentials({}, optional,
+                                                   required=True)
+        return self.get('get_user_tags', **params)
+
+    def add_favorite(self, slideshow_id, **optional):
+        """ Favorite slideshow on behalf of the requesting user
+
+        Args:
+            slideshow_id (int):
+                the slideshow to be favorited
+            username (string):
+                username of the requesting user.
+                Optional if default provided.
+            password (string):
+                password of the requesting user.
+                Optional if default provided.
+
+        """
+        params = self.prefetch_default_credentials({}, optional,
+                                                   required=True)
+        params["slideshow_id"] = int(slideshow_id)
+        return self.get('add_favorite', **params)
+
+    def check_favorite(self, slideshow_id, **optional):
+        """ Check whether the requesting user favorited the slideshow
+
+        Args:
+            slideshow_id (int):
+                the slideshow to be checked
+            username (string):
+                username of the requesting user.
+                Optional if default provided.
+            password (string):
+                password of the requesting user.
+                Optional if default provided.
+
+        """
+        params = self.prefetch_default_credentials({}, optional,
+                                                   required=True)
+        params["slideshow_id"] = int(slideshow_id)
+        return self.get('check_favorite', **params)
+
+    def get_user_campaigns(self, **optional):
+        """ Get lead campaigns of the requesting user
+
+        Credentials are sent in POST body.
+
+        Args:
+            username (string):
+                username of the requesting user.
+                Optional if default provided.
+            password (string):
+                password of the requesting user.
+                Optional if default provided.
+
+        """
+        params = self.prefetch_default_credentials({}, optional,
+                                                   required=True)
+        return self.post('get_user_campaigns', data=params)
+
+    @staticmethod
+    def _leads_params(params, optional):
+        # Dates are UTC in YYYYMMDDHHMM format
+        for name in ("begin", "end"):
+            if optional.get(name):
+                params[name] = optional[name]
+        return params
+
+    def get_user_leads(self, **optional):
+        """ Get leads collected by all campaigns of the requesting user
+
+        Args:
+            username (string):
+                username of the requesting user.
+                Optional if default provided.
+            password (string):
+                password of the requesting user.
+                Optional if default provided.
+            begin (string):
+                only get leads collected after this UTC date,
+                YYYYMMDDHHMM [Optional]
+            end (string):
+                only get leads collected before this UTC date,
+                YYYYMMDDHHMM [Optional]
+
+        """
+        params = self.prefetch_default_credentials({}, optional,
+                                                   required=True)
+        params = self._leads_params(params, optional)
+        return self.post('get_user_leads', data=params)
+
+    def get_user_campaign_leads(self, campaign_id, **optional):
+        """ Get leads collected by the campaign of the requesting user
+
+        Args:
+            campaign_id (string):
+                campaign to select the leads from
+            username (string):
+                username of the requesting user.
+                Optional if default provided.
+            password (string):
+                password of the requesting user.
+                Optional if default provided.
+            begin (string):
+                only get leads collected after this UTC date,
+                YYYYMMDDHHMM [Optional]
+            end (string):
+                only get leads collected before this UTC date,
+                YYYYMMDDHHMM [Optional]
+
+        """
+        params = self.prefetch_default_credentials({}, optional,
+                                                   required=True)
+        params["campaign_id"] = campaign_id
+        params = self._leads_params(params, optional)
+        return self.post('get_user_campaign_leads', data=params)
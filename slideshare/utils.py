@@ -0,0 +1,101 @@
+from __future__ import unicode_literals, absolute_import, print_function
+
+import io
+import os
+
+_replace = getattr(os, "replace", os.rename)
+
+
+def listify(value):
+    """ xmltodict returns single child element as is and a list for
+    repeated elements. Always returns a list.
+    """
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def _count(value):
+    return int(value) if value is not None else None
+
+
+def _model_page(response):
+    """ Page of `slideshare.models.SlideshowList` response """
+    return list(response.slideshows or ()), response.count
+
+
+def tag_page(response):
+    """ Extracts slideshows and total count from
+    `get_slideshows_by_tag` response
+    """
+    if hasattr(response, "slideshows"):
+        return _model_page(response)
+    tag = response.get("Tag") or {}
+    return listify(tag.get("Slideshow")), _count(tag.get("Count"))
+
+
+def user_page(response):
+    """ Extracts slideshows and total count from
+    `get_slideshows_by_user` response
+    """
+    if hasattr(response, "slideshows"):
+        return _model_page(response)
+    user = response.get("User") or {}
+    return listify(user.get("Slideshow")), _count(user.get("Count"))
+
+
+def group_page(response):
+    """ Extracts slideshows and total count from
+    `get_slideshows_by_group` response
+    """
+    if hasattr(response, "slideshows"):
+        return _model_page(response)
+    group = response.get("Group") or {}
+    return listify(group.get("Slideshow")), _count(group.get("Count"))
+
+
+def search_page(response):
+    """ Extracts slideshows and total number of results from
+    `search_slideshows` response
+    """
+    if hasattr(response, "slideshows"):
+        return _model_page(response)
+    result = response.get("Slideshows") or {}
+    meta = result.get("Meta") or {}
+    return (listify(result.get("Slideshow")),
+            _count(meta.get("TotalResults")))
+
+
+def int_param(method, params, optional, name):
+    """ Copies integer parameter from `optional` to `params` if specified,
+    raises ValueError naming the API method on invalid value
+    """
+    if name in optional:
+        try:
+            params[name] = int(optional.get(name))
+        except ValueError:
+            raise ValueError("{}: invalid value for {}".format(
+                method, optional.get(name)))
+
+
+def slideshow_lookup(value):
+    """ Returns `get_slideshow` keyword arguments for slideshow id or url
+    """
+    if isinstance(value, int) or not str(value).startswith(("http://",
+                                                             "https://")):
+        return {"slideshow_id": value}
+    return {"slideshow_url": value}
+
+
+def write_atomic(path, text):
+    """ Writes text to the file through a temporary one, so a crash never
+    leaves the file torn: it holds either the previous or the new content
+    """
+    temp = path + ".tmp"
+    with io.open(temp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    _replace(temp, path)
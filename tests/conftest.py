@@ -1,16 +1,22 @@
 import os
+import sys
 import pytest
 
 from distutils import dir_util
 
 from slideshare.client import SlideShareAPI
+from tests.server import FakeAdapter
+
+# Tests of the asyncio client use Python 3.7+ syntax and asyncio.run
+collect_ignore = [] if sys.version_info >= (3, 7) else ["test_aio.py"]
 
 
 def pytest_addoption(parser):
-    parser.addoption("--api_key", action="store", required=True,
+    parser.addoption("--api_key", action="store", default=None,
                      help="Set this to the API Key that SlideShare "
-                          "has provided for you")
-    parser.addoption("--shared_secret", action="store", required=True,
+                          "has provided for you, tests of the live API "
+                          "are skipped without it")
+    parser.addoption("--shared_secret", action="store", default=None,
                      help="Shared secret that SlideShare has provided for you")
     parser.addoption("--username", action="store", default="",
                      help="Default username of the requesting user")
@@ -18,7 +24,7 @@ def pytest_addoption(parser):
                      help="Default password of the requesting user")
     parser.addoption("--debug_http", action="store_true",
                      help="Debug all http requests")
-    parser.addoption("--slideshow_id", action="store", required=True,
+    parser.addoption("--slideshow_id", action="store", default=None,
                      help="ID of existed slideshow.")
 
 
@@ -26,6 +32,8 @@ def pytest_addoption(parser):
 def client(request):
     api_key = request.config.getoption("--api_key")
     shared_secret = request.config.getoption("--shared_secret")
+    if not api_key or not shared_secret:
+        pytest.skip("live API tests require --api_key and --shared_secret")
     username = request.config.getoption("--username")
     password = request.config.getoption("--password")
     debug_http = request.config.getoption("--debug_http")
@@ -38,8 +46,9 @@ def client(request):
 
 @pytest.fixture(scope="session")
 def slideshow(request, client):
-    # TODO: make slideshow_id optional
     slideshow_id = request.config.getoption("--slideshow_id")
+    if not slideshow_id:
+        pytest.skip("live API tests require --slideshow_id")
     response = client.get_slideshow(slideshow_id=slideshow_id)
     assert response['Slideshow']['ID'] == slideshow_id
 
@@ -53,6 +62,27 @@ def slideshow(request, client):
     return slideshow
 
 
+@pytest.fixture
+def fake_client():
+    """
+    Factory of clients answered in process by `FakeAdapter`, no requests
+    reach the network::
+
+        client, adapter = fake_client(respond, models=True)
+
+    `respond` is passed to `FakeAdapter`, other arguments to
+    `SlideShareAPI`.
+    """
+    def make(respond=b"<Response/>", **options):
+        options.setdefault("api_key", "key")
+        options.setdefault("shared_secret", "secret")
+        client = SlideShareAPI(**options)
+        adapter = FakeAdapter(respond)
+        client.mount("https://", adapter)
+        return client, adapter
+    return make
+
+
 # Inspired by http://stackoverflow.com/a/29631801/1341309
 @pytest.fixture()
 def datadir(tmpdir, request):
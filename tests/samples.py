@@ -0,0 +1,163 @@
+""" Realistic SlideShare API responses for tests and benchmarks """
+from __future__ import unicode_literals, absolute_import, print_function
+
+from xml.sax.saxutils import escape
+
+SLIDESHOW = """<Slideshow>
+  <ID>{id}</ID>
+  <Title>{title}</Title>
+  <Description>{description}</Description>
+  <Status>2</Status>
+  <Username>user{user}</Username>
+  <URL>https://www.slideshare.net/user{user}/slideshow-{id}</URL>
+  <ThumbnailURL>//cdn.slidesharecdn.com/ss_thumbnails/slideshow-{id}-thumbnail.jpg</ThumbnailURL>
+  <ThumbnailSize>[170,130]</ThumbnailSize>
+  <ThumbnailSmallURL>//cdn.slidesharecdn.com/ss_thumbnails/slideshow-{id}-thumbnail-2.jpg</ThumbnailSmallURL>
+  <Embed>{embed}</Embed>
+  <Created>Thu Mar 25 23:25:19 -0500 2010</Created>
+  <Updated>2010-03-26 04:25:19 UTC</Updated>
+  <Language>en</Language>
+  <Format>pdf</Format>
+  <Download>1</Download>
+  <DownloadUrl>https://www.slideshare.net/slideshow/download?id={id}</DownloadUrl>
+  <SlideshowType>0</SlideshowType>
+  <InContest>0</InContest>
+{detailed}</Slideshow>
+"""
+
+DETAILED = """  <UserID>{user}</UserID>
+  <PPTLocation>slideshow-{id}</PPTLocation>
+  <StrippedTitle>slideshow-{id}</StrippedTitle>
+  <Tags>
+{tags}  </Tags>
+  <Audio>0</Audio>
+  <NumDownloads>{downloads}</NumDownloads>
+  <NumViews>{views}</NumViews>
+  <NumComments>3</NumComments>
+  <NumFavorites>12</NumFavorites>
+  <NumSlides>42</NumSlides>
+  <RelatedSlideshows>
+{related}  </RelatedSlideshows>
+  <PrivacyLevel>0</PrivacyLevel>
+  <FlagVisible>1</FlagVisible>
+  <ShowOnSS>1</ShowOnSS>
+  <SecretURL>0</SecretURL>
+  <AllowEmbed>1</AllowEmbed>
+  <ShareWithContacts>0</ShareWithContacts>
+"""
+
+TAG = '    <Tag Count="{count}" Owner="1">tag{tag}</Tag>\n'
+RELATED = '    <RelatedSlideshowID rank="{rank}">{id}</RelatedSlideshowID>\n'
+
+
+def slideshow(slideshow_id, detailed=False, description_size=200):
+    """ Returns XML of a single slideshow element """
+    extra = ""
+    if detailed:
+        extra = DETAILED.format(
+            id=slideshow_id, user=slideshow_id % 97,
+            downloads=slideshow_id * 3, views=slideshow_id * 17,
+            tags="".join(TAG.format(count=i + 1, tag=i) for i in range(8)),
+            related="".join(RELATED.format(rank=i + 1, id=slideshow_id + i)
+                            for i in range(10)))
+    embed = escape('<iframe src="https://www.slideshare.net/slideshow/'
+                   'embed_code/key/{}" width="427" height="356"></iframe>'
+                   .format(slideshow_id))
+    return SLIDESHOW.format(
+        id=slideshow_id, user=slideshow_id % 97,
+        title="Slideshow &amp; title #{}".format(slideshow_id),
+        description=("lorem ipsum " * description_size)[:description_size],
+        embed=embed, detailed=extra)
+
+
+def get_slideshow(slideshow_id=1, detailed=False, description_size=200):
+    return slideshow(slideshow_id, detailed,
+                     description_size).encode("utf-8")
+
+
+def get_slideshows_by_tag(tag="python", count=1000, limit=10, offset=0,
+                          detailed=False, description_size=200):
+    items = "".join(slideshow(i, detailed, description_size)
+                    for i in range(offset + 1,
+                                   min(offset + limit, count) + 1))
+    return "<Tag>\n  <Name>{}</Name>\n  <Count>{}</Count>\n{}</Tag>\n".format(
+        tag, count, items).encode("utf-8")
+
+
+def get_slideshows_by_user(username_for="user", count=1000, limit=10,
+                           offset=0, detailed=False, description_size=200):
+    items = "".join(slideshow(i, detailed, description_size)
+                    for i in range(offset + 1,
+                                   min(offset + limit, count) + 1))
+    return ("<User>\n  <Name>{}</Name>\n  <Count>{}</Count>\n{}</User>\n"
+            .format(username_for, count, items).encode("utf-8"))
+
+
+def get_slideshows_by_group(group_name="group", count=1000, limit=10,
+                            offset=0, detailed=False, description_size=200):
+    items = "".join(slideshow(i, detailed, description_size)
+                    for i in range(offset + 1,
+                                   min(offset + limit, count) + 1))
+    return ("<Group>\n  <Name>{}</Name>\n  <Count>{}</Count>\n{}</Group>\n"
+            .format(group_name, count, items).encode("utf-8"))
+
+
+def get_user_groups(count=3):
+    groups = "".join(
+        "  <Group>\n    <Name>Group {0}</Name>\n"
+        "    <NumPosts>{0}</NumPosts>\n    <NumMembers>{0}</NumMembers>\n"
+        "    <Created>Mon Mar 01 10:00:00 -0600 2010</Created>\n"
+        "    <QueryName>group-{0}</QueryName>\n"
+        "    <URL>https://www.slideshare.net/group/group-{0}</URL>\n"
+        "  </Group>\n".format(i) for i in range(1, count + 1))
+    return "<Groups>\n{}</Groups>\n".format(groups).encode("utf-8")
+
+
+def get_user_contacts(count=3, limit=10, offset=0):
+    contacts = "".join(
+        "  <Contact>\n    <Username>user{0}</Username>\n"
+        "    <NumSlideshows>{0}</NumSlideshows>\n"
+        "    <NumComments>{0}</NumComments>\n  </Contact>\n".format(i)
+        for i in range(offset + 1, min(offset + limit, count) + 1))
+    return "<Contacts>\n{}</Contacts>\n".format(contacts).encode("utf-8")
+
+
+def get_user_tags(count=3):
+    tags = "".join('  <Tag Count="{0}">tag{0}</Tag>\n'.format(i)
+                   for i in range(1, count + 1))
+    return "<Tags>\n{}</Tags>\n".format(tags).encode("utf-8")
+
+
+def search_slideshows(q="python", total=1000, page=1, items_per_page=12,
+                      detailed=False, description_size=200):
+    offset = (page - 1) * items_per_page
+    ids = range(offset + 1, min(offset + items_per_page, total) + 1)
+    items = "".join(slideshow(i, detailed, description_size) for i in ids)
+    return ("<Slideshows>\n  <Meta>\n    <Query>{}</Query>\n"
+            "    <ResultOffset>{}</ResultOffset>\n"
+            "    <NumResults>{}</NumResults>\n"
+            "    <TotalResults>{}</TotalResults>\n  </Meta>\n{}</Slideshows>\n"
+            .format(q, offset, len(ids), total, items).encode("utf-8"))
+
+
+def upload_slideshow(slideshow_id):
+    return ("<SlideShowUploaded>\n  <SlideShowID>{}</SlideShowID>\n"
+            "</SlideShowUploaded>\n".format(slideshow_id)).encode("utf-8")
+
+
+def edit_slideshow(slideshow_id):
+    return ("<SlideShowEdited>\n  <SlideShowID>{}</SlideShowID>\n"
+            "</SlideShowEdited>\n".format(slideshow_id)).encode("utf-8")
+
+
+def delete_slideshow(slideshow_id):
+    return ("<SlideShowDeleted>\n  <SlideShowID>{}</SlideShowID>\n"
+            "</SlideShowDeleted>\n".format(slideshow_id)).encode("utf-8")
+
+
+def error(errno=9, message="SlideShow Not Found"):
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<SlideShareServiceError>\n'
+            '  <Message ID="{}">{}</Message>\n'
+            '</SlideShareServiceError>\n'.format(errno, message)
+            ).encode("utf-8")
@@ -0,0 +1,323 @@
+""" Local stand-in of the SlideShare API for offline tests and benchmarks.
+
+Serves realistic responses of `get_slideshow`, listings, user groups,
+contacts and tags, `upload_slideshow`, `edit_slideshow` and
+`delete_slideshow`, checks request signatures and
+simulates network latency and transient server errors::
+
+    with FakeSlideShare(latency=0.02) as server:
+        client = SlideShareAPI("key", "secret")
+        client.BASE_URL = server.url
+
+`FakeAdapter` is the in-process counterpart for tests and benchmarks
+which need no sockets, responses are produced by a callable::
+
+    client.mount("https://", FakeAdapter(lambda endpoint, params: body))
+
+May be started standalone as well::
+
+    python -m tests.server --port 8000 --latency 0.05
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import argparse
+import hashlib
+import io
+import multiprocessing
+import random
+import threading
+import time
+
+import six
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import parse_qsl, urlparse
+
+from tests import samples
+
+API_KEY = "key"
+SHARED_SECRET = "secret"
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn,
+                          BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    # Benchmarks open many connections at once
+    request_queue_size = 128
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    # Keep-alive connections like the real service
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, Nagle's algorithm would
+    # delay the body until the client acknowledges the headers
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_api(self.read_body())
+
+    def do_POST(self):
+        self.handle_api(self.read_body())
+
+    def read_body(self):
+        """ Reads and discards request body, returns its length """
+        length = int(self.headers.get("Content-Length") or 0)
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 64 * 1024))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        return length
+
+    def handle_api(self, body_size):
+        config = self.server.config
+        url = urlparse(self.path)
+        endpoint = url.path.strip("/").split("/")[-1]
+        params = dict(parse_qsl(url.query))
+        config.count(endpoint, body_size)
+        if config.latency:
+            time.sleep(config.delay())
+        status, content = config.respond(endpoint, params)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class FakeSlideShare(object):
+    """ Fake SlideShare API server running in a background thread or
+    process
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 description_size=200, detailed=False, count=1000,
+                 error_rate=0.0, missing=(), seed=0, process=False):
+        """
+        Args:
+            host (string): interface to listen on. Defaults to 127.0.0.1.
+            port (int): port, random free one by default.
+            latency (float): response delay in seconds. Defaults to 0.
+            jitter (float):
+                Max random addition to the latency in seconds. Defaults to 0.
+            description_size (int):
+                Length of slideshow descriptions, controls payload size.
+                Defaults to 200.
+            detailed (boolean):
+                Include tags, related slideshows and statistics in
+                slideshows even if not requested. Defaults to False.
+            count (int):
+                Total number of slideshows in listings. Defaults to 1000.
+            error_rate (float):
+                Share of requests failed with HTTP 503, which clients
+                retry and count as circuit breaker failures. Defaults to 0.
+            missing (set):
+                Ids of slideshows which are not found.
+            seed (int):
+                Seed of jitter and errors, for reproducible runs.
+            process (boolean):
+                Serve from a forked process instead of a thread, so the
+                server doesn't affect memory and CPU measurements of the
+                client. Request counters are not available then.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.description_size = description_size
+        self.detailed = detailed
+        self.total = count
+        self.error_rate = error_rate
+        self.missing = set(str(slideshow_id) for slideshow_id in missing)
+        self.requests = {}
+        self.request_bytes = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._uploaded = 0
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.config = self
+        self.process = process
+        self._thread = None
+        self._process = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return "http://{}:{}/".format(host, port)
+
+    def start(self):
+        if self.process:
+            context = multiprocessing.get_context("fork")
+            self._process = context.Process(target=self.server.serve_forever)
+            self._process.daemon = True
+            self._process.start()
+        else:
+            self._thread = threading.Thread(target=self.server.serve_forever)
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+        else:
+            self.server.shutdown()
+            if self._thread is not None:
+                self._thread.join()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count(self, endpoint, body_size):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.request_bytes += body_size
+
+    def delay(self):
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def failed(self):
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def respond(self, endpoint, params):
+        """ Returns HTTP status and body of the response """
+        if params.get("api_key") != API_KEY:
+            return 200, samples.error(0, "No API Key Provided")
+        expected = hashlib.sha1((SHARED_SECRET + params.get("ts", ""))
+                                .encode("utf-8")).hexdigest()
+        if params.get("hash") != expected:
+            return 200, samples.error(1, "Failed API validation")
+        if self.failed():
+            return 503, b"Service Unavailable"
+        detailed = self.detailed or params.get("detailed") == "1"
+        size = self.description_size
+        limit = int(params.get("limit", 10))
+        offset = int(params.get("offset", 0))
+        if endpoint == "get_slideshow":
+            slideshow_id = params.get("slideshow_id", "1")
+            if slideshow_id in self.missing or not slideshow_id.isdigit():
+                return 200, samples.error(9, "SlideShow Not Found")
+            return 200, samples.get_slideshow(int(slideshow_id), detailed,
+                                              size)
+        if endpoint == "get_slideshows_by_tag":
+            return 200, samples.get_slideshows_by_tag(
+                params.get("tag", ""), self.total, limit, offset, detailed,
+                size)
+        if endpoint == "get_slideshows_by_user":
+            return 200, samples.get_slideshows_by_user(
+                params.get("username_for", ""), self.total, limit, offset,
+                detailed, size)
+        if endpoint == "get_slideshows_by_group":
+            return 200, samples.get_slideshows_by_group(
+                params.get("group_name", ""), self.total, limit, offset,
+                detailed, size)
+        if endpoint == "get_user_groups":
+            return 200, samples.get_user_groups()
+        if endpoint == "get_user_contacts":
+            return 200, samples.get_user_contacts(limit=limit, offset=offset)
+        if endpoint == "get_user_tags":
+            return 200, samples.get_user_tags()
+        if endpoint == "search_slideshows":
+            return 200, samples.search_slideshows(
+                params.get("q", ""), self.total, int(params.get("page", 1)),
+                int(params.get("items_per_page", 12)), detailed, size)
+        if endpoint == "upload_slideshow":
+            with self._lock:
+                self._uploaded += 1
+                slideshow_id = self.total + self._uploaded
+            return 200, samples.upload_slideshow(slideshow_id)
+        if endpoint == "edit_slideshow":
+            return 200, samples.edit_slideshow(params.get("slideshow_id"))
+        if endpoint == "delete_slideshow":
+            return 200, samples.delete_slideshow(params.get("slideshow_id"))
+        return 404, b"Not Found"
+
+
+class FakeAdapter(BaseAdapter):
+    """ Transport adapter answering requests of `SlideShareAPI` in process.
+
+    `respond` is called with the endpoint and the query parameters of
+    every request and returns the response body or a tuple of HTTP status
+    and body. Exceptions it raises fail the request like transport errors
+    do, e.g. `requests.exceptions.ConnectionError`. Bytes or text instead
+    of a callable are served to every request. Sent requests are kept in
+    `requests`.
+    """
+
+    def __init__(self, respond=b"<Response/>"):
+        super(FakeAdapter, self).__init__()
+        if not callable(respond):
+            body = respond
+            respond = lambda endpoint, params: body  # noqa: E731
+        self.respond = respond
+        self.requests = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def query(request):
+        """ Returns endpoint and query parameters of the request """
+        url = urlparse(request.url)
+        return url.path.rstrip("/").rsplit("/", 1)[-1], dict(
+            parse_qsl(url.query))
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.requests.append(request)
+        result = self.respond(*self.query(request))
+        status, body = result if isinstance(result, tuple) else (200, result)
+        if isinstance(body, six.text_type):
+            body = body.encode("utf-8")
+        response = Response()
+        response.request = request
+        response.url = request.url
+        response.connection = self
+        response.status_code = status
+        response.reason = "OK" if status == 200 else "Error"
+        response.headers = CaseInsensitiveDict(
+            {"Content-Type": "application/xml; charset=utf-8",
+             "Content-Length": str(len(body))})
+        response.encoding = "utf-8"
+        # Read by both buffered and streamed responses
+        response.raw = io.BytesIO(body)
+        return response
+
+    def close(self):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--description-size", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = FakeSlideShare(args.host, args.port, latency=args.latency,
+                            jitter=args.jitter,
+                            description_size=args.description_size,
+                            error_rate=args.error_rate)
+    print("Serving on {} (api_key={}, shared_secret={})".format(
+        server.url, API_KEY, SHARED_SECRET))
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
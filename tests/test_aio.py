@@ -0,0 +1,152 @@
+import asyncio
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from slideshare.breaker import OPEN, CircuitBreaker
+from slideshare.cache import MemoryCache
+from slideshare.exceptions import (CircuitOpenError, RateLimitExceeded,
+                                   SlideShareError)
+from slideshare.metrics import InMemoryMetrics
+from slideshare.models import Slideshow, SlideshowList
+from slideshare.ratelimit import RateLimiter
+from slideshare.retry import RetryPolicy
+from slideshare.tracing import CallbackExporter, Tracer
+
+pytest.importorskip("aiohttp")
+
+from slideshare import aio  # noqa: E402
+from tests.server import FakeSlideShare
+
+
+@pytest.fixture
+def server():
+    with FakeSlideShare(count=25, missing=[3], latency=0.01) as server:
+        yield server
+
+
+def make_client(url, **options):
+    client = aio.AsyncSlideShareAPI("key", "secret", **options)
+    client.BASE_URL = url
+    return client
+
+
+def run(url, main, **options):
+    """ Runs `main(client)` with the client of the given URL in a new loop
+    """
+    async def wrapper():
+        async with make_client(url, **options) as client:
+            return await main(client)
+    return asyncio.run(wrapper())
+
+
+def closed_port_url():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return "http://127.0.0.1:{}/".format(port)
+
+
+def test_get_slideshow(server):
+    async def main(client):
+        slideshow = await client.get_slideshow(slideshow_id=1)
+        with pytest.raises(SlideShareError) as e:
+            await client.get_slideshow(slideshow_id=3)
+        batch = await client.get_slideshows([4, 3, 5], max_workers=2)
+        return slideshow, e.value, batch
+
+    slideshow, error, batch = run(server.url, main)
+    assert slideshow["Slideshow"]["ID"] == "1"
+    assert error.errno == "9"
+    assert batch[0]["Slideshow"]["ID"] == "4"
+    assert isinstance(batch[1], SlideShareError)
+    assert batch[2]["Slideshow"]["ID"] == "5"
+
+
+def test_listings(server):
+    async def main(client):
+        iterated = [slideshow async for slideshow in
+                    client.iter_slideshows_by_tag("python", per_page=10)]
+        streamed = [slideshow async for slideshow in client.stream_listing(
+            "get_slideshows_by_user", username_for="user", limit=25)]
+        limited = [slideshow async for slideshow in
+                   client.iter_search_slideshows("python", per_page=5,
+                                                 limit=7)]
+        return iterated, streamed, limited
+
+    iterated, streamed, limited = run(server.url, main, models=True)
+    assert [s.id for s in iterated] == list(range(1, 26))
+    assert [s.id for s in streamed] == list(range(1, 26))
+    assert [s.id for s in limited] == list(range(1, 8))
+    assert server.requests["search_slideshows"] == 2
+    assert server.requests["get_slideshows_by_tag"] == 3
+
+
+def test_cache_and_coalescing(server):
+    async def main(client):
+        first = await asyncio.gather(
+            *[client.get_slideshows_by_tag("python") for _ in range(5)])
+        return first, await client.get_slideshows_by_tag("python")
+
+    first, cached = run(server.url, main, models=True, cache=MemoryCache())
+    assert server.requests["get_slideshows_by_tag"] == 1
+    assert all(isinstance(result, SlideshowList) for result in first)
+    # Waiters get copies of the result
+    assert len(set(map(id, first))) == 5
+    assert cached == first[0]
+
+
+def test_retry_and_circuit_breaker():
+    policy = RetryPolicy(max_attempts=5, backoff=0)
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+    metrics = InMemoryMetrics()
+
+    async def main(client):
+        with pytest.raises(CircuitOpenError):
+            await client.get_slideshow(slideshow_id=1)
+        # Requests are rejected without connecting
+        with pytest.raises(CircuitOpenError):
+            await client.get_slideshow(slideshow_id=1)
+
+    run(closed_port_url(), main, retry_policy=policy,
+        circuit_breaker=breaker, metrics=metrics)
+    # Two failed attempts open the circuit, the third one is rejected
+    assert policy.stats()["get_slideshow"] == {
+        "calls": 2, "attempts": 4, "retries": 2, "exhausted": 1}
+    assert breaker.state("get_slideshow") == OPEN
+    assert breaker.stats()["get_slideshow"]["rejected"] == 2
+    assert metrics.stats()["get_slideshow"]["requests"] == 2
+
+
+def test_rate_limit_and_tracing(server):
+    spans = []
+    limiter = RateLimiter(per_day=1, block=False)
+
+    async def main(client):
+        await client.get_slideshow(slideshow_id=1)
+        with pytest.raises(RateLimitExceeded):
+            await client.get_slideshow(slideshow_id=2)
+
+    run(server.url, main, rate_limiter=limiter,
+        tracer=Tracer(CallbackExporter(spans.append)))
+    assert server.requests["get_slideshow"] == 1
+    names = [span.name for span in spans]
+    assert names[:5] == ["rate_limit", "sign", "network", "parse",
+                         "get_slideshow"]
+    assert spans[-1].error.startswith("RateLimitExceeded")
+
+
+def test_parse_pool(server):
+    async def main(client):
+        slideshow = await client.get_slideshow(slideshow_id=1)
+        with pytest.raises(SlideShareError):
+            await client.get_slideshow(slideshow_id=3)
+        return slideshow
+
+    with ThreadPoolExecutor(1) as pool:
+        slideshow = run(server.url, main, models=True, parse_pool=pool,
+                        parse_pool_min_size=0)
+    assert isinstance(slideshow, Slideshow)
+    assert slideshow.id == 1
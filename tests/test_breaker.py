@@ -0,0 +1,136 @@
+import pytest
+from requests.exceptions import ConnectionError
+
+from slideshare import breaker as breaker_module
+from slideshare.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from slideshare.exceptions import CircuitOpenError, RateLimitExceeded
+from slideshare.metrics import InMemoryMetrics
+from slideshare.ratelimit import RateLimiter
+from slideshare.retry import RetryPolicy
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(breaker_module, "_clock", clock)
+    return clock
+
+
+class Flaky(object):
+    """ Fails requests with connection error while `down` is set """
+
+    def __init__(self):
+        self.down = True
+        self.sent = 0
+
+    def __call__(self, endpoint, params):
+        self.sent += 1
+        if self.down:
+            raise ConnectionError("connection refused")
+        return b"<Slideshow><ID>1</ID></Slideshow>"
+
+
+def test_consecutive_failures_open_circuit(clock, fake_client):
+    metrics = InMemoryMetrics()
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=10,
+                             metrics=metrics)
+    adapter = Flaky()
+    client, _ = fake_client(adapter, circuit_breaker=breaker,
+                            retry_policy=RetryPolicy(max_attempts=5,
+                                                     backoff=0))
+
+    # Retries stop as soon as the circuit opens
+    with pytest.raises(CircuitOpenError) as e:
+        client.get_slideshow(1)
+    assert adapter.sent == 3
+    assert e.value.retry_after == 10
+    assert breaker.state("get_slideshow") == OPEN
+    with pytest.raises(CircuitOpenError):
+        client.get_slideshow(1)
+    assert adapter.sent == 3
+    # Other endpoints have circuits of their own
+    with pytest.raises(CircuitOpenError):
+        client.get_slideshows_by_tag("python")
+    assert adapter.sent == 6
+
+    clock.now += 10
+    assert breaker.state("get_slideshow") == HALF_OPEN
+    # Failed trial request opens the circuit again
+    with pytest.raises(CircuitOpenError):
+        client.get_slideshow(1)
+    assert adapter.sent == 7
+    assert breaker.state("get_slideshow") == OPEN
+
+    clock.now += 10
+    adapter.down = False
+    assert client.get_slideshow(1)["Slideshow"]["ID"] == "1"
+    assert breaker.state("get_slideshow") == CLOSED
+    stats = breaker.stats()["get_slideshow"]
+    assert stats["opened"] == 2
+    assert stats["rejected"] == 3
+    assert metrics.circuit_stats()["get_slideshow"] == {
+        "state": CLOSED,
+        "transitions": {OPEN: 2, HALF_OPEN: 2, CLOSED: 1}}
+
+
+def test_error_rate_opens_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=100, error_rate=0.5,
+                             window=10, min_requests=10)
+    for success in [True, False] * 4 + [True]:
+        breaker.allow("upload_slideshow")
+        breaker.record("upload_slideshow", success)
+    assert breaker.state("upload_slideshow") == CLOSED
+    breaker.allow("upload_slideshow")
+    breaker.record("upload_slideshow", False)
+    assert breaker.state("upload_slideshow") == OPEN
+
+
+def test_half_open_limits_probes(clock):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=1,
+                             half_open_requests=2)
+    breaker.allow("get_slideshow")
+    breaker.record("get_slideshow", False)
+    clock.now += 1
+    breaker.allow("get_slideshow")
+    breaker.allow("get_slideshow")
+    with pytest.raises(CircuitOpenError):
+        breaker.allow("get_slideshow")
+    breaker.record("get_slideshow", True)
+    assert breaker.state("get_slideshow") == HALF_OPEN
+    breaker.record("get_slideshow", True)
+    assert breaker.state("get_slideshow") == CLOSED
+
+
+def test_requests_without_outcome_keep_circuit_half_open(clock,
+                                                         fake_client):
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=1)
+    limiter = RateLimiter(per_day=1, block=False)
+    adapter = Flaky()
+    client, _ = fake_client(adapter, circuit_breaker=breaker,
+                            rate_limiter=limiter)
+    with pytest.raises(ConnectionError):
+        client.get_slideshow(1)
+    clock.now += 1
+    # Rejected by the rate limiter before reaching the endpoint
+    with pytest.raises(RateLimitExceeded):
+        client.get_slideshow(1)
+    assert adapter.sent == 1
+    assert breaker.state("get_slideshow") == HALF_OPEN
+
+    # Interrupted trial request frees its slot without an outcome
+    breaker.allow("get_slideshow")
+    breaker.release("get_slideshow")
+    with pytest.raises(KeyboardInterrupt):
+        with breaker.guard("get_slideshow"):
+            raise KeyboardInterrupt()
+    assert breaker.state("get_slideshow") == HALF_OPEN
+    breaker.call("get_slideshow", lambda: None)
+    assert breaker.state("get_slideshow") == CLOSED
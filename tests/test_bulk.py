@@ -0,0 +1,85 @@
+import io
+import json
+import re
+
+from slideshare.bulk import BulkUploader, Journal
+from tests import samples
+
+
+class Uploads(object):
+    """ Responds to uploads with consecutive ids, fails `broken` files """
+
+    def __init__(self):
+        self.adapter = None
+        self.titles = []
+
+    def __call__(self, endpoint, params):
+        # Title is sent in the multipart body of the latest request
+        body = self.adapter.requests[-1].body.read()
+        title = re.search(b'name="slideshow_title"\r\n\r\n(.*?)\r\n',
+                          body).group(1).decode("utf-8")
+        self.titles.append(title)
+        slideshow_id = len(self.titles)
+        if title == "broken":
+            return samples.error(0, "No Api Validation")
+        return ("<SlideShowUploaded><SlideShowID>{}</SlideShowID>"
+                "</SlideShowUploaded>".format(slideshow_id))
+
+
+def read_journal(path):
+    with io.open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_upload_directory_resumes(tmpdir, fake_client):
+    library = tmpdir.mkdir("library")
+    for name in ("a.pdf", "b.ppt", "broken.pdf", "notes.txt"):
+        library.join(name).write_binary(b"0123456789")
+    journal_path = tmpdir.join("upload.journal").strpath
+    uploads = Uploads()
+    client, uploads.adapter = fake_client(uploads, username="user",
+                                          password="password")
+    reported = []
+    uploader = BulkUploader(client, journal_path, max_workers=1,
+                            callback=lambda p: reported.append(p.uploaded))
+
+    progress = uploader.upload_directory(library.strpath)
+    assert uploads.titles == ["a", "b", "broken"]
+    assert (progress.total, progress.uploaded, progress.skipped,
+            progress.failed, progress.bytes) == (3, 2, 0, 1, 20)
+    assert reported == [1, 2, 2]
+    records = read_journal(journal_path)
+    assert len(records) == 3
+    failed = [r for r in records if r["path"].endswith("broken.pdf")][0]
+    assert "slideshow_id" not in failed
+    assert failed["error"]
+
+    # Uploaded files are skipped, the failed one is retried
+    progress = uploader.upload_directory(library.strpath)
+    assert uploads.titles[3:] == ["broken"]
+    assert (progress.uploaded, progress.skipped, progress.failed) == \
+        (0, 2, 1)
+
+
+def test_journal_ignores_incomplete_line(tmpdir):
+    path = tmpdir.join("upload.journal").strpath
+    journal = Journal(path)
+    journal.write({"path": "/a.pdf", "slideshow_id": "1"})
+    journal.write({"path": "/b.pdf", "error": "failed"})
+    journal.close()
+    # Crash in the middle of the write
+    with io.open(path, "a", encoding="utf-8") as f:
+        f.write('{"path": "/c.pdf", "slides')
+
+    journal = Journal(path)
+    assert "/a.pdf" in journal
+    assert "/b.pdf" not in journal
+    assert "/c.pdf" not in journal
+    journal.write({"path": "/d.pdf", "slideshow_id": "2"})
+    journal.close()
+
+    # Record written after the crash is not glued to the incomplete line
+    journal = Journal(path)
+    assert journal.uploaded == {"/a.pdf": "1", "/d.pdf": "2"}
+    journal.close()
+    assert len(read_journal(path)) == 3
@@ -0,0 +1,171 @@
+import time
+
+import pytest
+
+from slideshare.cache import MemoryCache, SQLiteCache, cache_key
+from tests import samples
+
+SLIDESHOW = {"Slideshow": {"ID": "42", "Title": "Title"}}
+TAG = {"Tag": {"Name": "tag", "Count": "2",
+               "Slideshow": [{"ID": "42"}, {"ID": "43"}]}}
+
+
+def test_cache_key_ignores_volatile_params():
+    assert (cache_key("get_slideshow", {"slideshow_id": 42, "ts": 1,
+                                        "hash": "a", "api_key": "b"}) ==
+            cache_key("get_slideshow", {"slideshow_id": 42, "ts": 2,
+                                        "hash": "c", "api_key": "b"}))
+    assert (cache_key("get_slideshow", {"slideshow_id": 42}) !=
+            cache_key("get_slideshow", {"slideshow_id": 43}))
+
+
+def test_memory_cache_hit_and_miss():
+    cache = MemoryCache()
+    assert cache.get("get_slideshow", {"slideshow_id": 42}) is None
+    cache.set("get_slideshow", {"slideshow_id": 42}, b"", SLIDESHOW)
+    assert cache.get("get_slideshow", {"slideshow_id": 42}) == SLIDESHOW
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_cache_ttl():
+    cache = MemoryCache(ttl=300, ttls={"get_slideshows_by_tag": 0})
+    cache.set("get_slideshows_by_tag", {"tag": "tag"}, b"", TAG)
+    assert cache.get("get_slideshows_by_tag", {"tag": "tag"}) is None
+    cache = MemoryCache(ttl=-1)
+    cache.set("get_slideshow", {"slideshow_id": 42}, b"", SLIDESHOW)
+    assert cache.get("get_slideshow", {"slideshow_id": 42}) is None
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(maxsize=2)
+    for slideshow_id in (1, 2):
+        cache.set("get_slideshow", {"slideshow_id": slideshow_id}, b"",
+                  SLIDESHOW)
+    # Touch first entry, so the second one will be evicted
+    assert cache.get("get_slideshow", {"slideshow_id": 1}) is not None
+    cache.set("get_slideshow", {"slideshow_id": 3}, b"", SLIDESHOW)
+    assert cache.get("get_slideshow", {"slideshow_id": 2}) is None
+    assert cache.get("get_slideshow", {"slideshow_id": 1}) is not None
+    assert len(cache) == 2
+
+
+def test_memory_cache_invalidate():
+    cache = MemoryCache()
+    cache.set("get_slideshow", {"slideshow_id": 42}, b"", SLIDESHOW)
+    cache.set("get_slideshows_by_tag", {"tag": "tag"}, b"", TAG)
+    cache.invalidate(42)
+    assert cache.get("get_slideshow", {"slideshow_id": 42}) is None
+    assert cache.get("get_slideshows_by_tag", {"tag": "tag"}) is None
+
+
+def test_sqlite_cache_persistence(tmpdir):
+    path = tmpdir.join("cache.sqlite").strpath
+    content = b"<Slideshow><ID>42</ID><Title>Title</Title></Slideshow>"
+    cache = SQLiteCache(path)
+    cache.set("get_slideshow", {"slideshow_id": 42}, content, SLIDESHOW)
+    cache = SQLiteCache(path)
+    assert cache.get("get_slideshow", {"slideshow_id": 42}) == SLIDESHOW
+    cache.invalidate(42)
+    assert cache.get("get_slideshow", {"slideshow_id": 42}) is None
+
+
+def test_sqlite_cache_max_size(tmpdir):
+    content = b"<Slideshow><ID>42</ID><Title>Title</Title></Slideshow>"
+    cache = SQLiteCache(tmpdir.join("cache.sqlite").strpath,
+                        max_size=len(content) * 2)
+    for slideshow_id in (1, 2, 3):
+        cache.set("get_slideshow", {"slideshow_id": slideshow_id}, content,
+                  SLIDESHOW)
+    assert cache.get("get_slideshow", {"slideshow_id": 1}) is None
+    assert cache.get("get_slideshow", {"slideshow_id": 3}) == SLIDESHOW
+    assert cache.stats()["size"] == 2
+
+
+def test_sqlite_cache_drops_index_of_expired(tmpdir):
+    content = b"<Slideshow><ID>42</ID><Title>Title</Title></Slideshow>"
+    cache = SQLiteCache(tmpdir.join("cache.sqlite").strpath,
+                        ttls={"get_slideshows_by_tag": 0.001})
+    # Expired responses are removed with every write
+    cache.trim_interval = 1
+    cache.set("get_slideshows_by_tag", {"tag": "tag"}, content, TAG)
+    time.sleep(0.01)
+    cache.set("get_slideshow", {"slideshow_id": 42}, content, SLIDESHOW)
+    rows = cache._connection().execute(
+        "SELECT slideshow_id, key FROM slideshows").fetchall()
+    assert rows == [("42", cache_key("get_slideshow",
+                                     {"slideshow_id": 42}))]
+
+
+def test_sqlite_cache_trims_by_running_size(tmpdir, monkeypatch):
+    content = b"<Slideshow><ID>42</ID><Title>Title</Title></Slideshow>"
+    path = tmpdir.join("cache.sqlite").strpath
+    cache = SQLiteCache(path, max_size=len(content) * 5)
+    cache.trim_interval = 10
+    trims = []
+    trim = cache._trim
+    monkeypatch.setattr(cache, "_trim",
+                        lambda db: trims.append(db) or trim(db))
+    for slideshow_id in range(1, 4):
+        cache.set("get_slideshow", {"slideshow_id": slideshow_id}, content,
+                  SLIDESHOW)
+    # Size is computed on the first write, then kept in memory
+    assert len(trims) == 1
+    # Replaced response is not counted twice
+    cache.set("get_slideshow", {"slideshow_id": 3}, content, SLIDESHOW)
+    assert len(trims) == 1
+    assert cache._size == len(content) * 3
+
+    # Writes of another process are counted once the estimate exceeds
+    # the limit
+    other = SQLiteCache(path, max_size=len(content) * 5)
+    for slideshow_id in range(4, 7):
+        other.set("get_slideshow", {"slideshow_id": slideshow_id}, content,
+                  SLIDESHOW)
+    for slideshow_id in range(7, 11):
+        cache.set("get_slideshow", {"slideshow_id": slideshow_id}, content,
+                  SLIDESHOW)
+    assert len(trims) == 3
+    assert cache.stats()["size"] == 5
+    assert cache._size == len(content) * 5
+
+
+def catalog(endpoint, params):
+    if endpoint == "get_slideshows_by_tag":
+        return samples.get_slideshows_by_tag(count=3, limit=3)
+    slideshow_id = int(params["slideshow_id"])
+    return getattr(samples, endpoint)(slideshow_id)
+
+
+@pytest.mark.parametrize("make_cache", [
+    lambda tmpdir: MemoryCache(),
+    lambda tmpdir: SQLiteCache(tmpdir.join("cache.sqlite").strpath),
+], ids=["memory", "sqlite"])
+def test_client_invalidates_changed_slideshows(tmpdir, fake_client,
+                                               make_cache):
+    client, adapter = fake_client(catalog, cache=make_cache(tmpdir),
+                                  username="user", password="password")
+
+    def requests(endpoint):
+        return [request for request in adapter.requests
+                if adapter.query(request)[0] == endpoint]
+
+    for _ in range(2):
+        client.get_slideshow(slideshow_id=1)
+        client.get_slideshow(slideshow_id=2)
+        client.get_slideshows_by_tag("python")
+    assert len(adapter.requests) == 3
+
+    client.edit_slideshow(1, slideshow_title="New title")
+    client.get_slideshow(slideshow_id=1)
+    client.get_slideshow(slideshow_id=2)
+    client.get_slideshows_by_tag("python")
+    # Listing with the edited slideshow is dropped too
+    assert len(requests("get_slideshow")) == 3
+    assert len(requests("get_slideshows_by_tag")) == 2
+
+    client.delete_slideshow(2)
+    client.get_slideshow(slideshow_id=1)
+    client.get_slideshow(slideshow_id=2)
+    assert len(requests("get_slideshow")) == 4
+    assert len(requests("get_slideshows_by_tag")) == 2
@@ -0,0 +1,143 @@
+import itertools
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from slideshare import client as client_module
+from slideshare.cache import MemoryCache
+from slideshare.client import SlideShareAPI
+from slideshare.exceptions import SlideShareError
+from slideshare.metrics import InMemoryMetrics
+from slideshare.models import Slideshow
+from tests import samples
+from tests.server import FakeSlideShare
+
+
+def test_get_slideshows_keeps_order(fake_client):
+    def respond(endpoint, params):
+        slideshow_id = int(params["slideshow_id"])
+        # Earlier slideshows are answered later
+        time.sleep((5 - slideshow_id) * 0.01)
+        if slideshow_id == 3:
+            return samples.error()
+        return samples.get_slideshow(slideshow_id)
+
+    client, adapter = fake_client(respond)
+    results = client.get_slideshows([1, 2, 3, 4], max_workers=4)
+    assert [results[i]["Slideshow"]["ID"] for i in (0, 1, 3)] == \
+        ["1", "2", "4"]
+    # The failed lookup takes its slot instead of aborting the batch
+    assert isinstance(results[2], SlideShareError)
+    assert results[2].errno == "9"
+    assert len(adapter.requests) == 4
+    assert client.get_slideshows([]) == []
+
+
+def test_parse_pool(fake_client):
+    def respond(endpoint, params):
+        if params["slideshow_id"] == "3":
+            return samples.error()
+        return samples.get_slideshow(int(params["slideshow_id"]))
+
+    with ProcessPoolExecutor(1) as pool:
+        client, adapter = fake_client(respond, models=True,
+                                      cache=MemoryCache(), parse_pool=pool,
+                                      parse_pool_min_size=0)
+        slideshow = client.get_slideshow(slideshow_id=1)
+        # Mapping parsed in the worker is kept for the cache
+        assert client.get_slideshow(slideshow_id=1) == slideshow
+        with pytest.raises(SlideShareError) as e:
+            client.get_slideshow(slideshow_id=3)
+
+        client, _ = fake_client(respond, parse_pool=pool,
+                                parse_pool_min_size=0)
+        response = client.get_slideshow(slideshow_id=2)
+
+    assert isinstance(slideshow, Slideshow)
+    assert slideshow.id == 1
+    assert len(adapter.requests) == 2
+    assert e.value.errno == "9"
+    assert response["Slideshow"]["ID"] == "2"
+
+
+def test_connection_reuse_and_keepalive():
+    with FakeSlideShare(count=25) as server:
+        client = SlideShareAPI("key", "secret", keepalive=30)
+        client.BASE_URL = server.url
+        for slideshow_id in (1, 2, 3):
+            client.get_slideshow(slideshow_id=slideshow_id)
+        assert client.adapter.stats() == {"new_connections": 1,
+                                          "reused_connections": 2}
+
+        pools = client.adapter.poolmanager.pools
+        sockets = [conn.sock for key in pools.keys()
+                   for conn in pools[key].pool.queue
+                   if conn is not None and conn.sock is not None]
+        assert len(sockets) == 1
+        assert sockets[0].getsockopt(socket.SOL_SOCKET,
+                                     socket.SO_KEEPALIVE)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            assert sockets[0].getsockopt(socket.IPPROTO_TCP,
+                                         socket.TCP_KEEPIDLE) == 30
+        client.close()
+
+
+def test_signing_keeps_session_params(fake_client):
+    client, adapter = fake_client(samples.get_slideshow(1))
+    client.get_slideshow(slideshow_id=1)
+    client.get_slideshows([1, 2, 3])
+    assert client.params == {"api_key": "key"}
+    for request in adapter.requests:
+        _, params = adapter.query(request)
+        assert params["hash"] == client_module.make_hash(
+            "secret", int(params["ts"]))
+
+
+def test_signature_memoized_per_second(monkeypatch):
+    hashed = []
+
+    def make_hash(shared_secret, timestamp):
+        hashed.append(timestamp)
+        return "hash{}".format(timestamp)
+
+    clock = [100.0]
+    monkeypatch.setattr(client_module, "make_hash", make_hash)
+    monkeypatch.setattr(client_module.time, "time", lambda: clock[0])
+    client = SlideShareAPI("key", "secret")
+    assert client.sign() == {"ts": 100, "hash": "hash100"}
+    clock[0] = 100.9
+    assert client.sign() == {"ts": 100, "hash": "hash100"}
+    assert hashed == [100]
+
+    # Clock ticks over while many threads are signing
+    ticks = itertools.count()
+    monkeypatch.setattr(client_module.time, "time",
+                        lambda: 101 + next(ticks) * 0.25)
+    with ThreadPoolExecutor(8) as executor:
+        signatures = list(executor.map(lambda _: client.sign(), range(200)))
+    for signature in signatures:
+        assert signature["hash"] == "hash{}".format(signature["ts"])
+    assert set(hashed) == set(range(100, 151))
+
+
+def test_stream_listing():
+    metrics = InMemoryMetrics()
+    with FakeSlideShare(count=25) as server:
+        client = SlideShareAPI("key", "secret", models=True, metrics=metrics)
+        client.BASE_URL = server.url
+        streamed = list(client.stream_slideshows_by_tag("python", limit=7))
+        assert [slideshow.id for slideshow in streamed] == list(range(1, 8))
+        assert all(isinstance(s, Slideshow) for s in streamed)
+
+        # Stream stopped early closes the response, the client keeps working
+        stream = client.stream_slideshows_by_user("user", limit=25,
+                                                  offset=20)
+        assert next(stream).id == 21
+        stream.close()
+        streamed = list(client.stream_slideshows_by_user("user", limit=25))
+        assert len(streamed) == 25
+    assert server.requests["get_slideshows_by_tag"] == 1
+    assert server.requests["get_slideshows_by_user"] == 2
+    assert metrics.stats()["get_slideshows_by_user"]["requests"] == 2
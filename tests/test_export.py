@@ -0,0 +1,91 @@
+import csv
+import gzip
+import io
+import json
+import os
+
+import pytest
+
+from slideshare.export import export_slideshows
+
+TOTAL = 25
+
+
+def listing(fail_at=None, offsets=None):
+    """ Responds to `get_slideshows_by_tag` with listing of TOTAL
+    slideshows
+    """
+    def respond(endpoint, params):
+        offset, limit = int(params["offset"]), int(params["limit"])
+        if offset == fail_at:
+            raise IOError("connection reset")
+        if offsets is not None:
+            offsets.append(offset)
+        items = "".join(
+            "<Slideshow><ID>{0}</ID><Title>Title {0}</Title><Tags>"
+            "<Tag Count=\"1\">a</Tag><Tag Count=\"2\">b</Tag></Tags>"
+            "</Slideshow>".format(i)
+            for i in range(offset + 1, min(offset + limit, TOTAL) + 1))
+        return "<Tag><Count>{}</Count>{}</Tag>".format(TOTAL, items)
+    return respond
+
+
+def test_export_jsonl(tmpdir, fake_client):
+    path = str(tmpdir.join("export.jsonl.gz"))
+    client, _ = fake_client(listing())
+    count = export_slideshows(client, path, tag="python", per_page=10)
+    assert count == TOTAL
+    with gzip.open(path, "rb") as f:
+        lines = f.read().decode("utf-8").splitlines()
+    assert [json.loads(line)["ID"] for line in lines] == \
+        [str(i) for i in range(1, TOTAL + 1)]
+    assert not os.path.exists(path + ".checkpoint")
+
+
+def test_export_resumes_from_checkpoint(tmpdir, fake_client):
+    path = str(tmpdir.join("export.csv"))
+    client, _ = fake_client(listing(fail_at=20))
+    with pytest.raises(IOError):
+        export_slideshows(client, path, tag="python", per_page=10,
+                          fields=("ID", "Tags"))
+    assert os.path.exists(path + ".checkpoint")
+
+    offsets = []
+    client, _ = fake_client(listing(offsets=offsets))
+    count = export_slideshows(client, path, tag="python", per_page=10,
+                              fields=("ID", "Tags"))
+    assert count == TOTAL
+    assert offsets == [20]
+    with io.open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["ID", "Tags"]
+    assert rows[1] == ["1", "a,b"]
+    assert [row[0] for row in rows[1:]] == \
+        [str(i) for i in range(1, TOTAL + 1)]
+
+
+def test_export_models(tmpdir, fake_client):
+    path = str(tmpdir.join("export.jsonl"))
+    client, _ = fake_client(listing(), models=True)
+    assert export_slideshows(client, path, tag="python", per_page=10) == \
+        TOTAL
+    with io.open(path, encoding="utf-8") as f:
+        first = json.loads(f.readline())
+    assert first == {"ID": "1", "Title": "Title 1", "Tags": {"Tag": [
+        {"@Count": "1", "#text": "a"}, {"@Count": "2", "#text": "b"}]}}
+
+
+def test_export_listing_params(tmpdir, fake_client):
+    path = str(tmpdir.join("export.csv"))
+    client, adapter = fake_client(b"<User><Count>0</Count></User>",
+                                  username="user", password="password")
+    assert export_slideshows(client, path, username_for="owner",
+                             get_unconverted=True, detailed=True) == 0
+    endpoint, params = adapter.query(adapter.requests[-1])
+    assert endpoint == "get_slideshows_by_user"
+    assert params["username_for"] == "owner"
+    assert params["username"] == "user"
+    assert params["password"] == "password"
+    assert params["get_unconverted"] == "1"
+    assert params["detailed"] == "1"
+    assert params["limit"] == "100"
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+
+def loaded_modules(statement):
+    output = subprocess.check_output(
+        [sys.executable, "-c",
+         "import sys; {}; print(' '.join(sys.modules))".format(statement)])
+    return set(output.decode("ascii").split())
+
+
+def test_package_import_is_lazy():
+    loaded = loaded_modules("import slideshare")
+    for module in ("requests", "xmltodict", "six", "slideshare.api",
+                   "slideshare.client"):
+        assert module not in loaded
+
+
+def test_public_names_loaded_on_access():
+    import slideshare
+    from slideshare.client import SlideShareAPI
+
+    assert slideshare.SlideShareAPI is SlideShareAPI
+    assert "SlideShareAPI" in dir(slideshare)
+    assert slideshare.api.SlideshareAPI is slideshare.SlideshareAPI
+
+
+def test_client_import_skips_parsers():
+    loaded = loaded_modules("import slideshare.client")
+    for module in ("xml.etree.ElementTree", "sqlite3", "uuid",
+                   "concurrent.futures", "slideshare.api"):
+        assert module not in loaded
@@ -0,0 +1,80 @@
+import pytest
+
+from slideshare.cache import MemoryCache
+from slideshare.client import SlideShareAPI
+from slideshare.exceptions import SlideShareError
+from slideshare.metrics import (Histogram, InMemoryMetrics, Measurement,
+                                Metrics)
+from tests.server import FakeSlideShare
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for i in range(1, 1001):
+        histogram.add(i / 1000.0)
+    assert histogram.count == 1000
+    for percent in (50, 95, 99):
+        expected = percent / 100.0
+        assert expected <= histogram.percentile(percent) <= expected * 1.1
+    assert histogram.percentile(100) == 1.0
+    assert Histogram().percentile(50) is None
+
+
+def test_in_memory_metrics():
+    metrics = InMemoryMetrics()
+    metrics.record("get_slideshow", 200, None, 100, 1000, 0.1)
+    metrics.record("get_slideshow", 200, "9", 100, 200, 0.3)
+    stats = metrics.stats()["get_slideshow"]
+    assert stats["requests"] == 2
+    assert stats["request_bytes"] == 200
+    assert stats["response_bytes"] == 1200
+    assert stats["statuses"] == {200: 2}
+    assert stats["errors"] == {"9": 1}
+    assert stats["max"] == 0.3
+
+
+def test_measurement_records_errors():
+    metrics = InMemoryMetrics()
+    with pytest.raises(SlideShareError):
+        with Measurement(metrics, "get_slideshow") as measurement:
+            measurement.status = 200
+            raise SlideShareError("9", "SlideShow Not Found")
+    with pytest.raises(ValueError):
+        with Measurement(metrics, "get_slideshow"):
+            raise ValueError()
+    stats = metrics.stats()["get_slideshow"]
+    assert stats["statuses"] == {200: 1, None: 1}
+    assert stats["errors"] == {"9": 1}
+
+
+class Recorder(Metrics):
+    def __init__(self):
+        self.records = []
+
+    def record(self, *args):
+        self.records.append(args)
+
+
+def test_client_records_every_request():
+    metrics = Recorder()
+    with FakeSlideShare(count=25, missing=[3], latency=0.01) as server:
+        client = SlideShareAPI("key", "secret", metrics=metrics,
+                               cache=MemoryCache())
+        client.BASE_URL = server.url
+        client.get_slideshow(slideshow_id=1)
+        # Served from cache, not recorded
+        client.get_slideshow(slideshow_id=1)
+        with pytest.raises(SlideShareError):
+            client.get_slideshow(slideshow_id=3)
+        client.get_slideshows_by_tag("python", limit=5)
+
+    assert [record[:3] for record in metrics.records] == [
+        ("get_slideshow", 200, None),
+        ("get_slideshow", 200, "9"),
+        ("get_slideshows_by_tag", 200, None)]
+    for _, _, _, request_bytes, response_bytes, duration in metrics.records:
+        assert request_bytes > len(server.url)
+        assert response_bytes > 0
+        assert duration >= 0.01
+    # Listing of five slideshows is larger than a single one
+    assert metrics.records[2][4] > metrics.records[0][4]
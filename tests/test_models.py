@@ -0,0 +1,87 @@
+import pickle
+from datetime import datetime
+
+import pytest
+
+from slideshare.models import Slideshow, SlideshowList, load
+from slideshare.parser import parse
+from slideshare.utils import search_page, tag_page
+from tests import samples
+
+LISTING = b"""<Tag>
+  <Name>python</Name>
+  <Count>2</Count>
+  <Slideshow><ID>1</ID><Created>Thu Mar 25 23:25:19 -0500 2010</Created>
+  <Download>1</Download><Tags><Tag Count="1" Owner="1">a</Tag></Tags>
+  <RelatedSlideshows><RelatedSlideshowID rank="1">5</RelatedSlideshowID>
+  <RelatedSlideshowID rank="2">6</RelatedSlideshowID></RelatedSlideshows>
+  </Slideshow>
+  <Slideshow><ID>2</ID><Updated>2010-03-26 04:25:19 UTC</Updated>
+  <Tags><Tag>a</Tag><Tag>b</Tag></Tags><Unknown>x</Unknown></Slideshow>
+</Tag>"""
+
+
+def test_load_listing():
+    data = parse(LISTING)
+    listing = load(data)
+    assert isinstance(listing, SlideshowList)
+    assert listing.kind == "Tag"
+    assert listing.name == "python"
+    assert listing.count == 2
+    first, second = listing
+    assert first.id == 1
+    assert first.download is True
+    assert first.created == datetime(2010, 3, 26, 4, 25, 19)
+    assert second.updated == datetime(2010, 3, 26, 4, 25, 19)
+    assert [tag.name for tag in first.tags] == ["a"]
+    assert first.tags[0].count == 1
+    assert first.related_slideshows == [5, 6]
+    assert second["Unknown"] == "x"
+    assert tag_page(listing) == (list(listing.slideshows), 2)
+
+
+def test_raw_is_compatible():
+    data = parse(LISTING)
+    listing = load(data)
+    assert listing.raw == data["Tag"]
+    assert [s.raw for s in listing] == data["Tag"]["Slideshow"]
+    assert listing.slideshows[1]["Tags"] == \
+        data["Tag"]["Slideshow"][1]["Tags"]
+
+
+def test_slots():
+    slideshow = Slideshow.from_dict({"ID": "x"})
+    assert not hasattr(slideshow, "__dict__")
+    # Undecodable values are returned as is
+    assert slideshow.id == "x"
+    assert slideshow.title is None
+
+
+def test_empty_elements_are_kept():
+    data = parse(b"<Slideshow><ID>1</ID><Title>t</Title><Description/>"
+                 b"<Tags/><Unknown/></Slideshow>")
+    assert data["Slideshow"]["Description"] is None
+    slideshow = load(data)
+    assert slideshow.raw == data["Slideshow"]
+    assert slideshow["Description"] is None
+    assert "Description" in slideshow
+    assert slideshow["Tags"] is None
+    assert slideshow.description is None
+    # Missing fields are absent from item access and the raw mapping
+    assert "Embed" not in slideshow
+    assert "Embed" not in slideshow.raw
+    with pytest.raises(KeyError):
+        slideshow["Embed"]
+    assert slideshow.embed is None
+    # Pickled by the parse pool
+    assert pickle.loads(pickle.dumps(slideshow)).raw == data["Slideshow"]
+
+
+def test_search_count():
+    data = parse(samples.search_slideshows(total=50, items_per_page=3))
+    listing = load(data)
+    assert listing.count == 50
+    assert "Count" not in listing
+    assert listing.raw == data["Slideshows"]
+    assert search_page(listing) == (list(listing.slideshows), 50)
+    assert pickle.loads(pickle.dumps(listing)).count == 50
@@ -0,0 +1,122 @@
+import io
+import os
+
+import pytest
+
+from slideshare.multipart import MultipartEncoder
+
+CONTENT = os.urandom(100 * 1024 + 7)
+
+
+@pytest.fixture
+def srcfile(tmpdir):
+    path = tmpdir.join("slides.pdf")
+    path.write_binary(CONTENT)
+    return path.strpath
+
+
+def test_body(srcfile):
+    encoder = MultipartEncoder({"title": "Title", "count": 3},
+                               [("file", ("slides.pdf", srcfile))])
+    body = encoder.read()
+    assert len(body) == len(encoder) == encoder.length
+    assert encoder.read() == b""
+    assert encoder.content_type.endswith(encoder.boundary)
+    assert body.endswith("--{}--\r\n".format(encoder.boundary).encode())
+    assert b"name=\"count\"\r\n\r\n3\r\n" in body
+    assert b"Content-Type: application/pdf\r\n\r\n" + CONTENT + b"\r\n" \
+        in body
+
+
+def test_chunked_read(srcfile):
+    expected = MultipartEncoder({"title": "Title"},
+                                [("file", ("slides.pdf", srcfile))])
+    body = expected.read()
+    progress = []
+    encoder = MultipartEncoder({"title": "Title"},
+                               [("file", ("slides.pdf", srcfile))],
+                               callback=lambda *args: progress.append(args))
+    chunks = []
+    while True:
+        chunk = encoder.read(1000)
+        if not chunk:
+            break
+        assert len(chunk) <= 1000
+        chunks.append(chunk)
+    received = b"".join(chunks).replace(encoder.boundary.encode(),
+                                        expected.boundary.encode())
+    assert received == body
+    # Progress is reported after every chunk and grows up to the length
+    assert len(progress) == len(chunks)
+    assert [read for read, _ in progress] == \
+        list(range(1000, len(body), 1000)) + [len(body)]
+    assert all(length == len(body) for _, length in progress)
+
+
+def test_files_closed(srcfile):
+    fileobj = io.open(srcfile, "rb")
+    encoder = MultipartEncoder(files=[("a", ("a.pdf", srcfile)),
+                                      ("b", ("b.pdf", fileobj))])
+    opened = list(encoder._opened)
+    assert len(opened) == 1
+    for _ in encoder:
+        pass
+    assert opened[0].closed
+    # Caller owns the file objects it passed
+    assert not fileobj.closed
+    fileobj.close()
+
+    encoder = MultipartEncoder(files=[("a", ("a.pdf", srcfile))])
+    opened = list(encoder._opened)
+    encoder.read(10)
+    encoder.close()
+    assert opened[0].closed
+
+
+def test_files_closed_on_error(srcfile, tmpdir, monkeypatch):
+    opened = []
+    real_open = io.open
+
+    def tracking_open(*args, **kwargs):
+        opened.append(real_open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr("slideshare.multipart.open", tracking_open,
+                        raising=False)
+    missing = tmpdir.join("missing.pdf").strpath
+    with pytest.raises(IOError):
+        MultipartEncoder(files=[("a", ("a.pdf", srcfile)),
+                                ("b", ("b.pdf", missing))])
+    assert len(opened) == 1
+    assert opened[0].closed
+
+    # File truncated after the length was computed
+    encoder = MultipartEncoder(files=[("a", ("a.pdf", srcfile))])
+    with io.open(srcfile, "r+b") as f:
+        f.truncate(10)
+    with pytest.raises(IOError):
+        encoder.read()
+    encoder.close()
+    assert opened[-1].closed
+
+
+def test_upload_content_length(srcfile, fake_client):
+    bodies = []
+
+    def respond(endpoint, params):
+        request = adapter.requests[-1]
+        bodies.append((request.headers, request.body.read()))
+        return "<SlideShowUploaded><SlideShowID>1</SlideShowID>" \
+               "</SlideShowUploaded>"
+
+    progress = []
+    client, adapter = fake_client(respond, username="user",
+                                  password="password")
+    client.upload_slideshow("Title", slideshow_srcfile=srcfile,
+                            progress_callback=lambda *args:
+                            progress.append(args))
+    headers, body = bodies[0]
+    assert headers["Content-Length"] == str(len(body))
+    assert headers["Content-Type"].startswith("multipart/form-data")
+    assert CONTENT in body
+    assert progress[-1] == (len(body), len(body))
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from slideshare.client import SlideShareAPI
+from slideshare.pagination import iter_offset, iter_pages
+from tests.server import FakeSlideShare
+
+TOTAL = 25
+
+
+class Listing(object):
+    """ Listing of TOTAL items, fails requests at `fail_at` offset """
+
+    def __init__(self, fail_at=None, count=True):
+        self.fail_at = fail_at
+        self.count = count
+        self.requests = []
+
+    def by_offset(self, limit, offset):
+        self.requests.append(offset)
+        if offset == self.fail_at:
+            raise IOError("connection reset")
+        return list(range(offset, min(offset + limit, TOTAL))), \
+            TOTAL if self.count else None
+
+    def by_page(self, page, items_per_page):
+        return self.by_offset(items_per_page, (page - 1) * items_per_page)
+
+
+def extract(response):
+    return response
+
+
+def prefetch_threads():
+    return [thread for thread in threading.enumerate()
+            if thread.name.startswith("ThreadPoolExecutor")]
+
+
+def assert_threads_finish(before):
+    for thread in prefetch_threads():
+        if thread not in before:
+            thread.join(1)
+            assert not thread.is_alive()
+
+
+def test_end_of_results():
+    listing = Listing()
+    assert list(iter_offset(listing.by_offset, extract, 10)) == \
+        list(range(TOTAL))
+    assert listing.requests == [0, 10, 20]
+
+    # Total count stops paging on the full last page
+    listing = Listing()
+    assert list(iter_offset(listing.by_offset, extract, 5, offset=5)) == \
+        list(range(5, TOTAL))
+    assert listing.requests == [5, 10, 15, 20]
+
+    # Without the count the short page is the last one
+    listing = Listing(count=False)
+    assert list(iter_pages(listing.by_page, extract, 10)) == \
+        list(range(TOTAL))
+    assert listing.requests == [0, 10, 20]
+
+
+def test_early_break_stops_prefetch():
+    before = prefetch_threads()
+    listing = Listing()
+    items = iter_offset(listing.by_offset, extract, 5)
+    for item in items:
+        if item == 2:
+            break
+    items.close()
+    assert_threads_finish(before)
+    # The page prefetched before the break is cancelled or discarded
+    assert listing.requests in ([0], [0, 5])
+
+
+def test_prefetch_error():
+    before = prefetch_threads()
+    listing = Listing(fail_at=10)
+    received = []
+    with pytest.raises(IOError):
+        for item in iter_offset(listing.by_offset, extract, 10):
+            received.append(item)
+    # Items of the pages fetched before the error are delivered
+    assert received == list(range(10))
+    assert listing.requests == [0, 10]
+    assert_threads_finish(before)
+
+
+def test_limit():
+    listing = Listing()
+    assert list(iter_offset(listing.by_offset, extract, 10, offset=3,
+                            limit=12)) == list(range(3, 15))
+    # The last page asks only for the items still missing
+    assert listing.requests == [3, 13]
+    assert list(iter_offset(listing.by_offset, extract, 10, limit=0)) == []
+
+    listing = Listing()
+    assert list(iter_pages(listing.by_page, extract, 10, limit=15)) == \
+        list(range(15))
+    assert listing.requests == [0, 10]
+
+
+def test_client_listings_take_limit():
+    with FakeSlideShare(count=25) as server:
+        client = SlideShareAPI("key", "secret")
+        client.BASE_URL = server.url
+        slideshows = list(client.iter_slideshows_by_tag(
+            "python", per_page=5, limit=7, detailed=1))
+        assert [s["ID"] for s in slideshows] == [str(i) for i in range(1, 8)]
+        assert len(list(client.iter_slideshows_by_user(
+            "user", per_page=10, limit=30))) == 25
+        assert len(list(client.iter_search_slideshows(
+            "python", per_page=10, items_per_page=3, limit=12))) == 12
+    assert server.requests["get_slideshows_by_tag"] == 2
+    assert server.requests["search_slideshows"] == 2
@@ -0,0 +1,77 @@
+import pytest
+import xmltodict
+
+from slideshare.exceptions import SlideShareError
+from slideshare.parser import ListingParser, parse, parse_load
+
+DOCUMENTS = [
+    b"<Slideshow><ID>1</ID><Title>A &amp; B</Title><Description/>"
+    b"</Slideshow>",
+    b"""<Tag>
+      <Name>python</Name>
+      <Count>2</Count>
+      <Slideshow><ID>1</ID><Tags><Tag Count="1" Owner="1">a</Tag></Tags>
+      </Slideshow>
+      <Slideshow><ID>2</ID><Tags><Tag Count="1" Owner="0">a</Tag>
+      <Tag Count="2" Owner="1">b</Tag></Tags></Slideshow>
+    </Tag>""",
+    b'<a x="1">t<b>u</b>v<b/> <c y="2"/></a>',
+]
+
+
+@pytest.mark.parametrize("content", DOCUMENTS)
+def test_parse_compatible_with_xmltodict(content):
+    assert parse(content) == xmltodict.parse(content)
+    assert parse(content, compat=False) == xmltodict.parse(content)
+
+
+def test_parse_error():
+    with pytest.raises(SlideShareError) as e:
+        parse(b'<SlideShareServiceError><Message ID="9">SlideShow Not Found'
+              b'</Message></SlideShareServiceError>')
+    assert e.value.errno == "9"
+    assert e.value.errmsg == "SlideShow Not Found"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+def test_listing_parser(chunk_size):
+    content = DOCUMENTS[1]
+    parser = ListingParser()
+    items = []
+    for i in range(0, len(content), chunk_size):
+        items.extend(parser.feed(content[i:i + chunk_size]))
+    items.extend(parser.close())
+    assert items == xmltodict.parse(content)["Tag"]["Slideshow"]
+    assert parser.root.find("Name").text == "python"
+
+
+def test_listing_parser_error():
+    parser = ListingParser()
+    parser.feed(b'<SlideShareServiceError><Message ID="9">SlideShow')
+    with pytest.raises(SlideShareError):
+        parser.feed(b' Not Found</Message></SlideShareServiceError>')
+        parser.close()
+
+
+def test_parse_in_process_pool():
+    from concurrent.futures import ProcessPoolExecutor
+
+    from slideshare.models import SlideshowList
+
+    with ProcessPoolExecutor(1) as pool:
+        data, result = pool.submit(parse_load, DOCUMENTS[1], True).result()
+        assert data == parse(DOCUMENTS[1])
+        assert isinstance(result, SlideshowList)
+        assert [slideshow.id for slideshow in result] == [1, 2]
+
+        data, result = pool.submit(parse_load, DOCUMENTS[0], False,
+                                   False).result()
+        assert data is None
+        assert result == parse(DOCUMENTS[0])
+
+        error = b"""<SlideShareServiceError>
+          <Message ID="9">SlideShow Not Found</Message>
+        </SlideShareServiceError>"""
+        with pytest.raises(SlideShareError) as e:
+            pool.submit(parse_load, error).result()
+        assert e.value.errno == "9"
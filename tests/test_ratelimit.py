@@ -0,0 +1,84 @@
+import pytest
+
+from slideshare.exceptions import RateLimitExceeded, SlideShareError
+from slideshare.ratelimit import RateLimiter
+from tests import samples
+
+
+def test_per_second_budget():
+    limiter = RateLimiter(per_second=2)
+    assert limiter.reserve(now=100.0) == (0.0, True)
+    assert limiter.reserve(now=100.0) == (0.0, True)
+    delay, reserved = limiter.reserve(now=100.0)
+    assert reserved
+    assert delay == pytest.approx(0.5)
+
+
+def test_per_day_budget():
+    limiter = RateLimiter(per_day=1)
+    assert limiter.reserve(now=100.0) == (0.0, True)
+    delay, reserved = limiter.reserve(now=100.0)
+    assert not reserved
+    assert delay == pytest.approx(24 * 60 * 60 - 100)
+    # Budget is reset next day
+    assert limiter.reserve(now=24 * 60 * 60 + 1.0) == (0.0, True)
+
+
+def test_fail_fast():
+    limiter = RateLimiter(per_second=1, block=False)
+    limiter.reserve(now=100.0)
+    with pytest.raises(RateLimitExceeded) as e:
+        limiter.reserve(now=100.0)
+    assert e.value.retry_after == pytest.approx(1.0)
+    limiter = RateLimiter(per_second=1, max_wait=0.5)
+    limiter.reserve(now=100.0)
+    with pytest.raises(RateLimitExceeded):
+        limiter.reserve(now=100.0)
+
+
+def test_throttle_and_recover():
+    limiter = RateLimiter(per_second=10)
+    limiter.throttle()
+    assert limiter.rate == 5
+    limiter.recover()
+    assert limiter.rate == pytest.approx(5.1)
+    for _ in range(100):
+        limiter.recover()
+    assert limiter.rate == 10
+
+
+def test_quota_error_exhausts_daily_budget(fake_client):
+    limiter = RateLimiter(per_day=1000, block=False)
+    client, adapter = fake_client(samples.error(99, "Account Exceeded "
+                                                    "Daily Limit"),
+                                  rate_limiter=limiter)
+    with pytest.raises(SlideShareError):
+        client.get_slideshow(1)
+    with pytest.raises(RateLimitExceeded) as e:
+        client.get_slideshow(1)
+    assert e.value.retry_after > 0
+    assert len(adapter.requests) == 1
+
+    limiter = RateLimiter(per_day=1000)
+    limiter.reserve(now=100.0)
+    limiter.throttle(now=100.0)
+    assert limiter.reserve(now=200.0)[1] is False
+    # Budget is reset next day
+    assert limiter.reserve(now=24 * 60 * 60 + 1.0) == (0.0, True)
+
+
+def test_quota_error_without_daily_budget():
+    limiter = RateLimiter(per_second=10)
+    limiter.reserve(now=100.0)
+    limiter.throttle(now=100.0)
+    assert limiter.rate == 5
+    delay, reserved = limiter.reserve(now=200.0)
+    assert not reserved
+    assert delay == pytest.approx(24 * 60 * 60 - 200)
+    assert limiter.reserve(now=24 * 60 * 60 + 1.0) == (0.0, True)
+
+    limiter = RateLimiter(per_second=10, block=False)
+    limiter.throttle()
+    with pytest.raises(RateLimitExceeded) as e:
+        limiter.reserve()
+    assert e.value.retry_after > 0
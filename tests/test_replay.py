@@ -0,0 +1,62 @@
+import io
+import os
+
+from slideshare.client import SlideShareAPI
+from slideshare.replay import (Driver, RecordingAdapter, read_capture,
+                               record, replay)
+
+
+def echo_id(endpoint, params):
+    # Responds with the slideshow id taken from the request
+    return "<Slideshow><ID>{}</ID></Slideshow>".format(
+        params["slideshow_id"])
+
+
+def test_record_replay(tmpdir, fake_client):
+    path = str(tmpdir.join("capture.jsonl.gz"))
+    client, _ = fake_client(echo_id, password="secret password")
+    adapter = record(client, path)
+    assert isinstance(adapter, RecordingAdapter)
+    for slideshow_id in (1, 2, 1):
+        client.get_slideshow(slideshow_id=slideshow_id)
+    adapter.close()
+
+    records = read_capture(path)
+    assert [r["params"]["slideshow_id"] for r in records] == ["1", "2", "1"]
+    assert "password" not in records[0]["params"]
+    assert "hash" not in records[0]["params"]
+
+    client = SlideShareAPI("key", "secret", password="secret password")
+    replay(client, path)
+    response = client.get_slideshow(slideshow_id=2)
+    assert response["Slideshow"]["ID"] == "2"
+
+    report = Driver(client, records, speed=100).run()
+    assert report.requests == 3
+    assert report.errors == 0
+
+
+def test_read_interrupted_capture(tmpdir, fake_client):
+    path = str(tmpdir.join("capture.jsonl.gz"))
+    client, _ = fake_client(echo_id)
+    adapter = record(client, path)
+    sizes = []
+    for slideshow_id in (1, 2):
+        client.get_slideshow(slideshow_id=slideshow_id)
+        sizes.append(os.path.getsize(path))
+    # Recording process crashed before closing the capture
+    with io.open(path, "rb") as f:
+        content = f.read()
+    adapter.close()
+
+    crashed = str(tmpdir.join("crashed.jsonl.gz"))
+    with io.open(crashed, "wb") as f:
+        f.write(content)
+    assert [r["params"]["slideshow_id"] for r in read_capture(crashed)] == \
+        ["1", "2"]
+
+    # Capture cut off in the middle of the compressed stream
+    with io.open(crashed, "wb") as f:
+        f.write(content[:sizes[0] + 10])
+    assert [r["params"]["slideshow_id"] for r in read_capture(crashed)] == \
+        ["1"]
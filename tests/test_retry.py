@@ -0,0 +1,62 @@
+import time
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from slideshare.retry import RetryPolicy
+
+
+def failing(times, exception):
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) <= times:
+            raise exception
+        return len(calls)
+    return func
+
+
+def test_retry_transient_error():
+    policy = RetryPolicy(max_attempts=3, backoff=0)
+    assert policy.call("get_slideshow", failing(2, ConnectionError())) == 3
+    assert policy.stats()["get_slideshow"] == {
+        "calls": 1, "attempts": 3, "retries": 2, "exhausted": 0}
+
+
+def test_retry_exhausted():
+    policy = RetryPolicy(max_attempts=2, backoff=0)
+    with pytest.raises(ConnectionError):
+        policy.call("get_slideshow", failing(2, ConnectionError()))
+    assert policy.stats()["get_slideshow"]["exhausted"] == 1
+
+
+def test_non_transient_error_not_retried():
+    policy = RetryPolicy(max_attempts=3, backoff=0)
+    with pytest.raises(ValueError):
+        policy.call("get_slideshow", failing(1, ValueError()))
+    assert policy.stats()["get_slideshow"]["attempts"] == 1
+
+
+def test_upload_never_retried():
+    policy = RetryPolicy(endpoints=["get_slideshow", "upload_slideshow"])
+    assert policy.applies_to("get_slideshow")
+    assert not policy.applies_to("upload_slideshow")
+    assert not policy.applies_to("delete_slideshow")
+
+
+def test_time_budget():
+    policy = RetryPolicy(backoff=1, jitter=False, max_time=5)
+    assert policy.next_delay(1, started=time.time()) == 1
+    policy = RetryPolicy(backoff=10, jitter=False, max_time=5)
+    assert policy.next_delay(1, started=time.time()) is None
+
+
+def test_retry_call_with_custom_classifier():
+    policy = RetryPolicy(max_attempts=3, backoff=1, jitter=False)
+    retry = policy.start("get_slideshow",
+                         is_transient=lambda e: isinstance(e, KeyError))
+    assert retry.failed(KeyError()) == 1
+    assert retry.failed(ValueError()) is None
+    assert policy.stats()["get_slideshow"] == {
+        "calls": 1, "attempts": 2, "retries": 1, "exhausted": 1}
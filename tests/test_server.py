@@ -0,0 +1,82 @@
+import pytest
+from requests.exceptions import HTTPError
+
+from slideshare.breaker import CircuitBreaker
+from slideshare.client import SlideShareAPI
+from slideshare.exceptions import SlideShareError
+from slideshare.retry import RetryPolicy
+from tests import samples
+from tests.server import FakeSlideShare
+
+
+def make_client(server, shared_secret="secret", **options):
+    client = SlideShareAPI("key", shared_secret, **options)
+    client.BASE_URL = server.url
+    return client
+
+
+def test_responses():
+    with FakeSlideShare(count=25, missing=[3]) as server:
+        client = make_client(server)
+        response = client.get_slideshow(slideshow_id=2, detailed=1)
+        assert response["Slideshow"]["ID"] == "2"
+        assert "Tags" in response["Slideshow"]
+        with pytest.raises(SlideShareError) as e:
+            client.get_slideshow(slideshow_id=3)
+        assert e.value.errno == "9"
+
+        response = client.get_slideshows_by_tag("python", limit=10,
+                                                offset=20)
+        assert response["Tag"]["Count"] == "25"
+        assert [s["ID"] for s in response["Tag"]["Slideshow"]] == \
+            [str(i) for i in range(21, 26)]
+        response = client.search_slideshows("python", page=2,
+                                            items_per_page=10)
+        assert response["Slideshows"]["Meta"]["TotalResults"] == "25"
+        assert len(response["Slideshows"]["Slideshow"]) == 10
+
+        with pytest.raises(SlideShareError) as e:
+            make_client(server, "wrong").get_slideshow(slideshow_id=1)
+        assert e.value.errno == "1"
+    assert server.requests["get_slideshow"] == 3
+    assert server.requests["search_slideshows"] == 1
+
+
+def test_upload(tmpdir):
+    path = tmpdir.join("slides.pdf")
+    path.write_binary(b"0" * 100000)
+    with FakeSlideShare(count=25) as server:
+        client = make_client(server, username="user", password="password")
+        response = client.upload_slideshow("Slides",
+                                           slideshow_srcfile=path.strpath)
+    assert response["SlideShowUploaded"]["SlideShowID"] == "26"
+    assert server.request_bytes > 100000
+
+
+def test_failures_are_transient():
+    with FakeSlideShare(error_rate=1.0) as server:
+        with pytest.raises(HTTPError) as e:
+            make_client(server).get_slideshow(slideshow_id=1)
+        assert e.value.response.status_code == 503
+
+    policy = RetryPolicy(max_attempts=5, backoff=0)
+    breaker = CircuitBreaker(failure_threshold=100, error_rate=1.0,
+                             cooldown=60)
+    with FakeSlideShare(error_rate=0.3, seed=1) as server:
+        client = make_client(server, retry_policy=policy,
+                             circuit_breaker=breaker)
+        for slideshow_id in range(1, 21):
+            client.get_slideshow(slideshow_id=slideshow_id)
+    assert policy.stats()["get_slideshow"]["retries"] > 0
+    assert breaker.stats()["get_slideshow"]["error_rate"] > 0
+    assert server.requests["get_slideshow"] == \
+        20 + policy.stats()["get_slideshow"]["retries"]
+
+
+def test_samples_parse():
+    client = SlideShareAPI("key", "secret")
+    for content in (samples.get_slideshow(1, detailed=True),
+                    samples.get_slideshows_by_user(count=3),
+                    samples.get_user_groups(),
+                    samples.get_user_tags()):
+        assert client.parse_response(content)
@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from slideshare.singleflight import SingleFlight
+
+
+def run_concurrently(single_flight, func, threads=8):
+    results = []
+    started = threading.Event()
+
+    def call():
+        started.wait()
+        try:
+            results.append(single_flight.do("key", func))
+        except Exception as e:
+            results.append(e)
+
+    workers = [threading.Thread(target=call) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    started.set()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def test_concurrent_calls_coalesced():
+    single_flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def func():
+        calls.append(1)
+        release.wait(1)
+        return {"Slideshow": {"ID": "1"}}
+
+    timer = threading.Timer(0.2, release.set)
+    timer.start()
+    results = run_concurrently(single_flight, func)
+    timer.join()
+    assert len(calls) == 1
+    assert all(result == {"Slideshow": {"ID": "1"}} for result in results)
+    # Every caller gets its own copy
+    assert len(set(id(result) for result in results)) == len(results)
+    assert single_flight.stats() == {"calls": 8, "coalesced": 7}
+
+
+def test_error_shared():
+    single_flight = SingleFlight()
+    release = threading.Event()
+
+    def func():
+        release.wait(1)
+        raise ValueError("boom")
+
+    timer = threading.Timer(0.2, release.set)
+    timer.start()
+    results = run_concurrently(single_flight, func, threads=4)
+    timer.join()
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_sequential_calls_not_coalesced():
+    single_flight = SingleFlight()
+    assert single_flight.do("key", lambda: 1) == 1
+    with pytest.raises(ValueError):
+        single_flight.do("key", lambda: int("x"))
+    assert single_flight.do("key", lambda: 2) == 2
+    assert single_flight.stats()["coalesced"] == 0
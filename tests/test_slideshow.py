@@ -1,5 +1,7 @@
 import pytest
 
+from slideshare.exceptions import SlideShareError
+
 
 def test_get_slideshow_by_id(client, slideshow):
     response = client.get_slideshow(slideshow_id=slideshow.id)
@@ -37,6 +39,14 @@ def test_get_slideshow_by_id_with_transcript(client, slideshow):
     assert "Transcript" in response["Slideshow"]
 
 
+def test_get_slideshows(client, slideshow):
+    response = client.get_slideshows([slideshow.id, slideshow.url, "0"])
+    assert len(response) == 3
+    assert response[0]['Slideshow']['ID'] == slideshow.id
+    assert response[1]['Slideshow']['ID'] == slideshow.id
+    assert isinstance(response[2], SlideShareError)
+
+
 def test_get_slideshows_by_tag(client):
     super_popular_tag = "slideshare"
     response = client.get_slideshows_by_tag(super_popular_tag, limit=2)
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+
+import pytest
+
+from slideshare.sync import ADDED, REMOVED, UPDATED, CatalogSync
+
+
+class Catalog(object):
+    """ Serves `get_slideshows_by_user` listing of `items`, newest first
+    """
+
+    def __init__(self, items):
+        # id -> Updated, in listing order
+        self.items = items
+        self.requests = 0
+
+    def __call__(self, endpoint, params):
+        self.requests += 1
+        offset, limit = int(params["offset"]), int(params["limit"])
+        page = list(self.items.items())[offset:offset + limit]
+        items = "".join(
+            "<Slideshow><ID>{}</ID><Status>2</Status><Updated>{}</Updated>"
+            "</Slideshow>".format(*item) for item in page)
+        return "<User><Count>{}</Count>{}</User>".format(len(self.items),
+                                                          items)
+
+
+@pytest.fixture
+def make_sync(tmpdir, fake_client):
+    def make(items):
+        catalog = Catalog(items)
+        client, _ = fake_client(catalog)
+        return CatalogSync(client, str(tmpdir.join("state.json")),
+                           per_page=10), catalog
+    return make
+
+
+def kinds(report):
+    return [(event.kind, event.slideshow_id) for event in report.events]
+
+
+def test_sync_stops_at_known_slideshows(make_sync):
+    catalog = OrderedDict((str(i), "t0") for i in range(100, 0, -1))
+    sync, adapter = make_sync(catalog)
+    report = sync.sync("user")
+    assert report.full
+    assert report.count(ADDED) == 100
+
+    # Two new slideshows and one edited at the head of the listing
+    catalog["100"] = "t1"
+    catalog = OrderedDict([("102", "t1"), ("101", "t1")] +
+                          list(catalog.items()))
+    sync, adapter = make_sync(catalog)
+    report = sync.sync("user")
+    assert kinds(report) == [(ADDED, "102"), (ADDED, "101"),
+                             (UPDATED, "100")]
+    assert not report.full
+    assert adapter.requests == 2
+
+    # Nothing changed
+    sync, adapter = make_sync(catalog)
+    assert sync.sync("user").events == []
+    assert adapter.requests == 1
+
+
+def test_sync_detects_removed(make_sync):
+    catalog = OrderedDict((str(i), "t0") for i in range(100, 0, -1))
+    sync, adapter = make_sync(catalog)
+    sync.sync("user")
+
+    del catalog["5"]
+    sync, adapter = make_sync(catalog)
+    report = sync.sync("user")
+    assert kinds(report) == [(REMOVED, "5")]
+    assert report.full
+    assert adapter.requests == 10
+
+
+def test_sync_misses_swap_deep_in_listing_until_full(make_sync):
+    catalog = OrderedDict((str(i), "t0") for i in range(100, 0, -1))
+    sync, _ = make_sync(catalog)
+    sync.sync("user")
+
+    # One removed and one older slideshow published, the count is kept
+    del catalog["5"]
+    catalog["0"] = "t0"
+    sync, adapter = make_sync(catalog)
+    report = sync.sync("user")
+    assert report.events == []
+    assert adapter.requests == 1
+
+    sync, _ = make_sync(catalog)
+    report = sync.sync("user", full=True)
+    assert kinds(report) == [(ADDED, "0"), (REMOVED, "5")]
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from slideshare.cache import MemoryCache
+from slideshare.client import SlideShareAPI
+from slideshare.exceptions import SlideShareError
+from slideshare.tracing import CallbackExporter, Tracer, current_span, wrap
+from tests.server import FakeSlideShare
+
+
+def test_nested_spans():
+    spans = []
+    tracer = Tracer(CallbackExporter(spans.append))
+    with tracer.span("call", endpoint="get_slideshow") as call:
+        assert current_span() is call
+        with tracer.span("parse"):
+            pass
+    assert current_span() is None
+    parse, call = spans
+    assert parse.parent_id == call.span_id
+    assert parse.trace_id == call.trace_id
+    assert call.parent_id is None
+    assert call.attributes == {"endpoint": "get_slideshow"}
+    assert call.duration >= parse.duration >= 0
+
+
+def test_error_recorded():
+    spans = []
+    tracer = Tracer(CallbackExporter(spans.append))
+    with pytest.raises(ValueError):
+        with tracer.span("call"):
+            raise ValueError("boom")
+    assert spans[0].error == "ValueError: boom"
+
+
+def test_wrap_propagates_to_thread():
+    spans = []
+    tracer = Tracer(CallbackExporter(spans.append))
+
+    def work():
+        with tracer.span("network"):
+            pass
+
+    with tracer.span("call") as call:
+        thread = threading.Thread(target=wrap(work))
+        thread.start()
+        thread.join()
+    assert spans[0].name == "network"
+    assert spans[0].parent_id == call.span_id
+
+
+def test_client_spans():
+    spans = []
+    with FakeSlideShare(count=25, missing=[3]) as server:
+        client = SlideShareAPI("key", "secret", models=True,
+                               cache=MemoryCache(),
+                               tracer=Tracer(CallbackExporter(spans.append)))
+        client.BASE_URL = server.url
+        client.get_slideshow(slideshow_id=1)
+        client.get_slideshow(slideshow_id=1)
+        with pytest.raises(SlideShareError):
+            client.get_slideshow(slideshow_id=3)
+
+    call = spans[5]
+    assert [span.name for span in spans[:6]] == [
+        "sign", "prepare", "network", "parse", "model", "get_slideshow"]
+    assert call.parent_id is None
+    assert call.attributes == {"method": "GET"}
+    for span in spans[:5]:
+        assert span.parent_id == call.span_id
+        assert span.trace_id == call.trace_id
+        assert call.duration >= span.duration
+    assert spans[2].attributes == {"status": 200}
+    assert spans[3].attributes["bytes"] > 0
+
+    # Cache hit is converted to the model without the network phases
+    model, cached = spans[6:8]
+    assert (model.name, cached.name) == ("model", "get_slideshow")
+    assert cached.attributes["cached"] is True
+    assert model.parent_id == cached.span_id
+    assert cached.trace_id != call.trace_id
+
+    # Service error fails the parse phase and the call
+    assert [span.name for span in spans[8:]] == [
+        "sign", "prepare", "network", "parse", "get_slideshow"]
+    assert spans[-2].error.startswith("SlideShareError")
+    assert spans[-1].error.startswith("SlideShareError")
@@ -0,0 +1,59 @@
+import pytest
+from six.moves.urllib.parse import parse_qsl
+
+from slideshare.client import SlideShareAPI
+
+
+@pytest.fixture
+def echo(fake_client):
+    # Responds with empty listing
+    return fake_client(b"<User><Count>0</Count></User>", username="user",
+                       password="password", coalesce=False)
+
+
+def sent(adapter):
+    request = adapter.requests[-1]
+    return (request.method,) + adapter.query(request)
+
+
+def test_listing_params(echo):
+    client, adapter = echo
+    client.get_slideshows_by_user("owner", offset="20", detailed=True,
+                                  get_unconverted=1)
+    method, endpoint, params = sent(adapter)
+    assert (method, endpoint) == ("GET", "get_slideshows_by_user")
+    assert params["username_for"] == "owner"
+    assert params["limit"] == "10"
+    assert params["offset"] == "20"
+    assert params["detailed"] == "1"
+    assert params["get_unconverted"] == "1"
+    assert params["username"] == "user"
+    assert "hash" in params and "ts" in params
+
+    with pytest.raises(ValueError):
+        client.get_slideshows_by_group("group", limit="many")
+
+    client.search_slideshows("python", items_per_page=5, sort="latest",
+                             cc=True)
+    method, endpoint, params = sent(adapter)
+    assert endpoint == "search_slideshows"
+    assert params["items_per_page"] == "5"
+    assert params["sort"] == "latest"
+    assert params["cc"] == "1"
+
+
+def test_campaign_credentials_posted(echo):
+    client, adapter = echo
+    client.get_user_campaign_leads("42", begin="201601010000")
+    method, endpoint, params = sent(adapter)
+    assert (method, endpoint) == ("POST", "get_user_campaign_leads")
+    assert "password" not in params
+    body = dict(parse_qsl(adapter.requests[-1].body))
+    assert body == {"username": "user", "password": "password",
+                    "campaign_id": "42", "begin": "201601010000"}
+
+
+def test_credentials_required():
+    client = SlideShareAPI("key", "secret")
+    with pytest.raises(ValueError):
+        client.add_favorite(1)